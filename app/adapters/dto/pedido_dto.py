@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from typing import Optional
 
@@ -9,4 +9,11 @@ class PedidoCreateSchema(BaseModel):
 class PedidoAtualizaSchema(BaseModel):
     status: int
     
-    model_config = ConfigDict(arbitrary_types_allowed=True)
\ No newline at end of file
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+class PedidoStatusLoteItemSchema(BaseModel):
+    id: int
+    status: int
+
+class PedidoStatusLoteSchema(BaseModel):
+    itens: list[PedidoStatusLoteItemSchema] = Field(min_length=1, max_length=500)
@@ -5,3 +5,29 @@ class StatusPedidoEnum(str, Enum):
     Iniciado = 2
     Pronto = 3
     Finalizado = 4
+
+# Kitchen board order: ready orders first, then in preparation, then received
+PRIORIDADE_LISTAGEM = (StatusPedidoEnum.Pronto, StatusPedidoEnum.Iniciado, StatusPedidoEnum.Recebido)
+
+def prioridade_listagem(status) -> int:
+    for posicao, prioritario in enumerate(PRIORIDADE_LISTAGEM):
+        if int(prioritario.value) == int(status):
+            return posicao
+
+    return len(PRIORIDADE_LISTAGEM)
+
+
+# Forward-only lifecycle: Recebido -> Iniciado -> Pronto -> Finalizado
+PROXIMO_STATUS: dict[int, int] = {
+    int(StatusPedidoEnum.Recebido.value): int(StatusPedidoEnum.Iniciado.value),
+    int(StatusPedidoEnum.Iniciado.value): int(StatusPedidoEnum.Pronto.value),
+    int(StatusPedidoEnum.Pronto.value): int(StatusPedidoEnum.Finalizado.value),
+}
+
+# Status each target may be reached from, forward moves only: Recebido is
+# never a target and Finalizado is terminal. Precomputed once so the CAS
+# update in PedidoDAO only binds the predecessor list
+TRANSICOES_PERMITIDAS: dict[int, tuple[int, ...]] = {
+    int(destino.value): tuple(origem for origem, proximo in PROXIMO_STATUS.items() if proximo == int(destino.value))
+    for destino in StatusPedidoEnum
+}
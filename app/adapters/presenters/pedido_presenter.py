@@ -1,6 +1,7 @@
 from pydantic import BaseModel
+from typing import Optional, Union
 
-from app.adapters.schemas.pedido import PedidoProdutosResponseSchema, PedidoResponseSchema
+from app.adapters.schemas.pedido import PedidoProdutosResponseSchema, PedidoResponseSchema, PedidoStatusLoteResultadoSchema, PedidoLoteResultadoSchema
 
 class PedidoResponse(BaseModel):
     status: str
@@ -8,4 +9,20 @@ class PedidoResponse(BaseModel):
 
 class PedidoResponseList(BaseModel):
     status: str
-    data: list[PedidoResponseSchema]
\ No newline at end of file
+    data: list[Union[PedidoProdutosResponseSchema, PedidoResponseSchema]]
+    next_cursor: Optional[str] = None
+
+class PedidoAlteracoesResponse(BaseModel):
+    status: str
+    data: list[Union[PedidoProdutosResponseSchema, PedidoResponseSchema]]
+    removidos: list[int]
+    cursor: int
+    mais: bool
+
+class PedidoStatusLoteResponse(BaseModel):
+    status: str
+    data: list[PedidoStatusLoteResultadoSchema]
+
+class PedidoLoteResponse(BaseModel):
+    status: str
+    data: list[PedidoLoteResultadoSchema]
\ No newline at end of file
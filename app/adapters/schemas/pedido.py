@@ -1,7 +1,7 @@
-from pydantic import BaseModel, EmailStr, constr, ConfigDict
+from pydantic import BaseModel, EmailStr, constr, ConfigDict, Field
 
 import datetime
-from typing import Optional
+from typing import Literal, Optional, Union
 from typing import List
 
 from app.adapters.schemas.status_pedido import StatusPedidoResponseSchema
@@ -14,6 +14,7 @@ class PedidoResponseSchema(BaseModel):
     data_criacao: datetime.time
     data_alteracao: Optional[datetime.time]
     data_finalizacao: Optional[datetime.time]
+    versao: Optional[int] = Field(default=None, exclude=True)
     
     model_config = ConfigDict(validate_by_name=True)
     
@@ -28,3 +29,13 @@ class PedidoProdutosResponseSchema(BaseModel):
     
     model_config = ConfigDict(validate_by_name=True)
 
+class PedidoStatusLoteResultadoSchema(BaseModel):
+    id: int
+    resultado: Literal["atualizado", "nao_encontrado", "conflito", "invalido"]
+    mensagem: Optional[str] = None
+    pedido: Optional[Union[PedidoProdutosResponseSchema, PedidoResponseSchema]] = None
+
+class PedidoLoteResultadoSchema(BaseModel):
+    indice: int
+    id: Optional[int] = None
+    erro: Optional[str] = None
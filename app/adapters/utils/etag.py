@@ -0,0 +1,26 @@
+import hashlib
+import json
+from typing import Iterable, Optional
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag (quoted) over the JSON form of `parts`."""
+    raw = json.dumps(parts, separators=(",", ":"), default=str).encode()
+
+    return f'"{hashlib.blake2b(raw, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (RFC 9110 §13.1.2): `*` or any listed tag, compared
+    weakly, so a `W/` prefix added by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates: Iterable[str] = (tag.strip() for tag in if_none_match.split(","))
+
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.infrastructure.db.database import get_db
+from fastapi.responses import JSONResponse
+from app.infrastructure.db import database
+from app.infrastructure.db.health import DatabaseHealth, get_database_health
+from app.infrastructure.db.async_database import is_async_enabled, get_async_engine, async_pool_metrics
+from app.gateways.status_pedido_gateway import status_cache
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -9,5 +12,21 @@ def health_check():
     return {"status": "ok"}
 
 @router.get("/db")
-def health_db_check(db: Session = Depends(get_db)):
-    return {"status": "connected"}
\ No newline at end of file
+async def health_db_check(health: DatabaseHealth = Depends(get_database_health)):
+    result = await health.check()
+
+    # 503 takes the pod out of the Service while the database is down or the pool is exhausted
+    return JSONResponse(result, status_code=200 if result["status"] == "connected" else 503)
+
+@router.get("/cache")
+def health_cache():
+    return {"status_pedido": status_cache.stats()}
+
+@router.get("/pool")
+def health_pool():
+    stats = {"sync": database.pool_metrics.snapshot(database.get_engine().pool)}
+
+    if is_async_enabled():
+        stats["async"] = async_pool_metrics.snapshot(get_async_engine().sync_engine.pool)
+
+    return stats
\ No newline at end of file
@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+
+from app.infrastructure.metrics.exposition import CONTENT_TYPE, render
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics")
+def metrics():
+    return Response(render(), media_type=CONTENT_TYPE)
@@ -1,25 +1,36 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+import asyncio
+import os
+
+from fastapi import APIRouter, HTTPException, Depends, Body, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from typing import Any, Optional
 
-from app.infrastructure.db.database import get_db
+from app.infrastructure.db.unit_of_work import UnitOfWork, get_unit_of_work
 from app.gateways.pedido_gateway import PedidoGateway
 from app.gateways.pedido_produto_gateway import PedidoProdutoGateway
 from app.controllers.pedido_controller import PedidoController
-from app.adapters.presenters.pedido_presenter import PedidoResponse
-from app.adapters.dto.pedido_dto import PedidoCreateSchema, PedidoAtualizaSchema
+from app.adapters.presenters.pedido_presenter import PedidoResponse, PedidoResponseList, PedidoAlteracoesResponse, PedidoStatusLoteResponse, PedidoLoteResponse
+from app.adapters.dto.pedido_dto import PedidoCreateSchema, PedidoAtualizaSchema, PedidoStatusLoteSchema
 from app.adapters.utils.debug import var_dump_die
+from app.infrastructure.api.responses import PydanticJSONResponse
+from app.infrastructure.events.broker import pedido_events
+from app.infrastructure.metrics.middleware import mark_streaming
+from app.infrastructure.cache.idempotency import IdempotencyKeyConflict, idempotency_store
+from app.adapters.utils.etag import make_etag
+from app.adapters.enums.status_pedido import StatusPedidoEnum
 
 router = APIRouter(prefix="/pedidos", tags=["pedidos"])
 
-def get_pedido_gateway(db: Session = Depends(get_db)) -> PedidoGateway:
+def get_pedido_gateway(unitOfWork: UnitOfWork = Depends(get_unit_of_work)) -> PedidoGateway:
     
-    return PedidoGateway(db_session=db)
+    return PedidoGateway(db_session=unitOfWork.session)
 
-def get_pedido_produto_gateway(db: Session = Depends(get_db)) -> PedidoProdutoGateway:
+def get_pedido_produto_gateway(unitOfWork: UnitOfWork = Depends(get_unit_of_work)) -> PedidoProdutoGateway:
     
-    return PedidoProdutoGateway(db_session=db)
+    return PedidoProdutoGateway(db_session=unitOfWork.session)
 
-@router.post("/", status_code=status.HTTP_201_CREATED, responses={
+@router.post("/", response_model=PedidoResponse, status_code=status.HTTP_201_CREATED, responses={
     400: {
         "description": "Erro de validação",
         "content": {
@@ -29,22 +40,94 @@ def get_pedido_produto_gateway(db: Session = Depends(get_db)) -> PedidoProdutoGa
                 }
             }
         }
+    },
+    422: {
+        "description": "Idempotency-Key já utilizada com outro corpo",
+        "content": {
+            "application/json": {
+                "example": {
+                    "message": "Idempotency-Key já utilizada com outro corpo de requisição"
+                }
+            }
+        }
     }
 })
-def criar_pedido(
+async def criar_pedido(
         pedido: PedidoCreateSchema, 
+        idempotency_key: Optional[str] = Header(None, max_length=255, 
+                                                description="Retentativas com a mesma chave devolvem o pedido já criado"),
+        gateway: PedidoGateway = Depends(get_pedido_gateway), 
+        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+        unitOfWork: UnitOfWork = Depends(get_unit_of_work)
+    ):
+    async def criar():
+        result = await unitOfWork.run(PedidoController(db_session=gateway, unit_of_work=unitOfWork).criar_pedido,
+                                      pedido=pedido, 
+                                      pedidoProdutosGateway=pedidoProdutosGateway)
+
+        return PydanticJSONResponse(result, status_code=status.HTTP_201_CREATED)
+
+    try:
+        if idempotency_key is None:
+            return await criar()
+
+        return await idempotency_store.execute(idempotency_key, make_etag(pedido.model_dump()), criar)
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/batch", response_model=PedidoLoteResponse, responses={
+    200: {
+        "description": "Um resultado por pedido, na ordem do envio: id do pedido criado ou erro",
+    },
+    400: {
+        "description": "Erro de validação",
+        "content": {
+            "application/json": {
+                "example": {
+                    "message": ""
+                }
+            }
+        }
+    },
+    422: {
+        "description": "Idempotency-Key já utilizada com outro corpo",
+        "content": {
+            "application/json": {
+                "example": {
+                    "message": "Idempotency-Key já utilizada com outro corpo de requisição"
+                }
+            }
+        }
+    }
+})
+async def criar_pedidos_em_lote(
+        pedidos: list[Any] = Body(..., min_length=1, max_length=500, 
+                                  description="Lista de pedidos no formato de POST /pedidos/; cada um é validado separadamente"),
+        idempotency_key: Optional[str] = Header(None, max_length=255),
         gateway: PedidoGateway = Depends(get_pedido_gateway), 
-        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway)
+        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+        unitOfWork: UnitOfWork = Depends(get_unit_of_work)
     ):
+    async def criar():
+        result = await unitOfWork.run(PedidoController(db_session=gateway, unit_of_work=unitOfWork).criar_pedidos_em_lote,
+                                      pedidos=pedidos, 
+                                      pedidoProdutosGateway=pedidoProdutosGateway)
+
+        return PydanticJSONResponse(result)
+
     try:
+        if idempotency_key is None:
+            return await criar()
 
-        return (PedidoController(db_session=gateway)
-                    .criar_pedido(pedido=pedido, 
-                                 pedidoProdutosGateway=pedidoProdutosGateway))
+        return await idempotency_store.execute(idempotency_key, make_etag(pedidos), criar)
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-@router.get("/", responses={
+@router.get("/", response_model=PedidoResponseList, responses={
     400: {
         "description": "Erro de validação",
         "content": {
@@ -61,15 +144,184 @@ openapi_extra={
         "422": None  
     }
 })
-def listar_pedidos(gateway: PedidoGateway = Depends(get_pedido_gateway)):
+async def listar_pedidos(
+        limit: int = Query(100, ge=1, le=500),
+        cursor: Optional[str] = Query(None),
+        status_pedido: Optional[int] = Query(None, alias="status"),
+        cliente_id: Optional[int] = Query(None),
+        include: Optional[str] = Query(None, description="Use include=produtos para trazer os produtos de cada pedido"),
+        if_none_match: Optional[str] = Header(None),
+        gateway: PedidoGateway = Depends(get_pedido_gateway),
+        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+        unitOfWork: UnitOfWork = Depends(get_unit_of_work)
+    ):
     try:
-        
-        return (PedidoController(db_session=gateway)
-                    .listar_todos())
+        incluirProdutos = "produtos" in (include or "").split(",")
+
+        return await unitOfWork.run(PedidoController(db_session=gateway).listar_todos,
+                                    limite=limit, 
+                                    cursor=cursor, 
+                                    status_pedido=status_pedido, 
+                                    cliente_id=cliente_id,
+                                    pedidoProdutosGateway=pedidoProdutosGateway if incluirProdutos else None,
+                                    if_none_match=if_none_match)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+# Declared before /{id}, which would otherwise capture "changes"
+@router.get("/changes", response_model=PedidoAlteracoesResponse, responses={
+    400: {
+        "description": "Erro de validação",
+        "content": {
+            "application/json": {
+                "example": {
+                    "message": ""
+                }
+            }
+        }
+    },
+}, 
+openapi_extra={
+    "responses": {
+        "422": None  
+    }
+})
+async def alteracoes_pedidos(
+        request: Request,
+        since: Optional[int] = Query(None, ge=0, description="Cursor da resposta anterior; sem ele só o cursor atual é retornado"),
+        limit: int = Query(100, ge=1, le=500),
+        timeout: Optional[float] = Query(None, ge=0, le=60, description="Segundos aguardando alterações antes de responder vazio"),
+        include: Optional[str] = Query(None, description="Use include=produtos para trazer os produtos de cada pedido"),
+        gateway: PedidoGateway = Depends(get_pedido_gateway),
+        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+        unitOfWork: UnitOfWork = Depends(get_unit_of_work)
+    ):
+    try:
+        incluirProdutos = "produtos" in (include or "").split(",")
+        espera = timeout if timeout is not None else float(os.getenv("PEDIDO_CHANGES_TIMEOUT_SECONDS", "25"))
+        # Writes served by other replicas don't reach this pod's broker: re-check at least this often
+        intervalo = float(os.getenv("PEDIDO_CHANGES_POLL_SECONDS", "2"))
+        controller = PedidoController(db_session=gateway)
+        loop = asyncio.get_running_loop()
+        prazo = loop.time() + espera
+
+        # Subscribed before the first read, so a write landing in between still wakes the poll
+        async with pedido_events.subscribe() as subscription:
+            while True:
+                result = await unitOfWork.run(controller.listar_alteracoes,
+                                              desde=since,
+                                              limite=limit,
+                                              pedidoProdutosGateway=pedidoProdutosGateway if incluirProdutos else None)
+                restante = prazo - loop.time()
+
+                if since is None or result.data or result.removidos or restante <= 0:
+                    return PydanticJSONResponse(result)
+
+                # Waiting from here on: a long poll, not a regular request, for the metrics
+                mark_streaming(request.scope)
+                # Don't hold a pooled connection while idle
+                await unitOfWork.release()
+                await subscription.wait(min(restante, intervalo))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.patch("/status", response_model=PedidoStatusLoteResponse, responses={
+    200: {
+        "description": "Resultado por item: atualizado, nao_encontrado, conflito ou invalido",
+    },
+    400: {
+        "description": "Erro de validação",
+        "content": {
+            "application/json": {
+                "example": {
+                    "message": ""
+                }
+            }
+        }
+    }
+})
+async def atualizar_status_em_lote(
+        lote: PedidoStatusLoteSchema,
+        include: Optional[str] = Query(None, description="Use include=produtos para trazer os produtos de cada pedido"),
+        gateway: PedidoGateway = Depends(get_pedido_gateway),
+        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+        unitOfWork: UnitOfWork = Depends(get_unit_of_work)
+    ):
+    try:
+        incluirProdutos = "produtos" in (include or "").split(",")
+
+        result = await unitOfWork.run(PedidoController(db_session=gateway, unit_of_work=unitOfWork).atualizar_status_em_lote,
+                                      itens=lote.itens,
+                                      pedidoProdutosGateway=pedidoProdutosGateway if incluirProdutos else None)
+
+        return PydanticJSONResponse(result)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/claim", response_model=PedidoResponse, responses={
+    200: {
+        "description": "Pedido mais antigo no status informado, já movido para Iniciado, com seus produtos",
+    },
+    204: {
+        "description": "Nenhum pedido disponível no status informado",
+    },
+    400: {
+        "description": "Erro de validação",
+        "content": {
+            "application/json": {
+                "example": {
+                    "message": "Pedidos com status 4 não podem ser iniciados"
+                }
+            }
+        }
+    }
+})
+async def reivindicar_pedido(
+        status_pedido: int = Query(int(StatusPedidoEnum.Recebido.value), alias="status",
+                                   description="Status de onde o pedido é retirado"),
+        gateway: PedidoGateway = Depends(get_pedido_gateway),
+        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+        unitOfWork: UnitOfWork = Depends(get_unit_of_work)
+    ):
+    try:
+        result = await unitOfWork.run(PedidoController(db_session=gateway, unit_of_work=unitOfWork).reivindicar_proximo,
+                                      status_origem=status_pedido,
+                                      pedidoProdutosGateway=pedidoProdutosGateway)
+
+        if result is None:
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+        return PydanticJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-@router.get("/{id}", responses={
+# Declared before /{id}, which would otherwise capture "stream"
+@router.get("/stream", response_class=StreamingResponse, responses={
+    200: {
+        "description": "Server-Sent Events: pedido_criado, pedido_atualizado, pedido_removido (e reset)",
+        "content": {"text/event-stream": {}}
+    }
+})
+async def stream_pedidos(
+        request: Request,
+        last_event_id: Optional[int] = Header(None),
+        desde: Optional[int] = Query(None, description="Id do último evento recebido (alternativa ao header Last-Event-ID)")
+    ):
+    mark_streaming(request.scope)
+    subscription = pedido_events.subscribe(last_event_id if last_event_id is not None else desde)
+    heartbeat = float(os.getenv("PEDIDO_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+    async def eventos():
+        async with subscription:
+            async for chunk in subscription.stream(heartbeat=heartbeat):
+                yield chunk
+
+    return StreamingResponse(eventos(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+@router.get("/{id}", response_model=PedidoResponse, responses={
     404: {
         "description": "Erro de validação",
         "content": {
@@ -95,16 +347,19 @@ def listar_pedidos(gateway: PedidoGateway = Depends(get_pedido_gateway)):
         "422": None  
     }
 })
-def buscar_pedido(
+async def buscar_pedido(
         id: int, 
+        if_none_match: Optional[str] = Header(None),
         gateway: PedidoGateway = Depends(get_pedido_gateway), 
-        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway)
+        pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+        unitOfWork: UnitOfWork = Depends(get_unit_of_work)
     ):
     try:
         
-        return (PedidoController(db_session=gateway)
-                    .buscar_por_id(id=id, 
-                                   pedidoProdutosGateway=pedidoProdutosGateway))
+        return await unitOfWork.run(PedidoController(db_session=gateway).buscar_por_id,
+                                    id=id, 
+                                    pedidoProdutosGateway=pedidoProdutosGateway,
+                                    if_none_match=if_none_match)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -121,27 +376,42 @@ def buscar_pedido(
             }
         }
     },
+    409: {
+        "description": "Transição de status não permitida",
+        "content": {
+            "application/json": {
+                "example": {
+                    "message": "Pedido já finalizado"
+                }
+            }
+        }
+    },
     400: {
         "description": "Erro de validação",
         "content": {
             "application/json": {
                 "example": {
-                    "message": "Pedido já finalizado"
+                    "message": "Status inválido: 9"
                 }
             }
         }
     }
 })
-def atualizar_pedido(id: int, 
-                     pedido: PedidoAtualizaSchema, 
-                     gateway: PedidoGateway = Depends(get_pedido_gateway), 
-                     pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway)):
+async def atualizar_pedido(id: int, 
+                           pedido: PedidoAtualizaSchema, 
+                           gateway: PedidoGateway = Depends(get_pedido_gateway), 
+                           pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+                           unitOfWork: UnitOfWork = Depends(get_unit_of_work)):
     try:
 
-        return (PedidoController(db_session=gateway)
-                    .atualizar_pedido(id=id, 
-                                pedidoRequest=pedido,
-                                pedidoProdutosGateway=pedidoProdutosGateway))
+        result = await unitOfWork.run(PedidoController(db_session=gateway).atualizar_pedido,
+                                      id=id, 
+                                      pedidoRequest=pedido,
+                                      pedidoProdutosGateway=pedidoProdutosGateway)
+
+        return PydanticJSONResponse(result)
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -177,15 +447,16 @@ def atualizar_pedido(id: int,
         }
     }
 })
-def deletar_pedido(id: int, 
-                   gateway: PedidoGateway = Depends(get_pedido_gateway),
-                   pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway)
-                   ):
+async def deletar_pedido(id: int, 
+                         gateway: PedidoGateway = Depends(get_pedido_gateway),
+                         pedidoProdutosGateway: PedidoProdutoGateway = Depends(get_pedido_produto_gateway),
+                         unitOfWork: UnitOfWork = Depends(get_unit_of_work)
+                         ):
     try:
         
-        return (PedidoController(db_session=gateway)
-                    .deletar(id=id,
-                             pedidoProdutosGateway=pedidoProdutosGateway))
+        return await unitOfWork.run(PedidoController(db_session=gateway, unit_of_work=unitOfWork).deletar,
+                                    id=id,
+                                    pedidoProdutosGateway=pedidoProdutosGateway)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
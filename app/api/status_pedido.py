@@ -1,18 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends, Response, status
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.infrastructure.db.database import get_db
+from app.infrastructure.db.unit_of_work import UnitOfWork, get_unit_of_work
 from app.gateways.status_pedido_gateway import StatusPedidoGateway
-from app.adapters.presenters.status_pedido_presenter import StatusPedidoResponse
+from app.adapters.presenters.status_pedido_presenter import StatusPedidoResponse, StatusPedidoResponseList
 from app.adapters.dto.status_pedido_dto import StatusPedidoCreateSchema, StatusPedidoUpdateSchema
 from app.controllers.status_pedido_controller import StatusPedidoController
+from app.infrastructure.api.responses import PydanticJSONResponse
 
 router = APIRouter(prefix="/status_pedido", tags=["status_pedido"])
 
-def get_status_repository(database: Session = Depends(get_db)) -> StatusPedidoGateway:
+def get_status_repository(unitOfWork: UnitOfWork = Depends(get_unit_of_work)) -> StatusPedidoGateway:
     
-    return StatusPedidoGateway(db_session=database)
+    return StatusPedidoGateway(db_session=unitOfWork.session)
 
 @router.post("/", response_model=StatusPedidoResponse, status_code=status.HTTP_201_CREATED, responses={
     400: {
@@ -26,9 +27,13 @@ def get_status_repository(database: Session = Depends(get_db)) -> StatusPedidoGa
         }
     }
 })
-def criar(data: StatusPedidoCreateSchema, gateway: StatusPedidoGateway = Depends(get_status_repository)):
+async def criar(data: StatusPedidoCreateSchema, 
+                gateway: StatusPedidoGateway = Depends(get_status_repository),
+                unitOfWork: UnitOfWork = Depends(get_unit_of_work)):
     try:
-        return StatusPedidoController(db_session=gateway).criar(dataRequest=data)
+        result = await unitOfWork.run(StatusPedidoController(db_session=gateway).criar, dataRequest=data)
+
+        return PydanticJSONResponse(result, status_code=status.HTTP_201_CREATED)
     except Exception as e:       
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -58,16 +63,20 @@ def criar(data: StatusPedidoCreateSchema, gateway: StatusPedidoGateway = Depends
         "422": None  
     }
 })
-def buscar_status(id: int, gateway: StatusPedidoGateway = Depends(get_status_repository)):
+async def buscar_status(id: int, 
+                        gateway: StatusPedidoGateway = Depends(get_status_repository),
+                        unitOfWork: UnitOfWork = Depends(get_unit_of_work)):
     try:
 
-        return StatusPedidoController(db_session=gateway).buscar_por_id(id=id)
+        result = await unitOfWork.run(StatusPedidoController(db_session=gateway).buscar_por_id, id=id)
+
+        return PydanticJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:       
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-@router.get("/", responses={
+@router.get("/", response_model=StatusPedidoResponseList, responses={
     400: {
         "description": "Erro de validação",
         "content": {
@@ -84,10 +93,12 @@ def buscar_status(id: int, gateway: StatusPedidoGateway = Depends(get_status_rep
         "422": None
     }
 })
-def listar_todos(gateway: StatusPedidoGateway = Depends(get_status_repository)):
+async def listar_todos(if_none_match: Optional[str] = Header(None),
+                       gateway: StatusPedidoGateway = Depends(get_status_repository),
+                       unitOfWork: UnitOfWork = Depends(get_unit_of_work)):
     try:
 
-        return StatusPedidoController(db_session=gateway).listar_todos()
+        return await unitOfWork.run(StatusPedidoController(db_session=gateway).listar_todos, if_none_match=if_none_match)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -113,10 +124,15 @@ def listar_todos(gateway: StatusPedidoGateway = Depends(get_status_repository)):
         }
     }
 })
-def atualizar(id: int, data: StatusPedidoUpdateSchema, gateway: StatusPedidoGateway = Depends(get_status_repository)):
+async def atualizar(id: int, 
+                    data: StatusPedidoUpdateSchema, 
+                    gateway: StatusPedidoGateway = Depends(get_status_repository),
+                    unitOfWork: UnitOfWork = Depends(get_unit_of_work)):
     try:
 
-        return StatusPedidoController(db_session=gateway).atualizar(id=id, data=data)
+        result = await unitOfWork.run(StatusPedidoController(db_session=gateway).atualizar, id=id, data=data)
+
+        return PydanticJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -152,10 +168,12 @@ def atualizar(id: int, data: StatusPedidoUpdateSchema, gateway: StatusPedidoGate
         }
     }
 })
-def deletar(id: int, gateway: StatusPedidoGateway = Depends(get_status_repository)):
+async def deletar(id: int, 
+                  gateway: StatusPedidoGateway = Depends(get_status_repository),
+                  unitOfWork: UnitOfWork = Depends(get_unit_of_work)):
     try:
         
-        return StatusPedidoController(db_session=gateway).deletar(id=id)       
+        return await unitOfWork.run(StatusPedidoController(db_session=gateway).deletar, id=id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
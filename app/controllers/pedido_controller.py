@@ -1,49 +1,155 @@
+from contextlib import nullcontext
+
 from fastapi import status, HTTPException, Response
+from pydantic import ValidationError
 
 from app.use_cases.pedido_use_case import PedidoUseCase
 from app.use_cases.pedido_produtos_use_case import PedidoProdutosUseCase
-from app.adapters.presenters.pedido_presenter import PedidoResponse, PedidoResponseList
-from app.adapters.schemas.pedido import PedidoProdutosResponseSchema
+from app.adapters.presenters.pedido_presenter import PedidoResponse, PedidoResponseList, PedidoAlteracoesResponse, PedidoStatusLoteResponse, PedidoLoteResponse
+from app.adapters.schemas.pedido import PedidoProdutosResponseSchema, PedidoLoteResultadoSchema
+from app.adapters.dto.pedido_dto import PedidoCreateSchema
+from app.adapters.utils.etag import make_etag, etag_matches
+from app.infrastructure.api.responses import PydanticJSONResponse, not_modified
+from app.infrastructure.events.broker import EventBroker, pedido_events
+from app.entities.pedido.exceptions import TransicaoStatusInvalida
 
 from app.adapters.utils.debug import var_dump_die
 
 class PedidoController:
     
-    def __init__(self, db_session):
+    def __init__(self, db_session, unit_of_work=None, events: EventBroker = pedido_events):
         self.db_session = db_session
+        self.unit_of_work = unit_of_work if unit_of_work is not None else nullcontext()
+        self.events = events
     
     def criar_pedido(self, pedido, pedidoProdutosGateway):
         try:
-            orderUseCase = PedidoUseCase(self.db_session).criar_pedido(pedido)
+            with self.unit_of_work:
+                orderUseCase = PedidoUseCase(self.db_session).criar_pedido(pedido)
 
-            productOrderUseCase = (PedidoProdutosUseCase(pedidoProdutosGateway)
-                .criarPedidoProdutos(orderUseCase.id, pedido.produtos))
+                productOrderUseCase = (PedidoProdutosUseCase(pedidoProdutosGateway)
+                    .criarPedidoProdutos(orderUseCase.id, pedido.produtos))
             
             response = self._create_response_schema(orderUseCase, productOrderUseCase)
+            self.events.publish("pedido_criado", response.model_dump(mode="json"))
             
-            return PedidoResponse(status = 'success', data = response)
+            return PedidoResponse.model_construct(status = 'success', data = response)
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    def listar_todos(self):
+    def criar_pedidos_em_lote(self, pedidos, pedidoProdutosGateway):
         try:
-            result = PedidoUseCase(self.db_session).listar_todos()
+            resultados = [None] * len(pedidos)
+            validos = []
+
+            for indice, pedido in enumerate(pedidos):
+                try:
+                    validos.append((indice, PedidoCreateSchema.model_validate(pedido)))
+                except ValidationError as e:
+                    erro = "; ".join(f"{'.'.join(map(str, detalhe['loc']))}: {detalhe['msg']}" for detalhe in e.errors())
+                    resultados[indice] = PedidoLoteResultadoSchema(indice=indice, erro=erro)
+
+            criados = []
 
-            return PedidoResponseList(status = 'sucess', data = result)
+            with self.unit_of_work:
+                try:
+                    criados = self._inserir_lote(validos, pedidoProdutosGateway)
+                except Exception:
+                    # One bad order fails the bulk statements: retry one by one, each in its own savepoint
+                    for item in validos:
+                        try:
+                            criados.extend(self._inserir_lote([item], pedidoProdutosGateway))
+                        except Exception as e:
+                            resultados[item[0]] = PedidoLoteResultadoSchema(indice=item[0], erro=str(e))
+
+            for indice, response in criados:
+                resultados[indice] = PedidoLoteResultadoSchema(indice=indice, id=response.id)
+                self.events.publish("pedido_criado", response.model_dump(mode="json"))
+
+            return PedidoLoteResponse.model_construct(status = 'success', data = resultados)
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    def buscar_por_id(self, id, pedidoProdutosGateway):
+    def _inserir_lote(self, validos, pedidoProdutosGateway) -> list:
+        if not validos:
+            return []
+
+        # Responses are built inside the savepoint too: any failure leaves nothing behind to retry over
+        with self.unit_of_work.savepoint():
+            pedidosCriados = PedidoUseCase(self.db_session).criar_pedidos_em_lote([pedido for _, pedido in validos])
+
+            (PedidoProdutosUseCase(pedidoProdutosGateway)
+                .criarPedidoProdutosEmLote({criado.id: pedido.produtos for criado, (_, pedido) in zip(pedidosCriados, validos)}))
+
+            return [(indice, self._create_response_schema(criado, pedido.produtos)) 
+                    for criado, (indice, pedido) in zip(pedidosCriados, validos)]
+
+    def listar_todos(self, limite=None, cursor=None, status_pedido=None, cliente_id=None, pedidoProdutosGateway=None, 
+                     if_none_match=None):
+        try:
+            orderUseCase = PedidoUseCase(self.db_session)
+
+            # Checked before the page query: order items never change after creation, so the
+            # counter and status descriptions version every page, and the params pick the page and its shape
+            etag = make_etag(orderUseCase.versao_listagem(),
+                             limite, cursor, status_pedido, cliente_id, pedidoProdutosGateway is not None)
+
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+            result, proximo_cursor = orderUseCase.listar_todos(limite=limite, 
+                                                               cursor=cursor, 
+                                                               status=status_pedido, 
+                                                               cliente_id=cliente_id)
+
+            if pedidoProdutosGateway is not None:
+                productsByOrder = (PedidoProdutosUseCase(pedidoProdutosGateway)
+                                    .buscarPorIdsPedido(pedido_ids=[pedido.id for pedido in result]))
+
+                result = [self._create_response_schema(pedido, productsByOrder.get(pedido.id, [])) 
+                          for pedido in result]
+
+            response = PedidoResponseList.model_construct(status = 'sucess', data = result, next_cursor = proximo_cursor)
+
+            return PydanticJSONResponse(response, headers={"ETag": etag})
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def listar_alteracoes(self, desde=None, limite=100, pedidoProdutosGateway=None):
+        try:
+            result, removidos, cursor, mais = (PedidoUseCase(self.db_session)
+                                                .listar_alteracoes(desde=desde, limite=limite))
+
+            if pedidoProdutosGateway is not None and result:
+                productsByOrder = (PedidoProdutosUseCase(pedidoProdutosGateway)
+                                    .buscarPorIdsPedido(pedido_ids=[pedido.id for pedido in result]))
+
+                result = [self._create_response_schema(pedido, productsByOrder.get(pedido.id, [])) 
+                          for pedido in result]
+
+            return PedidoAlteracoesResponse.model_construct(status = 'success', data = result, removidos = removidos, 
+                                                            cursor = cursor, mais = mais)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def buscar_por_id(self, id, pedidoProdutosGateway, if_none_match=None):
         try:
             orderUseCase = (PedidoUseCase(self.db_session)
                                 .buscar_por_id(id=id))
+
+            etag = make_etag(self._fingerprint(orderUseCase))
+
+            # Unchanged order: answer before loading its products
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
             
             productOrderUseCase = (PedidoProdutosUseCase(pedidoProdutosGateway)
                                     .buscarPorIdPedido(pedido_id=orderUseCase.id))
             
             response = self._create_response_schema(orderUseCase, productOrderUseCase)
 
-            return PedidoResponse(status = 'success', data = response)
+            return PydanticJSONResponse(PedidoResponse.model_construct(status = 'success', data = response), 
+                                        headers={"ETag": etag})
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except Exception as e:
@@ -57,17 +163,62 @@ class PedidoController:
                                     .buscarPorIdPedido(pedido_id=orderUseCase.id))
             
             response = self._create_response_schema(orderUseCase, productOrderUseCase)
+            self.events.publish("pedido_atualizado", response.model_dump(mode="json"))
 
-            return PedidoResponse(status = 'success', data = response)       
+            return PedidoResponse.model_construct(status = 'success', data = response)       
+        except TransicaoStatusInvalida as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         
+    def atualizar_status_em_lote(self, itens, pedidoProdutosGateway=None):
+        try:
+            with self.unit_of_work:
+                resultados = PedidoUseCase(self.db_session).atualizar_status_em_lote(itens)
+                atualizados = [resultado for resultado in resultados if resultado.pedido is not None]
+
+                # Products are only reloaded when the caller asked for them, in one query
+                if pedidoProdutosGateway is not None and atualizados:
+                    productsByOrder = (PedidoProdutosUseCase(pedidoProdutosGateway)
+                                        .buscarPorIdsPedido(pedido_ids=[resultado.id for resultado in atualizados]))
+
+                    for resultado in atualizados:
+                        resultado.pedido = self._create_response_schema(resultado.pedido, productsByOrder.get(resultado.id, []))
+
+            for resultado in atualizados:
+                self.events.publish("pedido_atualizado", resultado.pedido.model_dump(mode="json"))
+
+            return PedidoStatusLoteResponse.model_construct(status = 'success', data = resultados)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def reivindicar_proximo(self, status_origem, pedidoProdutosGateway):
+        try:
+            with self.unit_of_work:
+                orderUseCase = PedidoUseCase(self.db_session).reivindicar_proximo(status_origem=status_origem)
+
+                if orderUseCase is None:
+                    return None
+
+                productOrderUseCase = (PedidoProdutosUseCase(pedidoProdutosGateway)
+                                        .buscarPorIdPedido(pedido_id=orderUseCase.id))
+
+            response = self._create_response_schema(orderUseCase, productOrderUseCase)
+            self.events.publish("pedido_atualizado", response.model_dump(mode="json"))
+
+            return PedidoResponse.model_construct(status = 'success', data = response)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     def deletar(self, id, pedidoProdutosGateway):
         try:
-            PedidoProdutosUseCase(pedidoProdutosGateway).deletarPorPedido(id)
-            PedidoUseCase(self.db_session).deletar_pedido(id)
+            with self.unit_of_work:
+                PedidoProdutosUseCase(pedidoProdutosGateway).deletarPorPedido(id)
+                PedidoUseCase(self.db_session).deletar_pedido(id)
+
+            self.events.publish("pedido_removido", {"id": id})
 
             return Response(status_code=status.HTTP_204_NO_CONTENT)
         except ValueError as e:
@@ -86,3 +237,7 @@ class PedidoController:
                 data_finalizacao=pedido.data_finalizacao,
                 produtos=pedidoProdutos
             )
+
+    def _fingerprint(self, pedido) -> tuple:
+        # versao moves on every committed write; the status description is joined in, so renames count too
+        return (pedido.id, pedido.versao, pedido.status.id, pedido.status.descricao)
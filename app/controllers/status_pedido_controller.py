@@ -3,6 +3,8 @@ from fastapi import HTTPException, status, Response
 from app.use_cases.status_pedido_use_case import StatusPedidoUseCase
 from app.adapters.presenters.status_pedido_presenter import StatusPedidoResponse, StatusPedidoResponseList
 from app.adapters.dto.status_pedido_dto import StatusPedidoCreateSchema, StatusPedidoUpdateSchema
+from app.adapters.utils.etag import make_etag, etag_matches
+from app.infrastructure.api.responses import PydanticJSONResponse, not_modified
 
 class StatusPedidoController:
     
@@ -12,8 +14,9 @@ class StatusPedidoController:
     def criar(self, dataRequest: StatusPedidoCreateSchema):
         try:
             result = StatusPedidoUseCase(self.db_session).criar(statusRequest=dataRequest)
+            self.db_session.invalidar_cache()
             
-            return StatusPedidoResponse(status='success', data=result)
+            return StatusPedidoResponse.model_construct(status='success', data=result)
         except Exception as e:       
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -21,25 +24,32 @@ class StatusPedidoController:
         try:
             result = StatusPedidoUseCase(self.db_session).buscar_por_id(id)
 
-            return StatusPedidoResponse(status='success', data=result)
+            return StatusPedidoResponse.model_construct(status='success', data=result)
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except Exception as e:       
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    def listar_todos(self):
+    def listar_todos(self, if_none_match=None):
         try:
+            # Served from the status cache, so a revalidation usually costs no query
             result = StatusPedidoUseCase(self.db_session).listar_todos()
+            etag = make_etag([(item.id, item.descricao) for item in result])
+
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
             
-            return StatusPedidoResponseList(status='success', data=result)
+            return PydanticJSONResponse(StatusPedidoResponseList.model_construct(status='success', data=result), 
+                                        headers={"ETag": etag})
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     def atualizar(self, id: int, data: StatusPedidoUpdateSchema):
         try:
             result = StatusPedidoUseCase(self.db_session).atualizar(id=id, dataRequest=data)
+            self.db_session.invalidar_cache()
 
-            return StatusPedidoResponse(status='success', data=result)
+            return StatusPedidoResponse.model_construct(status='success', data=result)
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except Exception as e:
@@ -48,6 +58,7 @@ class StatusPedidoController:
     def deletar(self, id: int):
         try:
             StatusPedidoUseCase(self.db_session).deletar(id=id)
+            self.db_session.invalidar_cache()
 
             return Response(status_code=status.HTTP_204_NO_CONTENT)
         except ValueError as e:
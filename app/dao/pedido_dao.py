@@ -1,10 +1,36 @@
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import case, delete, insert, select, true, tuple_, update
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import aliased, joinedload
 from datetime import datetime
+from types import SimpleNamespace
 
 from app.entities.pedido.entities import Pedido
+from app.models.pedido_removido import PedidoRemovido
+from app.models.pedido_sequencia import PedidoSequencia
+from app.models.status_pedido import StatusPedido
 from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
-from app.adapters.enums.status_pedido import StatusPedidoEnum
+from app.adapters.enums.status_pedido import StatusPedidoEnum, TRANSICOES_PERMITIDAS
+from app.adapters.schemas.status_pedido import StatusPedidoResponseSchema
+from app.entities.pedido.exceptions import TransicaoStatusInvalida
 from app.adapters.utils.debug import var_dump_die
+from app.infrastructure.db.unit_of_work import commit_or_flush, rollback_unless_owned
+
+# No versao: it is only stamped right before COMMIT, after these rows come back
+_COLUNAS_PEDIDO = (Pedido.id, Pedido.cliente_id, Pedido.status, Pedido.data_criacao,
+                   Pedido.data_alteracao, Pedido.data_finalizacao)
+_DESCRICAO_STATUS = (select(StatusPedido.descricao)
+                     .where(StatusPedido.id == Pedido.status)
+                     .scalar_subquery()
+                     .label("status_descricao"))
+
+def _pedido_da_linha(row, descricao: str | None = None):
+    """Detached read model of a RETURNING row, shaped like Pedido for the use case."""
+    valores = dict(row._mapping)
+    descricao = valores.pop("status_descricao", descricao)
+
+    # versao is stamped right before COMMIT, after this row came back
+    return SimpleNamespace(**valores, versao=None,
+                           status_rel=StatusPedidoResponseSchema.model_construct(id=valores["status"], descricao=descricao))
 
 class PedidoDAO:
     
@@ -14,20 +40,49 @@ class PedidoDAO:
     def criar_pedido(self, pedido: Pedido) -> Pedido:
         pedidoEntity: Pedido = Pedido(cliente_id=pedido.cliente_id, status=1)
         pedidoEntity.status = str(StatusPedidoEnum.Recebido.value)
-        pedidoEntity.data_criacao = datetime.now()
+        pedidoEntity.data_criacao = datetime.now().time()
         
         try:
             self.db_session.add(pedidoEntity)
-            self.db_session.commit()
+            self.db_session.flush()
+            committed = self._commit_or_flush_versionado(pedidos=[pedidoEntity.id])
         except IntegrityError as e:
-            self.db_session.rollback()
+            rollback_unless_owned(self.db_session)
             
             raise Exception(f"Erro de integridade ao salvar o pedido: {e}")
         
-        self.db_session.refresh(pedidoEntity)
+        if committed:
+            self.db_session.refresh(pedidoEntity)
         
         return pedidoEntity
 
+    def criar_pedidos_em_lote(self, pedidos: list) -> list:
+        """
+        Inserts every order with one multi-row INSERT ... RETURNING, rows coming
+        back in input order. Errors are not rolled back here: the caller's
+        savepoint decides how much of the batch is lost.
+        """
+        if not pedidos:
+            return []
+
+        recebido = int(StatusPedidoEnum.Recebido.value)
+        agora = datetime.now().time()
+        rows = [{"cliente_id": pedido.cliente_id, 
+                 "status": recebido, 
+                 "data_criacao": agora} for pedido in pedidos]
+
+        try:
+            criados = self.db_session.execute(insert(Pedido).returning(*_COLUNAS_PEDIDO, sort_by_parameter_order=True), 
+                                              rows).all()
+        except DBAPIError as e:
+            raise Exception(f"Erro de integridade ao salvar o pedido: {e.orig}") from e
+
+        # Every new order is Recebido: one lookup instead of a join per row
+        descricao = self.db_session.scalar(select(StatusPedido.descricao).where(StatusPedido.id == recebido))
+        self._commit_or_flush_versionado(pedidos=[row.id for row in criados])
+
+        return [_pedido_da_linha(row, descricao) for row in criados]
+
     def busca_por_status(self, status) : 
 
         return (self.db_session
@@ -36,6 +91,57 @@ class PedidoDAO:
                 .order_by(Pedido.data_criacao.asc())
                 .all())
     
+    def reivindicar_proximo(self, status_origem: int, status_destino: int):
+        """
+        Moves the oldest order in `status_origem` (same order as busca_por_status)
+        to `status_destino` and returns it, or None when there is nothing to
+        claim. Rows locked by another transaction are skipped rather than
+        waited on, so two stations never walk away with the same order. The
+        change version is only taken once an order was claimed.
+        """
+        candidato = aliased(Pedido)
+        proximo = (select(candidato.id)
+                   .where(candidato.status == status_origem)
+                   .order_by(candidato.data_criacao.asc(), candidato.id.asc())
+                   .limit(1)
+                   .with_for_update(skip_locked=True)
+                   .scalar_subquery())
+
+        row = self.db_session.execute(update(Pedido)
+                                      .where(Pedido.id == proximo, Pedido.status == status_origem)
+                                      .values(status=status_destino, data_alteracao=datetime.now().time())
+                                      .returning(*_COLUNAS_PEDIDO, _DESCRICAO_STATUS),
+                                      execution_options={"synchronize_session": False}).first()
+
+        self._commit_or_flush_versionado(pedidos=[row.id] if row is not None else [])
+
+        return _pedido_da_linha(row) if row is not None else None
+
+    def listar_por_prioridade(self, status_prioridade: list[int], status_filtro: list[int] | None = None,
+                              cliente_id: int | None = None, apos: tuple | None = None, limite: int | None = None) :
+        prioridade = case({status: posicao for posicao, status in enumerate(status_prioridade)},
+                          value=Pedido.status,
+                          else_=len(status_prioridade))
+
+        query = (self.db_session
+                 .query(Pedido)
+                 .options(joinedload(Pedido.status_rel))
+                 .filter(Pedido.status.in_(status_filtro or status_prioridade)))
+
+        if cliente_id is not None:
+            query = query.filter(Pedido.cliente_id == cliente_id)
+
+        # Keyset pagination: resume strictly after the last (priority, data_criacao, id) seen
+        if apos is not None:
+            query = query.filter(tuple_(prioridade, Pedido.data_criacao, Pedido.id) > tuple_(*apos))
+
+        query = query.order_by(prioridade, Pedido.data_criacao.asc(), Pedido.id.asc())
+
+        if limite is not None:
+            query = query.limit(limite)
+
+        return query.all()
+    
     def buscar_por_id(self, id: int) :
 
         return (self.db_session
@@ -44,32 +150,175 @@ class PedidoDAO:
                 .first()) 
 
     def atualizar_pedido(self, id: int,  pedidoRequest: PedidoAtualizaSchema) :
-        pedidoEntity = self.buscar_por_id(id)
-        
-        if pedidoEntity :
-            if (pedidoEntity.status == int(StatusPedidoEnum.Finalizado.value)):
-                raise Exception("Pedido já finalizado")
-            
-            pedidoEntity.status = pedidoRequest.status
-            pedidoEntity.data_alteracao = datetime.now()
-            pedidoEntity.cliente_id = pedidoEntity.cliente_id
+        novoStatus = int(pedidoRequest.status)
+        predecessores = TRANSICOES_PERMITIDAS.get(novoStatus)
 
-            if int(pedidoRequest.status) == int(StatusPedidoEnum.Finalizado):
-                pedidoEntity.data_finalizacao = datetime.now()
+        if predecessores is None:
+            raise Exception(f"Status inválido: {novoStatus}")
 
-            for field, value in pedidoRequest.model_dump().items():
-                setattr(pedidoEntity, field, value)
+        agora = datetime.now().time()
+        valores = {"status": novoStatus, "data_alteracao": agora}
 
-            self.db_session.commit()
-            self.db_session.refresh(pedidoEntity)
-        
-        return pedidoEntity
+        if novoStatus == int(StatusPedidoEnum.Finalizado.value):
+            valores["data_finalizacao"] = agora
+
+        # Compare-and-set: the status check and the write are one statement, so two
+        # terminals bumping the same order can't both pass a stale check
+        row = self.db_session.execute(update(Pedido)
+                                      .where(Pedido.id == id, Pedido.status.in_(predecessores))
+                                      .values(**valores)
+                                      .returning(*_COLUNAS_PEDIDO, _DESCRICAO_STATUS),
+                                      execution_options={"synchronize_session": False}).first()
+
+        if row is None:
+            atual = self.db_session.scalar(select(Pedido.status).where(Pedido.id == id))
+
+            if atual is None:
+                return None
+
+            if atual == int(StatusPedidoEnum.Finalizado.value):
+                raise TransicaoStatusInvalida("Pedido já finalizado")
+
+            raise TransicaoStatusInvalida(f"Transição de status {atual} para {novoStatus} não permitida")
+
+        self._commit_or_flush_versionado(pedidos=[id])
+
+        return _pedido_da_linha(row)
+
+    def atualizar_status_em_lote(self, itens: dict[int, int]) -> tuple[list, dict]:
+        """
+        Applies {pedido_id: novo_status} with one compare-and-set UPDATE per target
+        status. Returns the updated rows and, for every id left untouched, its
+        current status (None when the order doesn't exist).
+        """
+        porStatus: dict[int, list[int]] = {}
+
+        for id, novoStatus in itens.items():
+            porStatus.setdefault(novoStatus, []).append(id)
+
+        agora = datetime.now().time()
+        atualizados = []
+
+        for novoStatus, ids in porStatus.items():
+            valores = {"status": novoStatus, "data_alteracao": agora}
+
+            if novoStatus == int(StatusPedidoEnum.Finalizado.value):
+                valores["data_finalizacao"] = agora
+
+            rows = self.db_session.execute(update(Pedido)
+                                           .where(Pedido.id.in_(ids), Pedido.status.in_(TRANSICOES_PERMITIDAS[novoStatus]))
+                                           .values(**valores)
+                                           .returning(*_COLUNAS_PEDIDO, _DESCRICAO_STATUS),
+                                           execution_options={"synchronize_session": False}).all()
+            atualizados.extend(_pedido_da_linha(row) for row in rows)
+
+        recusados = set(itens) - {pedido.id for pedido in atualizados}
+        atuais = {}
+
+        if recusados:
+            atuais = dict(self.db_session.execute(select(Pedido.id, Pedido.status)
+                                                  .where(Pedido.id.in_(recusados))).all())
+
+        self._commit_or_flush_versionado(pedidos=[pedido.id for pedido in atualizados])
+
+        return atualizados, {id: atuais.get(id) for id in recusados}
 
     def deletar_pedido(self, id: int) -> None :
-        pedidoEntity = self.buscar_por_id(id)
+        result = self.db_session.execute(delete(Pedido).where(Pedido.id == id),
+                                         execution_options={"synchronize_session": False})
         
-        if not pedidoEntity:
+        if not result.rowcount:
             raise ValueError("Pedido não encontrado")
         
-        self.db_session.delete(pedidoEntity)
-        self.db_session.commit()
\ No newline at end of file
+        self._commit_or_flush_versionado(removidos=[id])
+
+    def listar_alteracoes(self, desde: int, limite: int) -> tuple[list, list]:
+        # Under READ COMMITTED each statement sees a newer snapshot. Both sides are
+        # bounded by the counter read first, so a change committed between the two
+        # queries can't push the cursor past a version the first one never saw
+        teto = self.versao_atual()
+
+        # One row past the limit on each side, so the caller can tell whether
+        # more changes are pending even when they are all on one side
+        pedidos = (self.db_session
+                   .query(Pedido)
+                   .options(joinedload(Pedido.status_rel))
+                   .filter(Pedido.versao > desde, Pedido.versao <= teto)
+                   .order_by(Pedido.versao.asc())
+                   .limit(limite + 1)
+                   .all())
+
+        removidos = (self.db_session
+                     .query(PedidoRemovido)
+                     .filter(PedidoRemovido.versao > desde, PedidoRemovido.versao <= teto)
+                     .order_by(PedidoRemovido.versao.asc())
+                     .limit(limite + 1)
+                     .all())
+
+        return pedidos, removidos
+
+    def versao_atual(self) -> int:
+        
+        return self.db_session.scalar(select(PedidoSequencia.valor).where(PedidoSequencia.id == 1)) or 0
+
+    def versao_listagem(self) -> tuple:
+        """
+        Validator for any page of GET /pedidos/, in one small query: the
+        counter, which every order write bumps, and the status descriptions
+        the pages join in.
+        """
+        rows = self.db_session.execute(select(PedidoSequencia.valor, StatusPedido.id, StatusPedido.descricao)
+                                       .join(StatusPedido, true())
+                                       .where(PedidoSequencia.id == 1)
+                                       .order_by(StatusPedido.id)).all()
+
+        return (rows[0].valor if rows else 0, [(row.id, row.descricao) for row in rows])
+
+    def _commit_or_flush_versionado(self, pedidos: list[int] = (), removidos: list[int] = ()) -> bool:
+        """
+        commit_or_flush that also stamps the next change versions on `pedidos`
+        and writes tombstones for `removidos`, as the last statements before
+        COMMIT (of the UnitOfWork, when one owns the session).
+        """
+        pedidos, removidos = list(pedidos), list(removidos)
+
+        return commit_or_flush(self.db_session, before_commit=lambda: self._carimbar_versoes(pedidos, removidos))
+
+    def _carimbar_versoes(self, pedidos: list[int], removidos: list[int]) -> None:
+        quantidade = len(pedidos) + len(removidos)
+
+        if not quantidade:
+            return
+
+        # One version per row, so /pedidos/changes never sees two rows tied on a cursor
+        ultima = self._proxima_versao(quantidade)
+        versoes = iter(range(ultima - quantidade + 1, ultima + 1))
+
+        if pedidos:
+            porId = {id: next(versoes) for id in pedidos}
+            self.db_session.execute(update(Pedido)
+                                    .where(Pedido.id.in_(porId))
+                                    .values(versao=case(porId, value=Pedido.id)),
+                                    execution_options={"synchronize_session": False})
+
+        if removidos:
+            self.db_session.execute(insert(PedidoRemovido), [{"id": id, "versao": next(versoes)} for id in removidos])
+
+    def _proxima_versao(self, quantidade: int = 1) -> int:
+        # Bumping one counter row, instead of a database sequence, makes concurrent
+        # writers queue on its row lock until commit: versions become visible in
+        # order, so a reader never skips a change committed behind its cursor.
+        # Only ever called right before COMMIT (see _carimbar_versoes), which keeps
+        # that lock short and always taken last, after any pedido row lock.
+        # Reserves `quantidade` versions and returns the last one
+        valor = self.db_session.execute(update(PedidoSequencia)
+                                        .where(PedidoSequencia.id == 1)
+                                        .values(valor=PedidoSequencia.valor + quantidade)
+                                        .returning(PedidoSequencia.valor),
+                                        execution_options={"synchronize_session": False}).scalar()
+
+        if valor is None:
+            # The row is seeded by migration 0001_pedido_versao; creating it here would race
+            raise Exception("Contador de versões ausente: pedido_sequencia precisa da linha id = 1 (rode alembic upgrade head)")
+
+        return valor
\ No newline at end of file
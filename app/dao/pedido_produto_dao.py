@@ -1,7 +1,9 @@
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
 
 from app.models.pedido_produto import PedidoProdutoModel
 from app.adapters.utils.debug import var_dump_die
+from app.infrastructure.db.unit_of_work import commit_or_flush, rollback_unless_owned
 
 class PedidoProdutoDAO:
     
@@ -14,15 +16,61 @@ class PedidoProdutoDAO:
                                                              produto_id=produto_id))
 
             self.db_session.add(entity)
-            self.db_session.commit()
+            committed = commit_or_flush(self.db_session)
         except IntegrityError as e:
-            self.db_session.rollback()
+            rollback_unless_owned(self.db_session)
             
             raise Exception(f"Erro de integridade ao salvar produtos no pedido: {e}")
         
-        self.db_session.refresh(entity)
+        if committed:
+            self.db_session.refresh(entity)
 
         return entity
+
+    def criar_pedido_produtos(self, pedido_id: int, produtos: list) -> list:
+        rows = [{"pedido_id": pedido_id, "produto_id": produto_id} for produto_id in produtos]
+
+        if not rows:
+            return []
+
+        # One multi-row INSERT for the whole cart; RETURNING replaces the per-row refresh
+        statement = insert(PedidoProdutoModel)
+        supports_returning = self.db_session.get_bind().dialect.insert_executemany_returning
+
+        if supports_returning:
+            statement = statement.returning(PedidoProdutoModel.id,
+                                            PedidoProdutoModel.pedido_id,
+                                            PedidoProdutoModel.produto_id)
+
+        try:
+            result = self.db_session.execute(statement, rows)
+            created = result.all() if supports_returning else [PedidoProdutoModel(**row) for row in rows]
+
+            commit_or_flush(self.db_session)
+        except IntegrityError as e:
+            rollback_unless_owned(self.db_session)
+
+            raise Exception(f"Erro de integridade ao salvar produtos no pedido: {e}")
+
+        return created
+    
+    def criar_pedidos_produtos_em_lote(self, produtosPorPedido: dict[int, list]) -> int:
+        rows = [{"pedido_id": pedido_id, "produto_id": produto_id} 
+                for pedido_id, produtos in produtosPorPedido.items() 
+                for produto_id in produtos]
+
+        if not rows:
+            return 0
+
+        # Items of the whole batch in one statement; errors are left to the caller's savepoint
+        try:
+            self.db_session.execute(insert(PedidoProdutoModel), rows)
+        except DBAPIError as e:
+            raise Exception(f"Erro de integridade ao salvar produtos no pedido: {e.orig}") from e
+
+        commit_or_flush(self.db_session)
+
+        return len(rows)
     
     def buscarPorIdPedido(self, pedido_id: int) -> PedidoProdutoModel:       
         
@@ -31,10 +79,28 @@ class PedidoProdutoDAO:
                 .filter(PedidoProdutoModel.pedido_id == pedido_id)
                 .all())
     
+    def buscarPorIdsPedido(self, pedido_ids: list[int]) -> list[PedidoProdutoModel]:
+        if not pedido_ids:
+            return []
+
+        return (self.db_session
+                .query(PedidoProdutoModel)
+                .filter(PedidoProdutoModel.pedido_id.in_(pedido_ids))
+                .order_by(PedidoProdutoModel.pedido_id, PedidoProdutoModel.id)
+                .all())
+    
     def deletar(self, id: int) -> None:
         db_pedido_produtos = self.db_session.query(PedidoProdutoModel).filter(PedidoProdutoModel.id == id).first()
 
         if db_pedido_produtos:
             self.db_session.delete(db_pedido_produtos)
-            self.db_session.commit()       
-            #self.db_session.flush()
\ No newline at end of file
+            commit_or_flush(self.db_session)
+            #self.db_session.flush()
+
+    def deletar_por_pedido(self, pedido_id: int) -> int:
+        result = self.db_session.execute(delete(PedidoProdutoModel)
+                                         .where(PedidoProdutoModel.pedido_id == pedido_id),
+                                         execution_options={"synchronize_session": False})
+        commit_or_flush(self.db_session)
+
+        return result.rowcount
\ No newline at end of file
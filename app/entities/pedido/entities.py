@@ -6,7 +6,10 @@ class PedidoEntities(ABC):
     def criar_pedido(self, pedido: Pedido): pass
 
     @abstractmethod
-    def listar_todos(self): pass
+    def criar_pedidos_em_lote(self, pedidos: list): pass
+
+    @abstractmethod
+    def listar_todos(self, status: int = None, cliente_id: int = None, apos: tuple = None, limite: int = None): pass
 
     @abstractmethod
     def buscar_por_id(self, id: int): pass
@@ -15,4 +18,19 @@ class PedidoEntities(ABC):
     def atualizar_pedido(self, pedido: Pedido): pass
 
     @abstractmethod
-    def deletar_pedido(self, id: int): pass
\ No newline at end of file
+    def atualizar_status_em_lote(self, itens: dict): pass
+
+    @abstractmethod
+    def reivindicar_proximo(self, status_origem: int, status_destino: int): pass
+
+    @abstractmethod
+    def deletar_pedido(self, id: int): pass
+
+    @abstractmethod
+    def listar_alteracoes(self, desde: int, limite: int): pass
+
+    @abstractmethod
+    def versao_atual(self): pass
+
+    @abstractmethod
+    def versao_listagem(self): pass
\ No newline at end of file
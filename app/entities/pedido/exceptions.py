@@ -0,0 +1,2 @@
+class TransicaoStatusInvalida(Exception):
+    """The order exists but its current status can't move to the requested one."""
@@ -5,9 +5,20 @@ class PedidoProdutoEntities(ABC):
     @abstractmethod
     def criarPedidoProduto(self, pedido_id: int, produto_id: int): pass
 
+    @abstractmethod
+    def criarPedidoProdutos(self, pedido_id: int, produtos: list): pass
+
+    @abstractmethod
+    def criarPedidoProdutosEmLote(self, produtosPorPedido: dict): pass
+
     @abstractmethod
     def buscarPorIdPedido(self, pedido_id: int): pass
 
+    @abstractmethod
+    def buscarPorIdsPedido(self, pedido_ids: list[int]): pass
+
     @abstractmethod
     def deletar(self, pedido_produto_id: int): pass
-    
\ No newline at end of file
+
+    @abstractmethod
+    def deletarPorPedido(self, pedido_id: int): pass
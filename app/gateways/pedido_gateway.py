@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.entities.pedido.entities import PedidoEntities, Pedido
 from app.adapters.schemas.pedido import PedidoResponseSchema 
 from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
+from app.adapters.enums.status_pedido import PRIORIDADE_LISTAGEM
 from app.dao.pedido_dao import PedidoDAO
 
 class PedidoGateway(PedidoEntities):
@@ -14,13 +15,18 @@ class PedidoGateway(PedidoEntities):
         
         return self.dao.criar_pedido(pedido)       
 
-    def listar_todos(self) -> list[PedidoResponseSchema]:
-        pedidos_prontos = self.dao.busca_por_status(3)
-        pedidos_em_preparacao = self.dao.busca_por_status(2)
-        pedidos_recebidos = self.dao.busca_por_status(1)
-        db_pedidos = pedidos_prontos + pedidos_em_preparacao + pedidos_recebidos
+    def criar_pedidos_em_lote(self, pedidos: list) -> list:
+        
+        return self.dao.criar_pedidos_em_lote(pedidos)
 
-        return db_pedidos
+    def listar_todos(self, status: int | None = None, cliente_id: int | None = None, 
+                     apos: tuple | None = None, limite: int | None = None) -> list[PedidoResponseSchema]:
+        
+        return self.dao.listar_por_prioridade([int(prioritario.value) for prioritario in PRIORIDADE_LISTAGEM],
+                                              status_filtro=[status] if status is not None else None,
+                                              cliente_id=cliente_id,
+                                              apos=apos,
+                                              limite=limite)
 
     def buscar_por_id(self, id: int) -> PedidoResponseSchema:
         
@@ -30,6 +36,26 @@ class PedidoGateway(PedidoEntities):
         
         return self.dao.atualizar_pedido(id, pedidoRequest)
 
+    def atualizar_status_em_lote(self, itens: dict[int, int]) -> tuple[list, dict]:
+        
+        return self.dao.atualizar_status_em_lote(itens)
+
+    def reivindicar_proximo(self, status_origem: int, status_destino: int):
+        
+        return self.dao.reivindicar_proximo(status_origem, status_destino)
+
     def deletar_pedido(self, id: int) -> None:
         
-        return self.dao.deletar_pedido(id)
\ No newline at end of file
+        return self.dao.deletar_pedido(id)
+
+    def listar_alteracoes(self, desde: int, limite: int) -> tuple[list, list]:
+        
+        return self.dao.listar_alteracoes(desde, limite)
+
+    def versao_atual(self) -> int:
+        
+        return self.dao.versao_atual()
+
+    def versao_listagem(self) -> tuple:
+        
+        return self.dao.versao_listagem()
\ No newline at end of file
@@ -12,11 +12,27 @@ class PedidoProdutoGateway(PedidoProdutoEntities):
 
     def criarPedidoProduto(self, pedido_id: int, produto_id: int) -> PedidoProdutoModel:
         return self.dao.criar_pedido_produto(pedido_id, produto_id)
+
+    def criarPedidoProdutos(self, pedido_id: int, produtos: list) -> list:
+        
+        return self.dao.criar_pedido_produtos(pedido_id, produtos)
+    
+    def criarPedidoProdutosEmLote(self, produtosPorPedido: dict[int, list]) -> int:
+        
+        return self.dao.criar_pedidos_produtos_em_lote(produtosPorPedido)
     
     def buscarPorIdPedido(self, pedido_id: int) -> PedidoProduto:       
         
         return self.dao.buscarPorIdPedido(pedido_id)
+
+    def buscarPorIdsPedido(self, pedido_ids: list[int]) -> list[PedidoProdutoModel]:
+        
+        return self.dao.buscarPorIdsPedido(pedido_ids)
    
     def deletar(self, id: int) -> None:
         
-        return self.dao.deletar(id)
\ No newline at end of file
+        return self.dao.deletar(id)
+
+    def deletarPorPedido(self, pedido_id: int) -> int:
+        
+        return self.dao.deletar_por_pedido(pedido_id)
\ No newline at end of file
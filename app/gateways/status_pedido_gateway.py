@@ -1,14 +1,22 @@
+import os
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.entities.status_pedido.entities import StatusPedidoEntities
 from app.entities.status_pedido.models import StatusPedido
+from app.adapters.schemas.status_pedido import StatusPedidoResponseSchema
 from app.dao.status_pedido_dao import StatusPedidoDAO
+from app.infrastructure.cache.ttl_cache import TTLCache
+
+# Shared by every request of the process; the status table is tiny and rarely changes
+status_cache = TTLCache(maxsize=int(os.getenv("STATUS_CACHE_MAXSIZE", "64")),
+                        ttl=float(os.getenv("STATUS_CACHE_TTL_SECONDS", "300")))
 
 class StatusPedidoGateway(StatusPedidoEntities):
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, cache: TTLCache = status_cache):
         self.dao = StatusPedidoDAO(db_session)
+        self.cache = cache
 
     def criar(self, status: StatusPedido):
         
@@ -16,11 +24,12 @@ class StatusPedidoGateway(StatusPedidoEntities):
 
     def buscar_por_id(self, id: int) -> Optional[StatusPedido]:
         
-        return self.dao.buscar_por_id(id)
+        return self.cache.get_or_load(("id", id), lambda: self._snapshot(self.dao.buscar_por_id(id)))
 
     def listar_todos(self) -> List[StatusPedido]:
-        
-        return self.dao.listar_todos()
+        rows = self.cache.get_or_load("todos", lambda: tuple(self._snapshot(row) for row in self.dao.listar_todos()))
+
+        return list(rows)
     
     def atualizar(self, id: int, status: StatusPedido) -> StatusPedido:
         
@@ -28,4 +37,15 @@ class StatusPedidoGateway(StatusPedidoEntities):
 
     def deletar(self, id: int) -> None:
         
-        return self.dao.deletar(id)
\ No newline at end of file
+        return self.dao.deletar(id)
+
+    def invalidar_cache(self) -> None:
+        
+        self.cache.clear()
+
+    def _snapshot(self, entity) -> Optional[StatusPedidoResponseSchema]:
+        if entity is None:
+            return None
+
+        # Immutable copy, so cached rows never hold on to a closed session
+        return StatusPedidoResponseSchema.model_construct(id=entity.id, descricao=entity.descricao)
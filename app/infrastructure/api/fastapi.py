@@ -1,7 +1,41 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
+from starlette.concurrency import run_in_threadpool
+
+from app.infrastructure.db import database
+from app.infrastructure.db.async_database import is_async_enabled, get_async_engine
+from app.infrastructure.metrics.middleware import MetricsMiddleware, QueryStatsMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+def _aquecer_banco() -> None:
+    # Secrets Manager call (boto3) and engine creation, done once before traffic arrives
+    database.get_sessionmaker()
+
+    if is_async_enabled():
+        get_async_engine()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await run_in_threadpool(_aquecer_banco)
+    except Exception:
+        # Still lazy: the first request that needs the database retries
+        logger.exception("Falha ao preparar a conexão com o banco na inicialização")
+
+    yield
+
 
 app = FastAPI(
     title="Sistema de Autoatendimento da Lanchonete",
     description="Documentacao automatica via Swagger e Redoc",
     version="1.0.0",
-)
\ No newline at end of file
+    lifespan=lifespan,
+)
+
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,25 @@
+from typing import Any
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    Renders Pydantic models straight to JSON bytes with pydantic-core.
+
+    Returning it from a route bypasses FastAPI's `response_model`
+    re-validation and `jsonable_encoder`; the `response_model` declared on
+    the route is then only used for the OpenAPI docs. Meant for envelopes
+    built with `model_construct` in the controllers (pedido_controller,
+    status_pedido_controller) around data that is already validated: schemas
+    made by the use cases and snapshots from the DAO and the status cache.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+from fastapi import Response
+
+from app.infrastructure.cache.ttl_cache import TTLCache
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyKeyConflict(Exception):
+    """The key was already used with a different request body."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: str
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key -> response of the first request that used it.
+
+    Successful responses are kept for `ttl` seconds and replayed byte for
+    byte without running the handler again. A duplicate arriving while the
+    first request is still running waits for it instead of racing it; if
+    that request fails nothing is stored and the waiter runs the handler
+    itself. Keys are per process: a retry served by another replica is not
+    deduplicated.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 86_400.0, clock: Callable[[], float] = time.monotonic):
+        self._responses = TTLCache(maxsize=maxsize, ttl=ttl, clock=clock)
+        # Only touched from the event loop, so no lock is needed
+        self._in_flight: dict = {}
+        self.replays = 0
+        self.conflicts = 0
+
+    async def execute(self, key: Hashable, fingerprint: str, handler: Callable[[], Awaitable[Response]]) -> Response:
+        while True:
+            stored = self._responses.get(key)
+
+            if stored is not None:
+                self._check(stored.fingerprint, fingerprint)
+                return self._replay(stored)
+
+            in_flight = self._in_flight.get(key)
+
+            if in_flight is None:
+                break
+
+            self._check(in_flight[0], fingerprint)
+            # Shielded: a waiter giving up must not cancel the first request's future
+            await asyncio.shield(in_flight[1])
+
+        done = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (fingerprint, done)
+
+        try:
+            response = await handler()
+
+            if 200 <= response.status_code < 300:
+                self._responses.set(key, StoredResponse(fingerprint, response.status_code, bytes(response.body), response.media_type))
+
+            return response
+        finally:
+            del self._in_flight[key]
+            done.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "keys": self._responses.stats()["size"],
+            "in_flight": len(self._in_flight),
+            "replays": self.replays,
+            "conflicts": self.conflicts,
+        }
+
+    def _check(self, stored_fingerprint: str, fingerprint: str) -> None:
+        if stored_fingerprint != fingerprint:
+            self.conflicts += 1
+            raise IdempotencyKeyConflict("Idempotency-Key já utilizada com outro corpo de requisição")
+
+    def _replay(self, stored: StoredResponse) -> Response:
+        self.replays += 1
+
+        return Response(content=stored.body, status_code=stored.status_code, media_type=stored.media_type,
+                        headers={REPLAY_HEADER: "true"})
+
+
+idempotency_store = IdempotencyStore(
+    maxsize=int(os.getenv("IDEMPOTENCY_MAXSIZE", "10000")),
+    ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+)
@@ -0,0 +1,58 @@
+import os
+from functools import lru_cache
+
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.infrastructure.db import query_stats
+from app.infrastructure.db.database import _get_database_url, _engine_options
+from app.infrastructure.db.pool_metrics import PoolMetrics
+
+# Async driver used for each backend when DB_ASYNC is enabled
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def is_async_enabled() -> bool:
+    return os.getenv("DB_ASYNC", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _get_async_database_url() -> URL:
+    """
+    Derive the async URL from the regular database URL, swapping the
+    blocking driver (psycopg2/pysqlite) for its asyncio counterpart.
+    """
+    url = make_url(_get_database_url())
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+
+    if driver is None:
+        raise RuntimeError(f"DB_ASYNC is not supported for '{url.get_backend_name()}' databases.")
+
+    return url.set(drivername=driver)
+
+
+async_pool_metrics = PoolMetrics()
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    url = _get_async_database_url()
+
+    engine = create_async_engine(url, **_engine_options(url, AsyncAdaptedQueuePool, async_pool_metrics))
+    query_stats.install(engine.sync_engine)
+
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker:
+
+    return async_sessionmaker(autocommit=False, autoflush=False, bind=get_async_engine())
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
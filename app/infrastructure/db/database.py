@@ -2,9 +2,13 @@ import os
 import json
 from functools import lru_cache
 
-import boto3
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+
+from app.infrastructure.db import query_stats
+from app.infrastructure.db.pool_metrics import PoolMetrics, instrumented_pool_class
 
 Base = declarative_base()
 
@@ -31,6 +35,9 @@ def _get_database_url() -> str:
             "Set DATABASE_URL for local dev or DB_SECRET_NAME for AWS."
         )
 
+    # Imported here so local/dev runs and the app import never pay for boto3
+    import boto3
+
     region = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "us-east-1"
     sm = boto3.client("secretsmanager", region_name=region)
     secret = json.loads(sm.get_secret_value(SecretId=secret_name)["SecretString"])
@@ -41,12 +48,78 @@ def _get_database_url() -> str:
     password = secret["password"]
     port = secret.get("port", 5432)
 
-    return f"postgresql://{username}:{password}@{host}:{port}/{dbname}"
+    return f"postgresql+psycopg2://{username}:{password}@{host}:{port}/{dbname}"
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "").strip()
+
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name, "").strip().lower()
+
+    return value in ("1", "true", "yes", "on") if value else default
+
+
+def _engine_options(url: str, pool_class: type, metrics: PoolMetrics) -> dict:
+    """
+    Pool settings from the environment:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds),
+    DB_POOL_RECYCLE (seconds, -1 disables) and DB_POOL_PRE_PING.
+
+    SQLite keeps SQLAlchemy's own pool choice, which takes none of the
+    QueuePool sizing arguments.
+    """
+    options = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True)}
+
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        poolclass=instrumented_pool_class(pool_class, metrics),
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+    )
+
+    return options
+
+
+pool_metrics = PoolMetrics()
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    Create the engine once per process, on first use rather than at
+    import time, so the URL (and the Secrets Manager call behind it)
+    is only resolved when a request actually needs the database.
+    """
+    url = _get_database_url()
+
+    engine = create_engine(url, **_engine_options(url, QueuePool, pool_metrics))
+
+    return query_stats.install(engine)
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+def SessionLocal() -> Session:
+    return get_sessionmaker()()
+
 
+def __getattr__(name: str):
+    # Backwards compatible `database.engine`, built lazily
+    if name == "engine":
+        return get_engine()
 
-# Create engine once per process
-engine = create_engine(_get_database_url(), pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db():
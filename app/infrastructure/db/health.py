@@ -0,0 +1,160 @@
+import asyncio
+import os
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.pool import Pool
+from starlette.concurrency import run_in_threadpool
+
+from app.infrastructure.db import database
+from app.infrastructure.db.async_database import is_async_enabled, get_async_engine, async_pool_metrics
+
+_PROBE = text("SELECT 1")
+# Transaction-local, like SET LOCAL, but takes a bind parameter
+_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
+
+
+def pool_saturation(pool: Pool) -> Optional[float]:
+    """
+    Fraction of the pool capacity (pool_size + max_overflow) checked out.
+    None for pools without a fixed capacity (sqlite, unlimited overflow).
+    """
+    size = getattr(pool, "size", None)
+    max_overflow = getattr(pool, "_max_overflow", None)
+
+    if not callable(size) or not isinstance(max_overflow, int) or max_overflow < 0:
+        return None
+
+    capacity = size() + max_overflow
+    if capacity <= 0:
+        return None
+
+    return pool.checkedout() / capacity
+
+
+class DatabaseHealth:
+    """
+    Readiness of the database for this pod.
+
+    Runs `SELECT 1` bounded by `timeout` seconds and keeps the outcome for
+    `ttl` seconds, so frequent kubelet probes share one round trip instead
+    of each taking a pool connection; probes arriving while a refresh is in
+    flight wait for it rather than starting their own. On PostgreSQL the
+    probe also runs under a `statement_timeout`, so the database cancels a
+    stuck probe and its connection goes back to the pool even after the
+    check has stopped waiting. A pool at or above `saturation` is reported
+    as not ready without probing, so traffic is shed before requests start
+    queueing for a connection.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 5.0,
+        timeout: float = 2.0,
+        saturation: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.saturation = saturation
+        self._clock = clock
+        self._result: Optional[dict] = None
+        self._expires_at = 0.0
+        self._refresh: Optional[asyncio.Future] = None
+
+    async def check(self) -> dict:
+        if self._result is not None and self._expires_at > self._clock():
+            return {**self._result, "cached": True}
+
+        refresh = self._refresh
+
+        # Single flight: one refresh per expiry, shared by every probe that arrives meanwhile
+        if refresh is None or refresh.done() or refresh.get_loop() is not asyncio.get_running_loop():
+            refresh = self._refresh = asyncio.ensure_future(self._refreshed())
+
+        # Shielded, so a probe that disconnects doesn't cancel the refresh the others wait on
+        result = await asyncio.shield(refresh)
+
+        return {**result, "cached": False}
+
+    async def _refreshed(self) -> dict:
+        now = self._clock()
+        result = await self._check()
+        self._result = result
+        self._expires_at = now + self.ttl
+
+        return result
+
+    async def _check(self) -> dict:
+        # Off the event loop: on a cold pod this may still resolve the URL and build the engine
+        engine, pool, metrics = await run_in_threadpool(self._target)
+
+        saturation = pool_saturation(pool)
+        pool_stats = {
+            **{key: value for key, value in metrics.snapshot(pool).items() if key != "checkout_latency_seconds"},
+            "saturation": None if saturation is None else round(saturation, 3),
+        }
+
+        if saturation is not None and saturation >= self.saturation:
+            return {"status": "saturated", "database": None, "pool": pool_stats}
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._probe(engine, self.timeout), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            database_stats = {"ok": False, "error": f"timeout after {self.timeout}s"}
+        except Exception as exc:
+            database_stats = {"ok": False, "error": type(exc).__name__}
+        else:
+            database_stats = {"ok": True}
+
+        database_stats["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        status = "connected" if database_stats["ok"] else "unavailable"
+
+        return {"status": status, "database": database_stats, "pool": pool_stats}
+
+    def _target(self):
+        if is_async_enabled():
+            engine = get_async_engine()
+            return engine, engine.sync_engine.pool, async_pool_metrics
+
+        engine = database.get_engine()
+        return engine, engine.pool, database.pool_metrics
+
+    @staticmethod
+    async def _probe(engine, timeout: float) -> None:
+        limite = {"timeout": str(max(int(timeout * 1000), 1))}
+
+        if is_async_enabled():
+            async with engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    await conn.execute(_STATEMENT_TIMEOUT, limite)
+                await conn.execute(_PROBE)
+            return
+
+        def probe():
+            with engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    conn.execute(_STATEMENT_TIMEOUT, limite)
+                conn.execute(_PROBE)
+
+        # On a timeout the worker thread keeps running until statement_timeout cancels it server side
+        await run_in_threadpool(probe)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name, "").strip()
+
+    return float(value) if value else default
+
+
+database_health = DatabaseHealth(
+    ttl=_env_float("DB_HEALTH_CACHE_SECONDS", 5.0),
+    timeout=_env_float("DB_HEALTH_TIMEOUT_SECONDS", 2.0),
+    saturation=_env_float("DB_HEALTH_MAX_POOL_USAGE", 0.9),
+)
+
+
+def get_database_health() -> DatabaseHealth:
+    return database_health
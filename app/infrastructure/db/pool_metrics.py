@@ -0,0 +1,68 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+from app.infrastructure.metrics.histogram import Histogram
+
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """Checkout latency and timeouts of a connection pool."""
+
+    def __init__(self):
+        self.checkout_latency = Histogram(CHECKOUT_BUCKETS)
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        stats = {"pool_class": type(pool).__name__}
+
+        # QueuePool counters; other pool classes (sqlite) simply lack them
+        for name in ("size", "checkedout", "checkedin", "overflow"):
+            counter = getattr(pool, name, None)
+
+            if callable(counter):
+                stats[name] = counter()
+
+        max_overflow = getattr(pool, "_max_overflow", None)
+        if "size" in stats and isinstance(max_overflow, int):
+            stats["max_overflow"] = max_overflow
+
+        latency = self.checkout_latency.snapshot()
+        stats.update(
+            checkouts=latency["count"],
+            wait_seconds_total=latency["sum"],
+            timeouts=self.timeouts,
+            checkout_latency_seconds=latency["buckets"],
+        )
+
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics
+
+    def connect(self):
+        # Covers queue wait, new connections and the pre-ping round trip
+        start = time.perf_counter()
+
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        finally:
+            self.metrics.checkout_latency.observe(time.perf_counter() - start)
+
+
+def instrumented_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Subclass `base` so every checkout is timed into `metrics`; survives `engine.dispose()`."""
+
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"metrics": metrics})
@@ -0,0 +1,141 @@
+import logging
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "query_stats_start"
+_DAO_MODULE_PREFIX = "app.dao."
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+# Driver paramstyles: psycopg2 (pyformat/format), asyncpg (numeric), sqlite (qmark)
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one request (mutated in place)."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def milliseconds(self) -> float:
+        return round(self.seconds * 1000, 2)
+
+
+# Holds a mutable object, so statements run in the threadpool (copied
+# context) or through AsyncSession.run_sync still land on the request
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request() -> Token:
+    return _current.set(QueryStats())
+
+
+def end_request(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _slow_query_threshold() -> float:
+    value = os.getenv("DB_SLOW_QUERY_MS", "").strip()
+
+    return (float(value) if value else 200.0) / 1000
+
+
+# Read from DB_SLOW_QUERY_MS by `install`, not per statement
+_slow_query_seconds = _slow_query_threshold()
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Collapse a statement to its shape: literals and bound parameters become
+    `?`, IN lists become `(?...)`, whitespace is squashed. Two executions of
+    the same DAO query normalize to the same string whatever the values.
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("?...", sql)
+
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def dao_caller() -> Optional[str]:
+    """Nearest `app.dao` frame on the stack, as `ClassName.method`."""
+    frame = sys._getframe(1)
+
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+
+        if module.startswith(_DAO_MODULE_PREFIX):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+
+            return f"{type(owner).__name__}.{name}" if owner is not None else f"{module}.{name}"
+
+        frame = frame.f_back
+
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info[_START_KEY].pop()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+    # The stack walk only happens for the (rare) slow statement
+    if elapsed >= _slow_query_seconds:
+        caller = dao_caller() or "unknown"
+        sql = normalize_sql(statement)
+
+        logger.warning(
+            "slow query: %.1f ms in %s: %s", elapsed * 1000, caller, sql,
+            extra={"db_time_ms": round(elapsed * 1000, 2), "dao": caller, "sql": sql},
+        )
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_KEY):
+        connection.info[_START_KEY].pop()
+
+
+def install(engine: Engine) -> Engine:
+    """
+    Attribute every statement run on `engine` to the current request. The
+    slow query threshold (DB_SLOW_QUERY_MS) is read here, once per engine,
+    like the pool settings in `database._engine_options`.
+    """
+    global _slow_query_seconds
+    _slow_query_seconds = _slow_query_threshold()
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+    return engine
@@ -0,0 +1,162 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.async_database import is_async_enabled, get_async_sessionmaker
+from app.infrastructure.metrics.http_metrics import http_metrics
+
+_SESSION_KEY = "unit_of_work"
+
+
+class UnitOfWork:
+    """
+    Groups every write of a request into a single transaction.
+
+    While the unit of work is active the DAOs only flush (see
+    `commit_or_flush`); the outermost block commits once on success or
+    rolls back everything on error, so no partial order is left behind.
+
+    With DB_ASYNC enabled the unit of work wraps an AsyncSession and
+    `session` is its synchronous facade: the DAOs stay unchanged and
+    `run` executes them on the event loop through `AsyncSession.run_sync`
+    instead of borrowing a threadpool worker.
+    """
+
+    def __init__(self, session: Session, async_session: Optional[AsyncSession] = None):
+        self.session = session
+        self.async_session = async_session
+        self._depth = 0
+        self._before_commit: list = []
+
+    @property
+    def active(self) -> bool:
+        return self._depth > 0
+
+    def __enter__(self):
+        if self._depth == 0:
+            self.session.info[_SESSION_KEY] = self
+        self._depth += 1
+
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+
+        if self._depth > 0:
+            return False
+
+        self.session.info.pop(_SESSION_KEY, None)
+        callbacks, self._before_commit = self._before_commit, []
+
+        if exc_type is not None:
+            self.session.rollback()
+            return False
+
+        try:
+            for callback in callbacks:
+                callback()
+
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return False
+
+    def before_commit(self, callback: Callable[[], None]) -> None:
+        """Run `callback` as the last work of the transaction, right before COMMIT."""
+        self._before_commit.append(callback)
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Nested transaction: an error inside the block rolls back only that
+        block, along with the before_commit callbacks it registered.
+        """
+        registrados = len(self._before_commit)
+
+        try:
+            with self.session.begin_nested():
+                yield
+        except BaseException:
+            del self._before_commit[registrados:]
+            raise
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run blocking ORM work without stalling the event loop."""
+        if self.async_session is not None:
+            return await self.async_session.run_sync(lambda _session: fn(*args, **kwargs))
+
+        submitted = time.perf_counter()
+
+        def timed():
+            # Time spent waiting for a free worker in the threadpool
+            http_metrics.observe_queue_time(time.perf_counter() - submitted)
+            return fn(*args, **kwargs)
+
+        return await run_in_threadpool(timed)
+
+    async def release(self) -> None:
+        """
+        Give the connection back to the pool between reads of a long-lived
+        request (long polling); the session reconnects on its next query.
+        """
+        if self.async_session is not None:
+            await self.async_session.close()
+            return
+
+        await run_in_threadpool(self.session.close)
+
+
+def commit_or_flush(session: Session, before_commit: Optional[Callable[[], None]] = None) -> bool:
+    """
+    Commit the session, or only flush it when a UnitOfWork owns it.
+    `before_commit` runs right before the COMMIT, here or in the owning
+    UnitOfWork. Returns True when the transaction was actually committed.
+    """
+    info = getattr(session, "info", None)
+
+    if isinstance(info, dict) and isinstance(info.get(_SESSION_KEY), UnitOfWork):
+        if before_commit is not None:
+            info[_SESSION_KEY].before_commit(before_commit)
+
+        session.flush()
+        return False
+
+    if before_commit is not None:
+        before_commit()
+
+    session.commit()
+    return True
+
+
+def rollback_unless_owned(session: Session) -> None:
+    """
+    Roll back after a failed write, unless a UnitOfWork owns the session:
+    then only the error propagates, and the unit of work (or the savepoint
+    around the write) decides what is undone.
+    """
+    info = getattr(session, "info", None)
+
+    if isinstance(info, dict) and isinstance(info.get(_SESSION_KEY), UnitOfWork):
+        return
+
+    session.rollback()
+
+
+async def get_unit_of_work():
+    if is_async_enabled():
+        async with get_async_sessionmaker()() as db:
+            yield UnitOfWork(db.sync_session, async_session=db)
+        return
+
+    db = SessionLocal()
+    try:
+        yield UnitOfWork(db)
+    finally:
+        await run_in_threadpool(db.close)
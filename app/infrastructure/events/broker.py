@@ -0,0 +1,179 @@
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+# Event sent instead of a replay the ring buffer can no longer serve; clients refetch
+RESET_EVENT = "reset"
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict
+
+    def encode(self) -> str:
+        """Server-Sent Events wire format."""
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscriber:
+    """One connected client: a bounded queue owned by the client's event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def push(self, event: Event) -> None:
+        if self.overflowed:
+            return
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client that can't keep up is cut off instead of buffering
+            # without bound; it reconnects with Last-Event-ID and replays
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventBroker:
+    """
+    In-process fan-out of order events to streaming clients.
+
+    `publish` may be called from any thread (controllers run in the
+    threadpool); delivery is scheduled on each subscriber's event loop with
+    one `call_soon_threadsafe` per loop. The last `buffer` events are kept
+    in a ring so reconnecting clients resume from their Last-Event-ID.
+    Event ids are per process: after a restart a client is sent `reset`.
+    """
+
+    def __init__(self, buffer: int = 1000, client_queue: int = 100):
+        self.client_queue = client_queue
+        self._history: deque = deque(maxlen=buffer)
+        self._subscribers: set = set()
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def last_event_id(self) -> int:
+        return self._last_id
+
+    def publish(self, event_type: str, data: dict) -> Event:
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, event_type, data)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+
+        by_loop: dict = {}
+        for subscriber in subscribers:
+            by_loop.setdefault(subscriber.loop, []).append(subscriber)
+
+        for loop, targets in by_loop.items():
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_deliver, targets, event)
+
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> "Subscription":
+        return Subscription(self, last_event_id)
+
+    def _register(self, last_event_id: Optional[int]) -> tuple:
+        subscriber = Subscriber(asyncio.get_running_loop(), self.client_queue)
+
+        # Snapshot the backlog and register atomically: nothing is missed or sent twice
+        with self._lock:
+            self._subscribers.add(subscriber)
+            backlog = self._backlog(last_event_id)
+
+        return subscriber, backlog
+
+    def _unregister(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _backlog(self, last_event_id: Optional[int]) -> list:
+        if last_event_id is None or last_event_id == self._last_id:
+            return []
+
+        oldest = self._history[0].id if self._history else self._last_id + 1
+
+        if last_event_id > self._last_id or last_event_id < oldest - 1:
+            return [Event(self._last_id, RESET_EVENT, {"last_event_id": self._last_id})]
+
+        return [event for event in self._history if event.id > last_event_id]
+
+
+class Subscription:
+    def __init__(self, broker: EventBroker, last_event_id: Optional[int]):
+        self.broker = broker
+        self.last_event_id = last_event_id
+        self.subscriber: Optional[Subscriber] = None
+        self.backlog: list = []
+
+    async def __aenter__(self) -> "Subscription":
+        self.subscriber, self.backlog = self.broker._register(self.last_event_id)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.broker._unregister(self.subscriber)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for any event; pending ones are drained."""
+        queue = self.subscriber.queue
+
+        try:
+            await asyncio.wait_for(queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        while not queue.empty():
+            queue.get_nowait()
+
+        # After an overflow the subscriber is muted: keep it usable for the next wait
+        self.subscriber.overflowed = False
+
+        return True
+
+    async def stream(self, heartbeat: float = 15.0, retry_ms: int = 3000) -> AsyncIterator[str]:
+        """SSE chunks: backlog first, then live events, with comment heartbeats."""
+        yield f"retry: {retry_ms}\n\n"
+
+        for event in self.backlog:
+            yield event.encode()
+
+        while True:
+            try:
+                event = await asyncio.wait_for(self.subscriber.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if event is None:
+                return
+
+            yield event.encode()
+
+
+def _deliver(subscribers: list, event: Event) -> None:
+    for subscriber in subscribers:
+        subscriber.push(event)
+
+
+pedido_events = EventBroker(
+    buffer=int(os.getenv("PEDIDO_EVENTS_BUFFER", "1000")),
+    client_queue=int(os.getenv("PEDIDO_EVENTS_CLIENT_QUEUE", "100")),
+)
@@ -0,0 +1,118 @@
+from typing import Iterable, List, Tuple
+
+from app.infrastructure.db import database
+from app.infrastructure.db.async_database import get_async_engine, async_pool_metrics
+from app.infrastructure.metrics.http_metrics import HttpMetrics, http_metrics
+from app.gateways.status_pedido_gateway import status_cache
+from app.infrastructure.cache.idempotency import idempotency_store
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Iterable[Tuple[str, object]]
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Labels) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+    return f"{{{pairs}}}" if pairs else ""
+
+
+class _Writer:
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def header(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, labels: Labels, value: float) -> None:
+        self.lines.append(f"{name}{_labels(labels)} {value}")
+
+    def histogram(self, name: str, labels: Labels, snapshot: dict) -> None:
+        labels = list(labels)
+
+        for bound, count in snapshot["buckets"].items():
+            self.sample(f"{name}_bucket", labels + [("le", bound)], count)
+
+        self.sample(f"{name}_sum", labels, snapshot["sum"])
+        self.sample(f"{name}_count", labels, snapshot["count"])
+
+
+def _pools() -> list:
+    # Only report engines that already exist; a scrape must not create one
+    pools = []
+
+    if database.get_engine.cache_info().currsize:
+        pools.append(("sync", database.pool_metrics.snapshot(database.get_engine().pool)))
+
+    if get_async_engine.cache_info().currsize:
+        pools.append(("async", async_pool_metrics.snapshot(get_async_engine().sync_engine.pool)))
+
+    return pools
+
+
+def render(metrics: HttpMetrics = http_metrics) -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    snapshot = metrics.snapshot()
+    out = _Writer()
+
+    out.header("http_request_duration_seconds", "histogram", "Request latency by route template.")
+    for (method, route), histogram in sorted(snapshot["durations"].items()):
+        out.histogram("http_request_duration_seconds", [("method", method), ("route", route)], histogram)
+
+    out.header("http_responses_total", "counter", "Responses by route template and status code.")
+    for (method, route, status), count in sorted(snapshot["responses"].items()):
+        out.sample("http_responses_total", [("method", method), ("route", route), ("status", status)], count)
+
+    out.header("http_requests_in_flight", "gauge", "Requests currently being served.")
+    out.sample("http_requests_in_flight", [], snapshot["in_flight"])
+
+    out.header("http_streams_open", "gauge", "SSE streams and waiting long polls currently open (not in the request metrics).")
+    out.sample("http_streams_open", [], snapshot["streams_open"])
+
+    out.header("threadpool_queue_seconds", "histogram", "Wait for a threadpool worker before blocking ORM work starts.")
+    out.histogram("threadpool_queue_seconds", [], snapshot["threadpool_queue"])
+
+    pools = _pools()
+    gauges = (("checkedout", "Connections checked out."), ("checkedin", "Idle connections in the pool."),
+              ("overflow", "Connections opened above pool_size."), ("size", "Configured pool_size."))
+
+    for field, help_text in gauges:
+        out.header(f"db_pool_{field}", "gauge", help_text)
+        for name, stats in pools:
+            if field in stats:
+                out.sample(f"db_pool_{field}", [("pool", name)], stats[field])
+
+    out.header("db_pool_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.")
+    for name, stats in pools:
+        out.sample("db_pool_timeouts_total", [("pool", name)], stats["timeouts"])
+
+    out.header("db_pool_checkout_seconds", "histogram", "Time to check a connection out of the pool.")
+    for name, stats in pools:
+        out.histogram("db_pool_checkout_seconds", [("pool", name)], {
+            "buckets": stats["checkout_latency_seconds"],
+            "sum": stats["wait_seconds_total"],
+            "count": stats["checkouts"],
+        })
+
+    cache = status_cache.stats()
+    for field, kind, help_text in (("hits", "counter", "Cache hits."), ("misses", "counter", "Cache misses."),
+                                   ("evictions", "counter", "Entries evicted by size."), ("size", "gauge", "Cached entries.")):
+        name = f"status_cache_{field}_total" if kind == "counter" else f"status_cache_{field}"
+        out.header(name, kind, f"status_pedido {help_text[0].lower()}{help_text[1:]}")
+        out.sample(name, [], cache[field])
+
+    idempotency = idempotency_store.stats()
+    for field, kind, help_text in (("replays", "counter", "Responses replayed for a repeated Idempotency-Key."),
+                                   ("conflicts", "counter", "Idempotency-Keys reused with a different body."),
+                                   ("keys", "gauge", "Stored Idempotency-Keys."),
+                                   ("in_flight", "gauge", "Requests holding an Idempotency-Key right now.")):
+        name = f"idempotency_{field}_total" if kind == "counter" else f"idempotency_{field}"
+        out.header(name, kind, help_text)
+        out.sample(name, [], idempotency[field])
+
+    return "\n".join(out.lines) + "\n"
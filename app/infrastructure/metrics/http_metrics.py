@@ -0,0 +1,83 @@
+import threading
+from typing import Dict, Tuple
+
+from app.infrastructure.metrics.histogram import Histogram
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUEUE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Anything else is folded into "OTHER" so junk methods can't add series
+KNOWN_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+UNMATCHED_ROUTE = "unmatched"
+
+
+class HttpMetrics:
+    """
+    Request counters and latency histograms keyed by (method, route template).
+
+    Labels only ever come from the declared routes, a fixed method set and
+    the status code, so the number of series stays bounded no matter which
+    URLs clients hit. Recording is a dict lookup plus a short lock.
+
+    Streams (SSE, long polls that actually wait) move from `in_flight` to
+    `streams_open` once marked, and only their response count is recorded:
+    minutes-long connections would otherwise swamp the in-flight gauge and
+    the latency percentiles.
+    """
+
+    def __init__(self):
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.in_flight = 0
+        self.streams_open = 0
+        self.threadpool_queue = Histogram(QUEUE_BUCKETS)
+        self._lock = threading.Lock()
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def stream_started(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.streams_open += 1
+
+    def request_finished(self, method: str, route: str, status: int, duration: float, streaming: bool = False) -> None:
+        method = method if method in KNOWN_METHODS else "OTHER"
+
+        with self._lock:
+            key = (method, route, status)
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+            if streaming:
+                self.streams_open -= 1
+                return
+
+            self.in_flight -= 1
+
+            histogram = self.durations.get((method, route))
+            if histogram is None:
+                histogram = self.durations[(method, route)] = Histogram(REQUEST_BUCKETS)
+
+        histogram.observe(duration)
+
+    def observe_queue_time(self, seconds: float) -> None:
+        self.threadpool_queue.observe(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            durations = dict(self.durations)
+            responses = dict(self.responses)
+            in_flight = self.in_flight
+            streams_open = self.streams_open
+
+        return {
+            "durations": {key: histogram.snapshot() for key, histogram in durations.items()},
+            "responses": responses,
+            "in_flight": in_flight,
+            "streams_open": streams_open,
+            "threadpool_queue": self.threadpool_queue.snapshot(),
+        }
+
+
+http_metrics = HttpMetrics()
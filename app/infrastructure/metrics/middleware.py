@@ -0,0 +1,114 @@
+import logging
+import os
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.infrastructure.db import query_stats
+from app.infrastructure.metrics.http_metrics import HttpMetrics, UNMATCHED_ROUTE, http_metrics
+
+logger = logging.getLogger(__name__)
+
+_STREAMING_KEY = "metrics.mark_streaming"
+
+
+def mark_streaming(scope) -> None:
+    """
+    Tell MetricsMiddleware the current request is a stream (SSE, a long poll
+    about to wait): it leaves the in-flight gauge and the latency histogram.
+    """
+    mark = scope.get(_STREAMING_KEY)
+
+    if mark is not None:
+        mark()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and in-flight requests.
+
+    The route label is the matched route template (`/pedidos/{id}`) that the
+    router leaves in `scope["route"]`, never the raw path. Endpoints that
+    hold the connection open call `mark_streaming`.
+    """
+
+    def __init__(self, app, metrics: HttpMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        streaming = False
+        start = time.perf_counter()
+        self.metrics.request_started()
+
+        def mark():
+            nonlocal streaming
+            if not streaming:
+                streaming = True
+                self.metrics.stream_started()
+
+        scope[_STREAMING_KEY] = mark
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.metrics.request_finished(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - start,
+                streaming=streaming,
+            )
+
+
+class QueryStatsMiddleware:
+    """
+    Reports the SQL statements a request issued through the
+    X-DB-Query-Count and X-DB-Time-Ms response headers, and logs requests
+    above DB_QUERY_COUNT_WARN statements (the usual N+1 signature).
+    """
+
+    def __init__(self, app, warn_count: Optional[int] = None):
+        self.app = app
+        self.warn_count = warn_count if warn_count is not None else int(os.getenv("DB_QUERY_COUNT_WARN", "20"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = query_stats.start_request()
+        stats = query_stats.current_stats()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.milliseconds:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.end_request(token)
+
+            if stats.count > self.warn_count:
+                route = scope.get("route")
+                logger.warning(
+                    "%s %s issued %d SQL statements (%.2f ms)",
+                    scope["method"], getattr(route, "path", scope["path"]), stats.count, stats.milliseconds,
+                    extra={"db_query_count": stats.count, "db_time_ms": stats.milliseconds},
+                )
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey, Time
+from sqlalchemy import BigInteger, Column, Integer, ForeignKey, Time, Index
 from sqlalchemy.orm import relationship
 
 from app.infrastructure.db.database import Base
 
 class Pedido(Base):
     __tablename__ = "pedido"
+    __table_args__ = (
+        Index("ix_pedido_status_data_criacao", "status", "data_criacao"),
+        Index("ix_pedido_versao", "versao"),
+    )
 
     id = Column(Integer, primary_key=True)  
     cliente_id = Column(Integer, nullable=True)
@@ -12,8 +16,10 @@ class Pedido(Base):
     data_criacao = Column(Time, nullable=False)
     data_alteracao = Column(Time, nullable=True)
     data_finalizacao = Column(Time, nullable=True)
+    # Change sequence bumped by every write (see PedidoDAO._proxima_versao)
+    versao = Column(BigInteger, nullable=True)
 
-    status_rel = relationship("StatusPedido", backref="pedido")
+    status_rel = relationship("StatusPedido", backref="pedido", lazy="joined")
 
     def __init__(self, cliente_id: Integer, status: Integer):
         self.cliente_id = cliente_id
@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, Integer
+
+from app.infrastructure.db.database import Base
+
+class PedidoRemovido(Base):
+    __tablename__ = "pedido_removido"
+
+    # Tombstone of a deleted pedido, so /pedidos/changes can report the removal
+    id = Column(Integer, primary_key=True)
+    versao = Column(BigInteger, nullable=False, index=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, Integer
+
+from app.infrastructure.db.database import Base
+
+class PedidoSequencia(Base):
+    __tablename__ = "pedido_sequencia"
+
+    # Single counter row (id = 1) handing out pedido.versao
+    id = Column(Integer, primary_key=True)
+    valor = Column(BigInteger, nullable=False, default=0)
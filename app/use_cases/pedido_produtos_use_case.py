@@ -9,20 +9,17 @@ class PedidoProdutosUseCase:
         self.pedido_produtos_gateway = pedido_produtos_gateway
 
     def criarPedidoProdutos(self, pedido_id: int, produtos: list) -> ProdutoPedidoResponseSchema:
-        if isinstance(produtos, list):
-            produtosCriados = [];
-            
-            for produto in produtos:
-                produtosCriados.append(
-                    (self._criarPedidoProduto(
-                        pedido_id=pedido_id, 
-                        produto_id=produto)))
-
-        return self.buscarPorIdPedido(pedido_id=pedido_id)
+        if not isinstance(produtos, list):
+            return self.buscarPorIdPedido(pedido_id=pedido_id)
+
+        produtosCriados = self.pedido_produtos_gateway.criarPedidoProdutos(pedido_id=pedido_id, 
+                                                                          produtos=produtos)
+
+        return [item.produto_id for item in produtosCriados]
     
-    def _criarPedidoProduto(self, pedido_id: int, produto_id: list): 
-        self.pedido_produtos_gateway.criarPedidoProduto(pedido_id=pedido_id, produto_id=produto_id)
+    def criarPedidoProdutosEmLote(self, produtosPorPedido: dict[int, list]) -> None:
         
+        self.pedido_produtos_gateway.criarPedidoProdutosEmLote(produtosPorPedido=produtosPorPedido)
     
     def buscarPorIdPedido(self, pedido_id: int) -> ProdutoPedidoResponseSchema:
         product_orders = self.pedido_produtos_gateway.buscarPorIdPedido(pedido_id=pedido_id)
@@ -33,9 +30,15 @@ class PedidoProdutosUseCase:
 
         return items
     
+    def buscarPorIdsPedido(self, pedido_ids: list[int]) -> dict[int, list[int]]:
+        product_orders = self.pedido_produtos_gateway.buscarPorIdsPedido(pedido_ids=pedido_ids)
+        items = {pedido_id: [] for pedido_id in pedido_ids}
+
+        for item in product_orders:
+            items.setdefault(item.pedido_id, []).append(item.produto_id)
+
+        return items
+    
     def deletarPorPedido(self, pedido_id: int) -> None:
-        pedidoProdutos: PedidoProdutoModel = self.pedido_produtos_gateway.buscarPorIdPedido(pedido_id=pedido_id)
         
-        if pedidoProdutos:
-            for pedidoProduto in pedidoProdutos:
-                self.pedido_produtos_gateway.deletar(id=pedidoProduto.id)
\ No newline at end of file
+        self.pedido_produtos_gateway.deletarPorPedido(pedido_id=pedido_id)
\ No newline at end of file
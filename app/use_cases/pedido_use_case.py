@@ -1,7 +1,11 @@
+import datetime
+
 from app.entities.pedido.entities import PedidoEntities
-from app.adapters.schemas.pedido import PedidoResponseSchema
+from app.adapters.schemas.pedido import PedidoResponseSchema, PedidoStatusLoteResultadoSchema
 from app.adapters.schemas.status_pedido import StatusPedidoResponseSchema
 from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
+from app.adapters.enums.status_pedido import StatusPedidoEnum, PROXIMO_STATUS, TRANSICOES_PERMITIDAS, prioridade_listagem
+from app.adapters.utils.cursor import encode_cursor, decode_cursor
 
 from app.adapters.utils.debug import var_dump_die
 
@@ -14,15 +18,36 @@ class PedidoUseCase:
         
         return self._prepare_response(pedidoCriado)
     
-    def listar_todos(self) :
-        db_pedidos = self.pedido_entity.listar_todos()
+    def criar_pedidos_em_lote(self, pedidos: list) -> list[PedidoResponseSchema]:
+        
+        return [self._prepare_response(pedido) for pedido in self.pedido_entity.criar_pedidos_em_lote(pedidos)]
+    
+    def listar_todos(self, limite: int | None = None, cursor: str | None = None, 
+                     status: int | None = None, cliente_id: int | None = None) :
+        apos = self._decodificar_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to know whether another page exists
+        db_pedidos = self.pedido_entity.listar_todos(status=status, 
+                                                     cliente_id=cliente_id, 
+                                                     apos=apos, 
+                                                     limite=limite + 1 if limite else None)
+        proximo_cursor = None
+
+        if limite and len(db_pedidos) > limite:
+            db_pedidos = db_pedidos[:limite]
+            proximo_cursor = self._codificar_cursor(db_pedidos[-1])
+
         pedidos = []
 
         for pedido in db_pedidos:
             pedidoResponse = self._prepare_response(pedido)
             pedidos.append(pedidoResponse)
 
-        return pedidos
+        return pedidos, proximo_cursor
+
+    def versao_listagem(self) -> tuple:
+        
+        return self.pedido_entity.versao_listagem()
 
     def buscar_por_id(self, id: int) -> PedidoResponseSchema:
         pedido = self.pedido_entity.buscar_por_id(id=id)
@@ -40,10 +65,106 @@ class PedidoUseCase:
 
         return self._prepare_response(pedidoEntity)
     
+    def atualizar_status_em_lote(self, itens: list) -> list[PedidoStatusLoteResultadoSchema]:
+        """One outcome per input item, in input order; only valid, first-seen ids reach the database."""
+        resultados: list = []
+        validos: dict[int, int] = {}
+        vistos: set[int] = set()
+
+        for item in itens:
+            if item.id in vistos:
+                resultados.append(PedidoStatusLoteResultadoSchema(id=item.id, resultado="invalido", 
+                                                                  mensagem="Pedido repetido no lote"))
+            elif int(item.status) not in TRANSICOES_PERMITIDAS:
+                resultados.append(PedidoStatusLoteResultadoSchema(id=item.id, resultado="invalido", 
+                                                                  mensagem=f"Status inválido: {item.status}"))
+            else:
+                validos[item.id] = int(item.status)
+                resultados.append(None)
+
+            vistos.add(item.id)
+
+        if not validos:
+            return resultados
+
+        atualizados, recusados = self.pedido_entity.atualizar_status_em_lote(validos)
+        porId = {pedido.id: self._prepare_response(pedido) for pedido in atualizados}
+        pendentes = iter(validos)
+
+        for posicao, resultado in enumerate(resultados):
+            if resultado is not None:
+                continue
+
+            id = next(pendentes)
+
+            if id in porId:
+                resultados[posicao] = PedidoStatusLoteResultadoSchema(id=id, resultado="atualizado", pedido=porId[id])
+            elif recusados.get(id) is None:
+                resultados[posicao] = PedidoStatusLoteResultadoSchema(id=id, resultado="nao_encontrado", 
+                                                                      mensagem="Pedido não encontrado")
+            elif recusados[id] == int(StatusPedidoEnum.Finalizado.value):
+                resultados[posicao] = PedidoStatusLoteResultadoSchema(id=id, resultado="conflito", 
+                                                                      mensagem="Pedido já finalizado")
+            else:
+                resultados[posicao] = PedidoStatusLoteResultadoSchema(id=id, resultado="conflito", 
+                                                                      mensagem=f"Transição de status {recusados[id]} para {validos[id]} não permitida")
+
+        return resultados
+
+    def reivindicar_proximo(self, status_origem: int) -> PedidoResponseSchema | None:
+        iniciado = int(StatusPedidoEnum.Iniciado.value)
+
+        # Only a forward move into Iniciado: a claim never pulls a Pronto order back
+        if PROXIMO_STATUS.get(status_origem) != iniciado:
+            raise Exception(f"Pedidos com status {status_origem} não podem ser iniciados")
+
+        pedido = self.pedido_entity.reivindicar_proximo(status_origem=status_origem, status_destino=iniciado)
+
+        return self._prepare_response(pedido) if pedido is not None else None
+
     def deletar_pedido(self, id: int) -> None:
         
         return self.pedido_entity.deletar_pedido(id)
 
+    def listar_alteracoes(self, desde: int | None, limite: int) -> tuple[list, list[int], int, bool]:
+        """
+        Orders written and ids deleted after `desde`, oldest change first, plus
+        the cursor for the next call and whether more changes are pending.
+        Without `desde` nothing is returned, only the current cursor.
+        """
+        if desde is None:
+            return [], [], self.pedido_entity.versao_atual(), False
+
+        pedidos, removidos = self.pedido_entity.listar_alteracoes(desde=desde, limite=limite)
+
+        # Each side comes capped at `limite` + 1: the first `limite` of the merge are the oldest
+        # overall, and anything past them means more changes are pending
+        alteracoes = sorted([(pedido.versao, False, pedido) for pedido in pedidos] +
+                            [(removido.versao, True, removido) for removido in removidos],
+                            key=lambda alteracao: alteracao[0])
+        mais = len(alteracoes) > limite
+        alteracoes = alteracoes[:limite]
+        cursor = alteracoes[-1][0] if alteracoes else desde
+
+        atualizados = [self._prepare_response(pedido) for _, removido, pedido in alteracoes if not removido]
+        idsRemovidos = [pedido.id for _, removido, pedido in alteracoes if removido]
+
+        return atualizados, idsRemovidos, cursor, mais
+
+    def _codificar_cursor(self, pedido) -> str:
+        
+        return encode_cursor(prioridade_listagem(pedido.status), pedido.data_criacao.isoformat(), pedido.id)
+
+    def _decodificar_cursor(self, cursor: str) -> tuple:
+        values = decode_cursor(cursor)
+
+        try:
+            prioridade, data_criacao, id = values
+            
+            return int(prioridade), datetime.time.fromisoformat(data_criacao), int(id)
+        except (TypeError, ValueError) as e:
+            raise ValueError("Cursor inválido") from e
+
     def _prepare_response(self, pedido) :
         statusOrderEntity: StatusPedidoResponseSchema = (StatusPedidoResponseSchema(
             id=pedido.status_rel.id,
@@ -56,7 +177,8 @@ class PedidoUseCase:
             status=statusOrderEntity, 
             data_criacao=pedido.data_criacao, 
             data_alteracao=pedido.data_alteracao, 
-            data_finalizacao=pedido.data_finalizacao
+            data_finalizacao=pedido.data_finalizacao,
+            versao=pedido.versao
         ))
         
         return pedidoResponse
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""
+Closed-loop load test against a running pedidos service.
+
+Each virtual user loops over a weighted mix of operations until --duration
+expires, so throughput is measured at a fixed concurrency:
+
+    create   POST   /pedidos/            new order with 1-5 products
+    kitchen  GET    /pedidos/            kitchen display polling
+    bump     PUT    /pedidos/{id}        Recebido -> Iniciado -> Pronto -> Finalizado
+    delete   DELETE /pedidos/{id}        removes an order created by this run
+
+Results (p50/p95/p99, throughput, errors per operation) are written as JSON
+so runs can be compared with --compare.
+
+Usage:
+    python benchmarks/load/run.py --base-url http://localhost:8080 \\
+        --scenario mixed --concurrency 50 --duration 60 --output results.json
+    python benchmarks/load/run.py ... --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+SCENARIOS = {
+    "create": {"create": 1},
+    "kitchen": {"kitchen": 1},
+    "bump": {"bump": 1},
+    "delete": {"create": 1, "delete": 1},
+    # Rush-hour mix: the kitchen screens poll far more often than anything else
+    "mixed": {"kitchen": 6, "create": 2, "bump": 2, "delete": 0.2},
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, operation: str, status: int, seconds: float) -> None:
+        self.latencies[operation].append(seconds)
+        self.statuses[operation][status] += 1
+        if status >= 400:
+            self.errors[operation] += 1
+
+
+class State:
+    """Order ids known to the run, shared by every virtual user."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.active = []
+        self.created = []
+
+    def take(self, pool: list):
+        if not pool:
+            return None
+        index = self.rng.randrange(len(pool))
+        pool[index], pool[-1] = pool[-1], pool[index]
+        return pool.pop()
+
+
+async def op_create(client: httpx.AsyncClient, state: State):
+    payload = {"cliente_id": state.rng.randrange(1, 50_000), "produtos": [state.rng.randrange(1, 200) for _ in range(state.rng.randint(1, 5))]}
+    response = await client.post("/pedidos/", json=payload)
+
+    if response.status_code == 201:
+        pedido_id = response.json()["data"]["id"]
+        state.active.append((pedido_id, 1))
+        state.created.append(pedido_id)
+
+    return response
+
+
+async def op_kitchen(client: httpx.AsyncClient, state: State):
+    return await client.get("/pedidos/", params={"limit": 100})
+
+
+async def op_bump(client: httpx.AsyncClient, state: State):
+    entry = state.take(state.active)
+    if entry is None:
+        return None
+
+    pedido_id, status = entry
+    response = await client.put(f"/pedidos/{pedido_id}", json={"status": status + 1})
+
+    if response.status_code == 200 and status + 1 < 4:
+        state.active.append((pedido_id, status + 1))
+
+    return response
+
+
+async def op_delete(client: httpx.AsyncClient, state: State):
+    pedido_id = state.take(state.created)
+    if pedido_id is None:
+        return None
+
+    state.active[:] = [entry for entry in state.active if entry[0] != pedido_id]
+    return await client.delete(f"/pedidos/{pedido_id}")
+
+
+OPERATIONS = {"create": op_create, "kitchen": op_kitchen, "bump": op_bump, "delete": op_delete}
+
+
+async def warm_up(client: httpx.AsyncClient, state: State) -> None:
+    # Active orders from the seeded dataset feed the status bumps
+    response = await client.get("/pedidos/", params={"limit": 500})
+    response.raise_for_status()
+
+    for pedido in response.json()["data"]:
+        state.active.append((pedido["id"], int(pedido["status"]["id"])))
+
+
+async def virtual_user(client, state, recorder, weights, deadline):
+    names, values = zip(*weights.items())
+
+    while time.perf_counter() < deadline:
+        operation = state.rng.choices(names, values)[0]
+        start = time.perf_counter()
+
+        try:
+            response = await OPERATIONS[operation](client, state)
+        except httpx.HTTPError:
+            recorder.record(operation, 599, time.perf_counter() - start)
+            continue
+
+        if response is not None:
+            recorder.record(operation, response.status_code, time.perf_counter() - start)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+
+    rank = max(1, round(fraction * len(sorted_values) + 0.5))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    results = {}
+
+    for operation, values in sorted(recorder.latencies.items()):
+        values.sort()
+        results[operation] = {
+            "requests": len(values),
+            "errors": recorder.errors[operation],
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2),
+            "status_codes": {str(code): count for code, count in sorted(recorder.statuses[operation].items())},
+        }
+
+    total = sum(len(values) for values in recorder.latencies.values())
+    results["_total"] = {"requests": total, "throughput_rps": round(total / elapsed, 2)}
+
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"\n{'operation':<10} {'metric':<15} {'baseline':>10} {'current':>10} {'delta':>8}")
+
+    for operation, stats in current["results"].items():
+        base = baseline["results"].get(operation)
+        if base is None:
+            continue
+
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if metric in stats and metric in base and base[metric]:
+                delta = (stats[metric] - base[metric]) / base[metric] * 100
+                print(f"{operation:<10} {metric:<15} {base[metric]:>10} {stats[metric]:>10} {delta:>+7.1f}%")
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    state = State(rng)
+    recorder = Recorder()
+    weights = SCENARIOS[args.scenario]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        await warm_up(client, state)
+
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(virtual_user(client, state, recorder, weights, deadline) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "base_url": args.base_url,
+            "scenario": args.scenario,
+            "weights": weights,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "seed": args.seed,
+        },
+        "results": summarize(recorder, elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="previous results file to diff against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
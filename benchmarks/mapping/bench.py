@@ -0,0 +1,224 @@
+"""
+Micro-benchmarks for the row -> schema -> JSON mapping layer.
+
+Runs each stage over synthetic rows (1k, 10k and 100k by default) without a
+database, measuring wall time (min/median of --repeat runs) and allocations
+(tracemalloc peak of one extra run):
+
+    use_case.prepare_response     PedidoUseCase._prepare_response per row
+    controller.response_schema    PedidoController._create_response_schema per row
+    status.response_schema        StatusPedidoUseCase._create_response_schema per row
+    response.jsonable_encoder     what FastAPI does for routes without response_model
+    response.model_validation     what FastAPI does with response_model (validate + dump)
+    response.pydantic_json        PydanticJSONResponse, what the routes return now
+    pipeline.list                 GET /pedidos/ end to end: PedidoController.listar_todos -> JSON bytes (+ ETag)
+    pipeline.list_produtos        GET /pedidos/?include=produtos end to end
+
+Usage:
+    python benchmarks/mapping/bench.py                          # print results
+    python benchmarks/mapping/bench.py --save-baseline          # refresh baselines.json
+    python benchmarks/mapping/bench.py --compare --threshold 10 # exit 1 on regressions
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import time as time_of_day
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy.orm.attributes import set_committed_value  # noqa: E402
+
+from app.adapters.presenters.pedido_presenter import PedidoResponseList  # noqa: E402
+from app.controllers.pedido_controller import PedidoController  # noqa: E402
+from app.infrastructure.api.responses import PydanticJSONResponse  # noqa: E402
+from app.models.pedido import Pedido  # noqa: E402
+from app.models.pedido_produto import PedidoProdutoModel  # noqa: E402, F401 (mapper registry)
+from app.models.status_pedido import StatusPedido  # noqa: E402
+from app.use_cases.pedido_use_case import PedidoUseCase  # noqa: E402
+from app.use_cases.status_pedido_use_case import StatusPedidoUseCase  # noqa: E402
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def make_rows(count: int) -> list:
+    """Persistent-looking Pedido rows with their status already loaded."""
+    statuses = [StatusPedido(id=i, descricao=d) for i, d in enumerate(("Recebido", "Iniciado", "Pronto", "Finalizado"), 1)]
+    rows = []
+
+    for i in range(count):
+        pedido = Pedido(cliente_id=i % 5_000, status=(i % 4) + 1)
+        pedido.id = i + 1
+        pedido.data_criacao = time_of_day(i % 24, i % 60, i % 60, i % 1_000_000)
+        pedido.data_alteracao = pedido.data_criacao
+        pedido.data_finalizacao = None
+        set_committed_value(pedido, "status_rel", statuses[i % 4])
+        rows.append(pedido)
+
+    return rows
+
+
+def _render(content) -> bytes:
+    return JSONResponse(content).body
+
+
+class _PedidoGateway:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def listar_todos(self, status=None, cliente_id=None, apos=None, limite=None):
+        return self.rows
+
+
+class _PedidoProdutoGateway:
+    def __init__(self, rows):
+        self.items = [SimpleNamespace(pedido_id=row.id, produto_id=produto) for row in rows for produto in (10, 11, 12)]
+
+    def buscarPorIdsPedido(self, pedido_ids):
+        return self.items
+
+
+def stages(rows: list) -> dict:
+    """Stage name -> zero-argument callable; inputs are prepared up front."""
+    use_case = PedidoUseCase(None)
+    controller = PedidoController(None)
+    status_use_case = StatusPedidoUseCase(None)
+    adapter = TypeAdapter(PedidoResponseList)
+
+    schemas = [use_case._prepare_response(row) for row in rows]
+    produtos = {row.id: [10, 11, 12] for row in rows}
+    status_rows = [row.status_rel for row in rows]
+    response = PedidoResponseList(status="sucess", data=schemas)
+
+    # Same calls as the listar_pedidos route, minus the database
+    pedido_gateway = _PedidoGateway(rows)
+    pedido_produto_gateway = _PedidoProdutoGateway(rows)
+
+    def pipeline_list():
+        return PedidoController(pedido_gateway).listar_todos().body
+
+    def pipeline_list_produtos():
+        return PedidoController(pedido_gateway).listar_todos(pedidoProdutosGateway=pedido_produto_gateway).body
+
+    return {
+        "use_case.prepare_response": lambda: [use_case._prepare_response(row) for row in rows],
+        "controller.response_schema": lambda: [controller._create_response_schema(s, produtos[s.id]) for s in schemas],
+        "status.response_schema": lambda: [status_use_case._create_response_schema(row) for row in status_rows],
+        "response.jsonable_encoder": lambda: _render(jsonable_encoder(response)),
+        "response.model_validation": lambda: _render(adapter.dump_python(
+            adapter.validate_python(response.model_dump()), mode="json")),
+        "response.pydantic_json": lambda: PydanticJSONResponse(response).body,
+        "pipeline.list": pipeline_list,
+        "pipeline.list_produtos": pipeline_list_produtos,
+    }
+
+
+def measure(fn, repeat: int) -> dict:
+    fn()  # warm-up (pydantic/fastapi lazy caches)
+    samples = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {
+        "min_ms": round(min(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run(sizes, repeat: int, only=None) -> dict:
+    results = {}
+
+    for size in sizes:
+        rows = make_rows(size)
+
+        for name, fn in stages(rows).items():
+            if only and not any(part in name for part in only):
+                continue
+
+            stats = measure(fn, repeat)
+            stats["us_per_row"] = round(stats["median_ms"] * 1000 / size, 3)
+            results.setdefault(name, {})[str(size)] = stats
+            print(f"{name:<30} {size:>7} rows  median {stats['median_ms']:>10.2f} ms  "
+                  f"{stats['us_per_row']:>7.2f} us/row  peak {stats['peak_kib']:>10.1f} KiB", file=sys.stderr)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    print(f"\n{'stage':<30} {'rows':>7} {'baseline ms':>12} {'current ms':>11} {'time':>8} {'peak':>8}")
+
+    for name, by_size in results.items():
+        for size, stats in by_size.items():
+            base = baseline.get("results", {}).get(name, {}).get(size)
+            if not base:
+                continue
+
+            time_delta = (stats["median_ms"] - base["median_ms"]) / base["median_ms"] * 100
+            peak_delta = (stats["peak_kib"] - base["peak_kib"]) / base["peak_kib"] * 100 if base["peak_kib"] else 0.0
+            print(f"{name:<30} {size:>7} {base['median_ms']:>12.2f} {stats['median_ms']:>11.2f} {time_delta:>+7.1f}% {peak_delta:>+7.1f}%")
+
+            if time_delta > threshold:
+                regressions.append(f"{name}[{size}] {time_delta:+.1f}%")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="run only stages containing any of these substrings")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINES.name}")
+    parser.add_argument("--compare", action="store_true", help=f"compare against {BASELINES.name}")
+    parser.add_argument("--baseline", type=Path, default=BASELINES)
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed median slowdown, in percent")
+    args = parser.parse_args()
+
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "results": run(args.sizes, args.repeat, args.only),
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+
+    if args.compare:
+        regressions = compare(document["results"], json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print("\nregressions above threshold: " + ", ".join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
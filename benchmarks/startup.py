@@ -0,0 +1,131 @@
+"""
+Cold-start benchmark for the pedidos service.
+
+Measures, each in a fresh interpreter:
+- import: time to `import app.main`
+- first_response: time from spawning uvicorn until GET /health/ answers
+- first_db_request: latency of the first request that needs the engine
+  (GET /health/pool), i.e. the deferred Secrets Manager lookup + engine build
+
+DB_SECRET_NAME is set and DATABASE_URL removed so the production path is
+exercised; benchmarks/stubs provides a fake boto3 (see STUB_SECRETS_LATENCY_MS).
+Pass --real-boto3 to import the installed boto3 instead (import timing only,
+since no AWS credentials are expected here).
+
+Usage: python benchmarks/startup.py [--runs 5] [--port 8089] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+
+_IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def _environment(real_boto3: bool) -> dict:
+    env = dict(os.environ)
+    env.pop("DATABASE_URL", None)
+    env.setdefault("DB_SECRET_NAME", "lanchonete/pedidos/benchmark")
+
+    paths = [str(ROOT)] if real_boto3 else [str(STUBS), str(ROOT)]
+    env["PYTHONPATH"] = os.pathsep.join(paths + [env.get("PYTHONPATH", "")]).rstrip(os.pathsep)
+
+    return env
+
+
+def measure_import(env: dict) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    )
+
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _get(url: str, timeout: float = 5.0) -> int:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def _wait_until_listening(port: int, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        with socket.socket() as sock:
+            sock.settimeout(0.05)
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.005)
+
+    raise TimeoutError(f"uvicorn did not bind port {port}")
+
+
+def measure_first_requests(env: dict, port: int, timeout: float = 30.0) -> dict:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        _wait_until_listening(port, start + timeout)
+        bound = time.perf_counter() - start
+
+        _get(f"http://127.0.0.1:{port}/health/")
+        first_response = time.perf_counter() - start
+
+        t = time.perf_counter()
+        _get(f"http://127.0.0.1:{port}/health/pool")
+        first_db_request = time.perf_counter() - t
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    return {"bind": bound, "first_response": first_response, "first_db_request": first_db_request}
+
+
+def _summary(samples: list) -> dict:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--real-boto3", action="store_true")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    env = _environment(args.real_boto3)
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    results = {"runs": args.runs, "import": _summary(imports)}
+
+    if not args.real_boto3:
+        requests = [measure_first_requests(env, args.port) for _ in range(args.runs)]
+        for key in ("bind", "first_response", "first_db_request"):
+            results[key] = _summary([r[key] for r in requests])
+
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
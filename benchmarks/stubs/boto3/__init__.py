@@ -0,0 +1,33 @@
+"""
+Minimal stand-in for boto3 used by the startup benchmark.
+
+Only `client("secretsmanager")` is implemented. The secret returned is
+read from STUB_DB_SECRET (JSON) and every call sleeps for
+STUB_SECRETS_LATENCY_MS to mimic the network round trip to AWS.
+"""
+import json
+import os
+import time
+
+_DEFAULT_SECRET = {
+    "host": "localhost",
+    "dbname": "pedidos",
+    "username": "postgres",
+    "password": "postgres",
+    "port": 5432,
+}
+
+
+class _SecretsManagerStub:
+    def get_secret_value(self, SecretId: str) -> dict:
+        time.sleep(int(os.getenv("STUB_SECRETS_LATENCY_MS", "150")) / 1000)
+        secret = os.getenv("STUB_DB_SECRET") or json.dumps(_DEFAULT_SECRET)
+
+        return {"Name": SecretId, "SecretString": secret}
+
+
+def client(service_name: str, region_name: str = None, **kwargs):
+    if service_name != "secretsmanager":
+        raise NotImplementedError(f"boto3 stub does not implement '{service_name}'")
+
+    return _SecretsManagerStub()
@@ -0,0 +1,38 @@
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.infrastructure.db.database import Base, _get_database_url
+from app.models import pedido, pedido_produto, pedido_removido, pedido_sequencia, status_pedido  # noqa: F401
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def _url() -> str:
+    # An explicit sqlalchemy.url (alembic -x / tests) wins over the app's own resolution
+    return config.get_main_option("sqlalchemy.url") or _get_database_url()
+
+
+def run_migrations_offline() -> None:
+    context.configure(url=_url(), target_metadata=target_metadata, literal_binds=True)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    engine = create_engine(_url(), poolclass=pool.NullPool)
+
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,55 @@
+"""pedido change versions for /pedidos/changes
+
+Adds pedido.versao, the pedido_sequencia counter (with its required id = 1
+row) and the pedido_removido tombstones. Databases that already ran the
+README DDL by hand are left as they are.
+
+Revision ID: 0001_pedido_versao
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_pedido_versao"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tabelas = set(inspector.get_table_names())
+
+    if "versao" not in {coluna["name"] for coluna in inspector.get_columns("pedido")}:
+        op.add_column("pedido", sa.Column("versao", sa.BigInteger(), nullable=True))
+
+    if "ix_pedido_versao" not in {indice["name"] for indice in inspector.get_indexes("pedido")}:
+        op.create_index("ix_pedido_versao", "pedido", ["versao"])
+
+    if "pedido_sequencia" not in tabelas:
+        op.create_table("pedido_sequencia",
+                        sa.Column("id", sa.Integer(), primary_key=True),
+                        sa.Column("valor", sa.BigInteger(), nullable=False))
+
+    if "pedido_removido" not in tabelas:
+        op.create_table("pedido_removido",
+                        sa.Column("id", sa.Integer(), primary_key=True),
+                        sa.Column("versao", sa.BigInteger(), nullable=False))
+        op.create_index("ix_pedido_removido_versao", "pedido_removido", ["versao"])
+
+    # Writes refuse to run without the counter row; start it past any version already handed out
+    op.execute("""
+        INSERT INTO pedido_sequencia (id, valor)
+        SELECT 1, COALESCE(MAX(versao), 0)
+        FROM (SELECT versao FROM pedido UNION ALL SELECT versao FROM pedido_removido) AS versoes
+        WHERE NOT EXISTS (SELECT 1 FROM pedido_sequencia WHERE id = 1)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pedido_removido_versao", table_name="pedido_removido")
+    op.drop_table("pedido_removido")
+    op.drop_table("pedido_sequencia")
+    op.drop_index("ix_pedido_versao", table_name="pedido")
+    op.drop_column("pedido", "versao")
@@ -0,0 +1,41 @@
+import sys, os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from app.infrastructure.db.database import Base
+from app.models.pedido import Pedido
+from app.models.pedido_produto import PedidoProdutoModel
+from app.models.pedido_removido import PedidoRemovido
+from app.models.pedido_sequencia import PedidoSequencia
+from app.models.status_pedido import StatusPedido
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session(sqlite_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    session.add_all([
+        StatusPedido(id=1, descricao="Recebido"),
+        StatusPedido(id=2, descricao="Iniciado"),
+        StatusPedido(id=3, descricao="Pronto"),
+        StatusPedido(id=4, descricao="Finalizado"),
+        PedidoSequencia(id=1, valor=0),
+    ])
+    session.commit()
+
+    yield session
+
+    session.close()
@@ -18,6 +18,7 @@ class FakePedido:
         self.data_criacao = datetime.time(12, 0, 0)
         self.data_alteracao = None
         self.data_finalizacao = None
+        self.versao = 1
 
 
 class FakeStatus:
@@ -6,7 +6,13 @@ Feature: Health endpoints
     And o corpo JSON deve conter {"status": "ok"}
 
   Scenario: Health db check returns connected when dependency overridden
-    Given eu sobrescrevo dependência get_db
+    Given eu sobrescrevo dependência get_database_health
     When eu executo GET em "/health/db"
     Then o status da resposta deve ser 200
     And o corpo JSON deve conter {"status": "connected"}
+
+  Scenario: Health db check returns 503 when the database is unavailable
+    Given eu sobrescrevo dependência get_database_health com banco indisponível
+    When eu executo GET em "/health/db"
+    Then o status da resposta deve ser 503
+    And o corpo JSON deve conter {"status": "unavailable"}
@@ -0,0 +1,63 @@
+import datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.infrastructure.api.fastapi import app
+from app.infrastructure.db import unit_of_work
+from app.infrastructure.db.database import Base
+from app.api import pedido as pedido_api
+from app.api import status_pedido as status_api
+from app.models.pedido_sequencia import PedidoSequencia
+from app.models.status_pedido import StatusPedido
+
+app.include_router(pedido_api.router)
+app.include_router(status_api.router)
+client = TestClient(app)
+
+
+@pytest.fixture
+def async_db(tmp_path, monkeypatch):
+    path = tmp_path / "pedidos.db"
+
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    with sessionmaker(bind=sync_engine)() as session:
+        session.add_all([StatusPedido(id=1, descricao="Recebido"), StatusPedido(id=3, descricao="Pronto"),
+                         PedidoSequencia(id=1, valor=0)])
+        session.commit()
+    sync_engine.dispose()
+
+    # NullPool: each TestClient request runs on its own event loop
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    monkeypatch.setenv("DB_ASYNC", "true")
+    monkeypatch.setattr(unit_of_work, "get_async_sessionmaker",
+                        lambda: async_sessionmaker(autocommit=False, autoflush=False, bind=engine))
+
+    yield engine
+
+
+def test_fluxo_de_pedido_no_modo_assincrono(async_db):
+    criado = client.post("/pedidos/", json={"cliente_id": 7, "produtos": [1, 2, 3]})
+
+    assert criado.status_code == 201
+    pedido_id = criado.json()["data"]["id"]
+    assert sorted(criado.json()["data"]["produtos"]) == [1, 2, 3]
+
+    listado = client.get("/pedidos/?include=produtos")
+    assert listado.status_code == 200
+    assert [pedido["id"] for pedido in listado.json()["data"]] == [pedido_id]
+    assert sorted(listado.json()["data"][0]["produtos"]) == [1, 2, 3]
+
+    assert client.delete(f"/pedidos/{pedido_id}").status_code == 204
+    assert client.get("/pedidos/").json()["data"] == []
+
+
+def test_status_no_modo_assincrono(async_db):
+    res = client.get("/status_pedido/1")
+
+    assert res.status_code == 200
+    assert res.json()["data"]["descricao"] == "Recebido"
@@ -1,5 +1,4 @@
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
 
 from app.infrastructure.api.fastapi import app
 from app.api import check as check_api
@@ -16,13 +15,48 @@ def test_health_check():
     assert res.json() == {"status": "ok"}
 
 
-def test_health_db_check_overrides_get_db():
-    from app.infrastructure.db import database
+class _FakeHealth:
+    def __init__(self, result):
+        self.result = result
 
-    app.dependency_overrides[database.get_db] = lambda: (MagicMock(),)
+    async def check(self):
+        return self.result
+
+
+def test_health_db_check_conectado():
+    from app.infrastructure.db.health import get_database_health
+
+    app.dependency_overrides[get_database_health] = lambda: _FakeHealth({"status": "connected", "cached": False})
 
     res = client.get("/health/db")
     assert res.status_code == 200
-    assert res.json() == {"status": "connected"}
+    assert res.json()["status"] == "connected"
+
+    app.dependency_overrides.pop(get_database_health, None)
+
+
+def test_health_db_check_indisponivel_retorna_503():
+    from app.infrastructure.db.health import get_database_health
+
+    for status in ("unavailable", "saturated"):
+        app.dependency_overrides[get_database_health] = lambda: _FakeHealth({"status": status, "cached": False})
+
+        res = client.get("/health/db")
+        assert res.status_code == 503
+        assert res.json()["status"] == status
+
+    app.dependency_overrides.pop(get_database_health, None)
+
+
+def test_health_cache_expoe_contadores():
+    res = client.get("/health/cache")
+
+    assert res.status_code == 200
+    assert {"hits", "misses", "size", "maxsize"} <= set(res.json()["status_pedido"])
+
 
-    app.dependency_overrides.pop(database.get_db, None)
+def test_health_pool_expoe_estatisticas():
+    res = client.get("/health/pool")
+
+    assert res.status_code == 200
+    assert {"checkouts", "wait_seconds_total", "checkout_latency_seconds", "pool_class"} <= set(res.json()["sync"])
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.infrastructure.api.fastapi import app
+from app.api import check as check_api
+from app.api import metrics as metrics_api
+
+app.include_router(check_api.router)
+app.include_router(metrics_api.router)
+
+client = TestClient(app)
+
+
+def test_metrics_expoe_rotas_por_template():
+    client.get("/health/")
+    client.get("/rota-inexistente/1")
+    client.get("/rota-inexistente/2")
+
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_responses_total{method="GET",route="/health/",status="200"}' in res.text
+    assert 'route="/rota-inexistente/1"' not in res.text
+    assert 'http_responses_total{method="GET",route="unmatched",status="404"}' in res.text
+    assert "threadpool_queue_seconds_count" in res.text
@@ -25,7 +25,7 @@ def test_criar_pedido_success(fake_pedido):
     mock_pedido_gateway.criar_pedido.return_value = fake_pedido
 
     mock_pedido_prod_gateway = MagicMock()
-    mock_pedido_prod_gateway.buscarPorIdPedido.return_value = [MagicMock(produto_id=1), MagicMock(produto_id=2)]
+    mock_pedido_prod_gateway.criarPedidoProdutos.return_value = [MagicMock(produto_id=1), MagicMock(produto_id=2)]
 
     app.dependency_overrides[pedido_api.get_pedido_gateway] = lambda: mock_pedido_gateway
     app.dependency_overrides[pedido_api.get_pedido_produto_gateway] = lambda: mock_pedido_prod_gateway
@@ -64,3 +64,455 @@ def test_buscar_pedido_not_found():
     res = client.get("/pedidos/999")
 
     assert res.status_code == 400
+
+
+@pytest.fixture
+def statements(sqlite_session):
+    from sqlalchemy import event
+    from app.infrastructure.db.unit_of_work import UnitOfWork, get_unit_of_work
+
+    app.dependency_overrides[get_unit_of_work] = lambda: UnitOfWork(sqlite_session)
+
+    executed = []
+    event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                 lambda *args: executed.append(args[2]))
+
+    return executed
+
+
+def _seed_pedidos(session, quantidade):
+    import datetime
+    from app.models.pedido import Pedido
+    from app.models.pedido_produto import PedidoProdutoModel
+    for indice in range(quantidade):
+        pedido = Pedido(cliente_id=indice, status=(indice % 3) + 1)
+        pedido.data_criacao = datetime.time(indice % 24, indice % 60)
+        session.add(pedido)
+    session.flush()
+    session.add_all([PedidoProdutoModel(pedido_id=1, produto_id=10), PedidoProdutoModel(pedido_id=1, produto_id=11)])
+    session.commit()
+    session.expire_all()
+
+
+def test_listar_pedidos_sem_n_mais_1(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 500)
+    statements.clear()
+
+    res = client.get("/pedidos/?limit=500")
+
+    assert res.status_code == 200
+    assert len(res.json()["data"]) == 500
+    # The list-level ETag validator, then the page
+    assert len(statements) == 2
+
+
+def test_buscar_pedido_sem_consulta_extra_de_status(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 3)
+    statements.clear()
+
+    res = client.get("/pedidos/1")
+
+    assert res.status_code == 200
+    assert res.json()["data"]["status"]["descricao"] == "Recebido"
+    assert res.json()["data"]["produtos"] == [10, 11]
+    assert len(statements) == 2
+
+
+def test_listar_pedidos_paginado_percorre_todas_as_paginas(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 25)
+    esperado = [pedido["id"] for pedido in client.get("/pedidos/?limit=500").json()["data"]]
+
+    vistos = []
+    cursor = None
+    while True:
+        url = "/pedidos/?limit=7" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).json()
+        vistos.extend(pedido["id"] for pedido in body["data"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert vistos == esperado
+    assert len(vistos) == 25
+
+
+def test_listar_pedidos_filtra_por_status_e_cliente(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 30)
+
+    por_status = client.get("/pedidos/?status=2").json()["data"]
+    por_cliente = client.get("/pedidos/?cliente_id=4").json()["data"]
+
+    assert len(por_status) == 10
+    assert {pedido["status"]["id"] for pedido in por_status} == {2}
+    assert [pedido["cliente_id"] for pedido in por_cliente] == [4]
+
+
+def test_listar_pedidos_cursor_invalido(sqlite_session, statements):
+    res = client.get("/pedidos/?cursor=nao-e-um-cursor")
+
+    assert res.status_code == 400
+
+
+def test_listar_pedidos_com_produtos_em_uma_consulta(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 50)
+    statements.clear()
+
+    res = client.get("/pedidos/?limit=50&include=produtos")
+
+    assert res.status_code == 200
+    produtos = {pedido["id"]: pedido["produtos"] for pedido in res.json()["data"]}
+    assert produtos[1] == [10, 11]
+    assert produtos[2] == []
+    assert len(statements) == 3
+
+
+def test_listar_pedidos_sem_include_nao_traz_produtos(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 5)
+
+    res = client.get("/pedidos/")
+
+    assert all("produtos" not in pedido for pedido in res.json()["data"])
+
+
+def test_deletar_pedido_em_lote_numa_transacao(sqlite_session, statements):
+    from app.models.pedido import Pedido
+    from app.models.pedido_produto import PedidoProdutoModel
+
+    _seed_pedidos(sqlite_session, 3)
+    statements.clear()
+
+    res = client.delete("/pedidos/1")
+
+    assert res.status_code == 204
+    # Items, order, then change counter and tombstone right before COMMIT, all in one transaction
+    assert [sql.split()[0] for sql in statements] == ["DELETE", "DELETE", "UPDATE", "INSERT"]
+    assert sqlite_session.get(Pedido, 1) is None
+    assert sqlite_session.query(PedidoProdutoModel).count() == 0
+
+
+def test_deletar_pedido_inexistente_nao_remove_nada(sqlite_session, statements):
+    from app.models.pedido_produto import PedidoProdutoModel
+
+    _seed_pedidos(sqlite_session, 1)
+
+    res = client.delete("/pedidos/999")
+
+    assert res.status_code in (400, 404)
+    assert sqlite_session.query(PedidoProdutoModel).count() == 2
+
+
+def test_headers_com_contagem_e_tempo_de_sql(sqlite_session, statements):
+    from app.infrastructure.db import query_stats
+
+    query_stats.install(sqlite_session.get_bind())
+    _seed_pedidos(sqlite_session, 3)
+
+    detalhe = client.get("/pedidos/1")
+    lista = client.get("/pedidos/?include=produtos")
+
+    assert detalhe.headers["X-DB-Query-Count"] == "2"
+    assert float(detalhe.headers["X-DB-Time-Ms"]) >= 0
+    assert lista.headers["X-DB-Query-Count"] == "3"
+
+
+def test_listar_pedidos_sem_revalidar_resposta(sqlite_session, statements, monkeypatch):
+    import fastapi.routing
+
+    def serialize_response(**kwargs):
+        raise AssertionError("response_model re-validation should be skipped")
+
+    monkeypatch.setattr(fastapi.routing, "serialize_response", serialize_response)
+    _seed_pedidos(sqlite_session, 3)
+
+    res = client.get("/pedidos/?include=produtos")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/json"
+    assert [pedido["id"] for pedido in res.json()["data"]] == [3, 2, 1]
+    assert res.json()["data"][2]["produtos"] == [10, 11]
+
+
+def test_buscar_pedido_304_sem_consultar_produtos(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 1)
+
+    first = client.get("/pedidos/1")
+    etag = first.headers["ETag"]
+    statements.clear()
+
+    revalidated = client.get("/pedidos/1", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert len(statements) == 1
+
+    client.put("/pedidos/1", json={"status": 2})
+    changed = client.get("/pedidos/1", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_etag_muda_quando_status_e_renomeado(sqlite_session, statements):
+    from app.models.status_pedido import StatusPedido
+    _seed_pedidos(sqlite_session, 1)
+
+    etag = client.get("/pedidos/1").headers["ETag"]
+    lista_etag = client.get("/pedidos/").headers["ETag"]
+    assert "versao" not in client.get("/pedidos/1").json()["data"]
+
+    sqlite_session.get(StatusPedido, 1).descricao = "Em espera"
+    sqlite_session.commit()
+    sqlite_session.expire_all()
+
+    changed = client.get("/pedidos/1", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.json()["data"]["status"]["descricao"] == "Em espera"
+    assert client.get("/pedidos/", headers={"If-None-Match": lista_etag}).status_code == 200
+
+
+def test_listar_pedidos_304_pula_produtos_e_serializacao(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 3)
+
+    etag = client.get("/pedidos/?include=produtos").headers["ETag"]
+    statements.clear()
+
+    revalidated = client.get("/pedidos/?include=produtos", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    # Only the counter/status validator: the page query itself is skipped
+    assert len(statements) == 1
+    assert "pedido_sequencia" in statements[0] and "FROM pedido " not in statements[0]
+
+    # Same rows, another shape or page: never answered with the other body's ETag
+    for outra in ("/pedidos/", "/pedidos/?include=produtos&limit=2", "/pedidos/?include=produtos&status=1"):
+        assert client.get(outra, headers={"If-None-Match": etag}).status_code == 200
+
+    client.put("/pedidos/2", json={"status": 3})
+    assert client.get("/pedidos/?include=produtos", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_alteracoes_publicam_eventos_para_o_stream(sqlite_session, statements):
+    from app.infrastructure.events.broker import pedido_events
+
+    _seed_pedidos(sqlite_session, 2)
+    inicio = pedido_events.last_event_id
+
+    client.put("/pedidos/1", json={"status": 2})
+    client.delete("/pedidos/2")
+
+    eventos = list(pedido_events._history)[-(pedido_events.last_event_id - inicio):]
+
+    assert [(evento.type, evento.data["id"]) for evento in eventos] == [("pedido_atualizado", 1), ("pedido_removido", 2)]
+    assert eventos[0].data["status"]["id"] == 2
+
+
+def test_changes_retorna_so_o_que_mudou_desde_o_cursor(sqlite_session, statements, monkeypatch):
+    monkeypatch.setattr(pedido_api.PedidoProdutoGateway, "criarPedidoProdutos", lambda self, pedido_id, produtos: [])
+    _seed_pedidos(sqlite_session, 0)
+
+    inicio = client.get("/pedidos/changes").json()
+    criados = [client.post("/pedidos/", json={"cliente_id": i, "produtos": [1]}).json()["data"]["id"] for i in range(3)]
+    client.put(f"/pedidos/{criados[0]}", json={"status": 2})
+    client.delete(f"/pedidos/{criados[1]}")
+
+    res = client.get("/pedidos/changes", params={"since": inicio["cursor"], "timeout": 0})
+    body = res.json()
+
+    assert res.status_code == 200
+    assert [(pedido["id"], pedido["status"]["id"]) for pedido in body["data"]] == [(criados[2], 1), (criados[0], 2)]
+    assert body["removidos"] == [criados[1]]
+    assert body["mais"] is False
+
+    pagina = client.get("/pedidos/changes", params={"since": inicio["cursor"], "limit": 1, "timeout": 0}).json()
+    assert ([pedido["id"] for pedido in pagina["data"]], pagina["mais"]) == ([criados[2]], True)
+
+    vazio = client.get("/pedidos/changes", params={"since": body["cursor"], "timeout": 0.05}).json()
+    assert (vazio["data"], vazio["removidos"], vazio["cursor"]) == ([], [], body["cursor"])
+
+
+def test_long_poll_que_espera_fica_fora_da_latencia_e_do_in_flight(sqlite_session, statements):
+    from app.infrastructure.metrics.http_metrics import http_metrics
+
+    def latencias():
+        histograma = http_metrics.snapshot()["durations"].get(("GET", "/pedidos/changes"))
+        return histograma["count"] if histograma else 0
+
+    cursor = client.get("/pedidos/changes").json()["cursor"]
+    antes = latencias()
+
+    client.get("/pedidos/changes", params={"since": cursor, "timeout": 0})
+    client.get("/pedidos/changes", params={"since": cursor, "timeout": 0.05})
+
+    # Only the answer that didn't wait is a regular request
+    assert latencias() == antes + 1
+    assert http_metrics.snapshot()["responses"][("GET", "/pedidos/changes", 200)] >= 3
+    assert (http_metrics.snapshot()["in_flight"], http_metrics.snapshot()["streams_open"]) == (0, 0)
+
+
+def test_changes_sinaliza_mais_sem_tombstones(sqlite_session, statements, monkeypatch):
+    monkeypatch.setattr(pedido_api.PedidoProdutoGateway, "criarPedidoProdutos", lambda self, pedido_id, produtos: [])
+    _seed_pedidos(sqlite_session, 0)
+
+    inicio = client.get("/pedidos/changes").json()
+    criados = [client.post("/pedidos/", json={"cliente_id": i, "produtos": [1]}).json()["data"]["id"] for i in range(3)]
+
+    pagina = client.get("/pedidos/changes", params={"since": inicio["cursor"], "limit": 2, "timeout": 0}).json()
+    assert ([pedido["id"] for pedido in pagina["data"]], pagina["mais"]) == (criados[:2], True)
+
+    resto = client.get("/pedidos/changes", params={"since": pagina["cursor"], "limit": 2, "timeout": 0}).json()
+    assert ([pedido["id"] for pedido in resto["data"]], resto["mais"]) == (criados[2:], False)
+
+
+def test_idempotency_key_nao_duplica_pedido(sqlite_session, statements, monkeypatch):
+    import uuid
+    from app.models.pedido import Pedido
+
+    monkeypatch.setattr(pedido_api.PedidoProdutoGateway, "criarPedidoProdutos", lambda self, pedido_id, produtos: [])
+    _seed_pedidos(sqlite_session, 0)
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    primeiro = client.post("/pedidos/", json={"cliente_id": 7, "produtos": [1]}, headers=headers)
+    statements.clear()
+    repeticao = client.post("/pedidos/", json={"cliente_id": 7, "produtos": [1]}, headers=headers)
+    conflito = client.post("/pedidos/", json={"cliente_id": 8, "produtos": [1]}, headers=headers)
+
+    assert (primeiro.status_code, repeticao.status_code) == (201, 201)
+    assert repeticao.content == primeiro.content
+    assert repeticao.headers["Idempotent-Replayed"] == "true"
+    assert statements == []
+    assert conflito.status_code == 422
+    assert sqlite_session.query(Pedido).count() == 1
+
+
+def test_atualizar_pedido_finalizado_retorna_409(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 1)
+
+    assert [client.put("/pedidos/1", json={"status": novo}).status_code for novo in (2, 3, 4)] == [200, 200, 200]
+
+    res = client.put("/pedidos/1", json={"status": 2})
+
+    assert res.status_code == 409
+    assert res.json()["detail"] == "Pedido já finalizado"
+    assert client.put("/pedidos/999", json={"status": 2}).status_code == 404
+
+
+def test_atualizar_pedido_fora_da_ordem_retorna_409(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 3)
+
+    # Pedido 2 is Iniciado: repeating it, going back or skipping Pronto are all refused
+    for novo in (2, 1, 4):
+        res = client.put("/pedidos/2", json={"status": novo})
+
+        assert res.status_code == 409
+        assert res.json()["detail"] == f"Transição de status 2 para {novo} não permitida"
+
+    assert client.put("/pedidos/3", json={"status": 1}).status_code == 409
+    assert client.put("/pedidos/2", json={"status": 3}).status_code == 200
+
+
+def test_atualizar_status_em_lote(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 4)
+    statements.clear()
+
+    # Pedido 4 is Recebido, so going straight to Pronto is a conflict
+    res = client.patch("/pedidos/status", json={"itens": [
+        {"id": 1, "status": 2}, {"id": 2, "status": 3}, {"id": 3, "status": 4},
+        {"id": 4, "status": 3}, {"id": 999, "status": 3},
+    ]})
+    body = res.json()
+
+    assert res.status_code == 200
+    assert [(item["id"], item["resultado"]) for item in body["data"]] == [
+        (1, "atualizado"), (2, "atualizado"), (3, "atualizado"), (4, "conflito"), (999, "nao_encontrado")]
+    assert body["data"][2]["pedido"]["data_finalizacao"] is not None
+    assert "produtos" not in body["data"][0]["pedido"]
+    # One UPDATE per target status (2, 3 and 4), one lookup of the refused ids,
+    # then the version counter and one stamp of the updated orders
+    assert [sql.split()[0] for sql in statements] == ["UPDATE", "UPDATE", "UPDATE", "SELECT", "UPDATE", "UPDATE"]
+
+    com_produtos = client.patch("/pedidos/status?include=produtos", json={"itens": [{"id": 1, "status": 3}]}).json()
+    assert com_produtos["data"][0]["pedido"]["produtos"] == [10, 11]
+
+    versoes = [pedido["id"] for pedido in client.get("/pedidos/changes", params={"since": 1, "timeout": 0}).json()["data"]]
+    assert sorted(versoes) == [1, 2, 3]
+
+
+def test_criar_pedidos_em_lote_em_instrucoes_unicas(sqlite_session, statements):
+    from app.models.pedido_produto import PedidoProdutoModel
+
+    _seed_pedidos(sqlite_session, 0)
+    statements.clear()
+
+    res = client.post("/pedidos/batch", json=[{"cliente_id": i, "produtos": [i, i + 100]} for i in range(1, 6)])
+    body = res.json()
+
+    assert res.status_code == 200
+    assert [item["id"] for item in body["data"]] == [1, 2, 3, 4, 5]
+    assert all(item["erro"] is None for item in body["data"])
+    # SQLite runs the ordered INSERT ... RETURNING one row per batch; PostgreSQL sends it as one statement
+    assert {sql.split("(")[0].strip() for sql in statements if sql.startswith("INSERT")} == {
+        "INSERT INTO pedido", "INSERT INTO pedido_produtos"}
+    assert sum(sql.startswith("INSERT INTO pedido_produtos") for sql in statements) == 1
+    assert not any(sql.startswith("ROLLBACK") for sql in statements)
+    assert sqlite_session.query(PedidoProdutoModel).filter_by(pedido_id=5).count() == 2
+
+
+def test_criar_pedidos_em_lote_isola_pedidos_com_erro(sqlite_session, statements):
+    from app.models.pedido import Pedido
+    from app.models.pedido_produto import PedidoProdutoModel
+
+    res = client.post("/pedidos/batch", json=[
+        {"cliente_id": 1, "produtos": [1]},
+        {"cliente_id": 2},
+        {"cliente_id": 3, "produtos": [None]},
+        {"cliente_id": 4, "produtos": [4, 5]},
+    ])
+    data = res.json()["data"]
+
+    assert res.status_code == 200
+    assert [item["indice"] for item in data] == [0, 1, 2, 3]
+    assert data[0]["id"] is not None and data[3]["id"] is not None
+    assert data[1]["id"] is None and "produtos" in data[1]["erro"]
+    assert data[2]["id"] is None and "Erro de integridade" in data[2]["erro"]
+    assert sorted(pedido.cliente_id for pedido in sqlite_session.query(Pedido)) == [1, 4]
+    itens = sqlite_session.query(PedidoProdutoModel).filter(PedidoProdutoModel.pedido_id.in_([data[0]["id"], data[3]["id"]]))
+    assert sorted(item.produto_id for item in itens) == [1, 4, 5]
+
+
+def test_lote_com_erro_carimba_so_os_pedidos_criados_na_nova_tentativa(sqlite_session, statements):
+    from app.models.pedido import Pedido
+    from app.models.pedido_sequencia import PedidoSequencia
+
+    res = client.post("/pedidos/batch", json=[
+        {"cliente_id": 1, "produtos": [1]},
+        {"cliente_id": 2, "produtos": [None]},
+        {"cliente_id": 3, "produtos": [3]},
+    ])
+
+    assert res.status_code == 200
+    sqlite_session.expire_all()
+    # The failed bulk attempt registered a stamp for three ids; only the two retried orders count
+    assert sqlite_session.get(PedidoSequencia, 1).valor == 2
+    assert sorted(pedido.versao for pedido in sqlite_session.query(Pedido)) == [1, 2]
+
+
+def test_claim_entrega_o_pedido_mais_antigo_uma_unica_vez(sqlite_session, statements):
+    _seed_pedidos(sqlite_session, 6)
+    statements.clear()
+
+    primeiro = client.post("/pedidos/claim")
+    data = primeiro.json()["data"]
+
+    assert primeiro.status_code == 200
+    assert (data["id"], data["status"]["descricao"], data["produtos"]) == (1, "Iniciado", [10, 11])
+    # The claim, the products, then the version counter and its stamp; nothing else
+    assert [sql.split()[0] for sql in statements] == ["UPDATE", "SELECT", "UPDATE", "UPDATE"]
+
+    assert client.post("/pedidos/claim").json()["data"]["id"] == 4
+    assert client.post("/pedidos/claim").status_code == 204
+    assert client.post("/pedidos/claim", params={"status": 3}).status_code == 400
+    assert client.post("/pedidos/claim", params={"status": 4}).status_code == 400
+    # A Pronto order is never pulled back to Iniciado
+    assert client.get("/pedidos/3").json()["data"]["status"]["id"] == 3
+
@@ -39,3 +39,22 @@ def test_buscar_status_not_found():
 
     res = client.get("/status_pedido/999")
     assert res.status_code == 400
+
+
+def test_listar_status_etag_e_304(fake_status):
+    mock_gateway = MagicMock()
+    mock_gateway.listar_todos.return_value = [fake_status]
+
+    app.dependency_overrides[status_api.get_status_repository] = lambda: mock_gateway
+
+    first = client.get("/status_pedido/")
+    etag = first.headers["ETag"]
+    revalidated = client.get("/status_pedido/", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+
+    fake_status.descricao = "Alterado"
+    assert client.get("/status_pedido/", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,62 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+
+def _alembic(url):
+    config = Config(os.path.join(RAIZ, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(RAIZ, "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+
+    return config
+
+
+def _banco_existente(tmp_path, *ddl):
+    url = f"sqlite:///{tmp_path / 'pedidos.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE pedido (id INTEGER PRIMARY KEY, cliente_id INTEGER, status INTEGER, "
+                          "data_criacao TIME, data_alteracao TIME, data_finalizacao TIME)"))
+        conn.execute(text("INSERT INTO pedido (id, cliente_id, status) VALUES (1, 1, 1)"))
+        for comando in ddl:
+            conn.execute(text(comando))
+
+    return url, engine
+
+
+def test_upgrade_cria_versao_e_linha_do_contador(tmp_path):
+    url, engine = _banco_existente(tmp_path)
+
+    command.upgrade(_alembic(url), "head")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT id, valor FROM pedido_sequencia")).all() == [(1, 0)]
+    assert "versao" in {coluna["name"] for coluna in inspect(engine).get_columns("pedido")}
+    assert "pedido_removido" in inspect(engine).get_table_names()
+
+    command.downgrade(_alembic(url), "base")
+
+    assert "pedido_sequencia" not in inspect(engine).get_table_names()
+    engine.dispose()
+
+
+def test_upgrade_aceita_ddl_manual_e_continua_da_maior_versao(tmp_path):
+    url, engine = _banco_existente(
+        tmp_path,
+        "ALTER TABLE pedido ADD COLUMN versao BIGINT",
+        "CREATE INDEX ix_pedido_versao ON pedido (versao)",
+        "CREATE TABLE pedido_sequencia (id INTEGER PRIMARY KEY, valor BIGINT NOT NULL)",
+        "CREATE TABLE pedido_removido (id INTEGER PRIMARY KEY, versao BIGINT NOT NULL)",
+        "UPDATE pedido SET versao = 7",
+        "INSERT INTO pedido_removido (id, versao) VALUES (2, 9)",
+    )
+
+    command.upgrade(_alembic(url), "head")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT id, valor FROM pedido_sequencia")).all() == [(1, 9)]
+    engine.dispose()
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.infrastructure.db import async_database
+from app.infrastructure.db.unit_of_work import UnitOfWork
+
+
+@pytest.mark.parametrize("url, driver, database", [
+    ("postgresql://user:senha@db:5432/pedidos", "postgresql+asyncpg", "pedidos"),
+    ("postgresql+psycopg2://user:senha@db/pedidos", "postgresql+asyncpg", "pedidos"),
+    ("sqlite+pysqlite:///:memory:", "sqlite+aiosqlite", ":memory:"),
+])
+def test_url_assincrona_troca_o_driver(url, driver, database):
+    with patch.object(async_database, "_get_database_url", return_value=url):
+        async_url = async_database._get_async_database_url()
+
+    assert async_url.drivername == driver
+    assert async_url.database == database
+
+
+def test_url_assincrona_backend_nao_suportado():
+    with patch.object(async_database, "_get_database_url", return_value="mysql://user@db/pedidos"):
+        with pytest.raises(RuntimeError):
+            async_database._get_async_database_url()
+
+
+@pytest.mark.parametrize("valor, esperado", [("true", True), ("1", True), ("false", False), ("", False)])
+def test_is_async_enabled(monkeypatch, valor, esperado):
+    monkeypatch.setenv("DB_ASYNC", valor)
+
+    assert async_database.is_async_enabled() is esperado
+
+
+def test_run_sem_sessao_assincrona_usa_threadpool():
+    uow = UnitOfWork(MagicMock())
+    fn = MagicMock(return_value=42)
+
+    assert asyncio.run(uow.run(fn, 1, chave="valor")) == 42
+    fn.assert_called_once_with(1, chave="valor")
+
+
+def test_run_com_sessao_assincrona_usa_run_sync():
+    async_session = MagicMock()
+
+    async def run_sync(callback):
+        return callback("sync-session")
+
+    async_session.run_sync.side_effect = run_sync
+    uow = UnitOfWork(MagicMock(), async_session=async_session)
+
+    assert asyncio.run(uow.run(lambda valor: valor * 2, 21)) == 42
+    async_session.run_sync.assert_called_once()
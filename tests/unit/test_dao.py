@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 import pytest
 from unittest.mock import MagicMock, patch
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
@@ -33,6 +34,8 @@ class TestPedidoDAO:
         pedido = MagicMock()
         pedido.cliente_id = 1
         
+        mock_db_session.execute.return_value.scalar.return_value = 1
+        
         result = dao.criar_pedido(pedido)
         
         mock_db_session.add.assert_called_once()
@@ -64,6 +67,93 @@ class TestPedidoDAO:
         
         assert result == []
     
+    def test_listar_por_prioridade_ordena_em_uma_consulta(self, sqlite_session):
+        """Test listing active pedidos by status priority with a single statement"""
+        import datetime
+        from sqlalchemy import event
+        
+        for cliente_id, status, hora in [(1, 1, 8), (2, 3, 10), (3, 2, 9), (4, 3, 7), (5, 4, 6), (6, 1, 7)]:
+            pedido = Pedido(cliente_id=cliente_id, status=status)
+            pedido.data_criacao = datetime.time(hora, 0)
+            sqlite_session.add(pedido)
+        sqlite_session.commit()
+        sqlite_session.expire_all()
+        
+        statements = []
+        event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        
+        result = PedidoDAO(sqlite_session).listar_por_prioridade([3, 2, 1])
+        descricoes = [pedido.status_rel.descricao for pedido in result]
+        
+        assert [pedido.cliente_id for pedido in result] == [4, 2, 3, 6, 1]
+        assert descricoes == ["Pronto", "Pronto", "Iniciado", "Recebido", "Recebido"]
+        assert len(statements) == 1
+    
+    def test_escritas_avancam_a_versao_e_deixam_tombstone(self, sqlite_session):
+        """Test every write taking the next change version, and deletes leaving a tombstone"""
+        from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
+        
+        dao = PedidoDAO(sqlite_session)
+        primeiro = dao.criar_pedido(MagicMock(cliente_id=1)).id
+        segundo = dao.criar_pedido(MagicMock(cliente_id=2)).id
+        dao.atualizar_pedido(primeiro, PedidoAtualizaSchema(status=2))
+        dao.deletar_pedido(segundo)
+        
+        pedidos, removidos = dao.listar_alteracoes(desde=0, limite=10)
+        
+        assert [(pedido.id, pedido.versao) for pedido in pedidos] == [(primeiro, 3)]
+        assert [(removido.id, removido.versao) for removido in removidos] == [(segundo, 4)]
+        assert dao.versao_atual() == 4
+        assert dao.listar_alteracoes(desde=4, limite=10) == ([], [])
+    
+    def test_versao_listagem_muda_com_escritas_e_descricoes(self, sqlite_session):
+        """Test the list validator following the counter and the status descriptions"""
+        from app.models.status_pedido import StatusPedido
+        
+        dao = PedidoDAO(sqlite_session)
+        inicial = dao.versao_listagem()
+        
+        assert inicial == (0, [(1, "Recebido"), (2, "Iniciado"), (3, "Pronto"), (4, "Finalizado")])
+        
+        dao.criar_pedido(MagicMock(cliente_id=1))
+        assert dao.versao_listagem()[0] == 1
+        
+        sqlite_session.get(StatusPedido, 3).descricao = "Pronto para retirada"
+        sqlite_session.commit()
+        assert dao.versao_listagem()[1][2] == (3, "Pronto para retirada")
+    
+    def test_escrita_sem_linha_do_contador_falha(self, sqlite_session):
+        """Test writes refusing to create the counter row themselves"""
+        from app.models.pedido_sequencia import PedidoSequencia
+        
+        sqlite_session.delete(sqlite_session.get(PedidoSequencia, 1))
+        sqlite_session.commit()
+        
+        with pytest.raises(Exception, match="pedido_sequencia"):
+            PedidoDAO(sqlite_session).criar_pedido(MagicMock(cliente_id=1))
+        
+        assert sqlite_session.get(PedidoSequencia, 1) is None
+    
+    def test_listar_alteracoes_ignora_versoes_apos_o_contador(self, sqlite_session):
+        """Test the feed stopping at the counter read before both queries"""
+        import datetime
+        from app.models.pedido_removido import PedidoRemovido
+        from app.models.pedido_sequencia import PedidoSequencia
+        
+        visivel = Pedido(cliente_id=1, status=1)
+        visivel.data_criacao, visivel.versao = datetime.time(8, 0), 1
+        # Written after the counter was read, as a concurrent commit would be
+        posterior = Pedido(cliente_id=2, status=1)
+        posterior.data_criacao, posterior.versao = datetime.time(8, 0), 2
+        sqlite_session.add_all([visivel, posterior, PedidoRemovido(id=99, versao=3)])
+        sqlite_session.get(PedidoSequencia, 1).valor = 1
+        sqlite_session.commit()
+        
+        pedidos, removidos = PedidoDAO(sqlite_session).listar_alteracoes(desde=0, limite=10)
+        
+        assert ([pedido.id for pedido in pedidos], removidos) == ([visivel.id], [])
+    
     def test_buscar_por_id(self, dao, mock_db_session):
         """Test fetching pedido by id"""
         mock_query = MagicMock()
@@ -86,61 +176,197 @@ class TestPedidoDAO:
         
         assert result is None
     
-    def test_atualizar_pedido(self, dao, mock_db_session):
-        """Test updating a pedido"""
-        mock_entity = MagicMock()
-        mock_query = MagicMock()
-        mock_db_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_entity
-        
-        pedido_request = MagicMock()
-        pedido_request.status = "2"
-        pedido_request.model_dump.return_value = {"status": "2"}
+    @pytest.fixture
+    def pedido_sqlite(self, sqlite_session):
+        import datetime
         
-        result = dao.atualizar_pedido(1, pedido_request)
+        pedido = Pedido(cliente_id=1, status=1)
+        pedido.data_criacao = datetime.time(8, 0)
+        sqlite_session.add(pedido)
+        sqlite_session.commit()
         
-        mock_db_session.commit.assert_called()
-        mock_db_session.refresh.assert_called()
+        return pedido.id
+    
+    def test_atualizar_pedido(self, sqlite_session, pedido_sqlite):
+        """Test updating a pedido with one compare-and-set UPDATE ... RETURNING"""
+        from sqlalchemy import event
+        from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
+        
+        sqlite_session.get(Pedido, pedido_sqlite).status = 3
+        sqlite_session.commit()
+        
+        statements = []
+        event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        
+        result = PedidoDAO(sqlite_session).atualizar_pedido(pedido_sqlite, PedidoAtualizaSchema(status=4))
+        
+        assert (result.id, result.status) == (pedido_sqlite, 4)
+        assert (result.status_rel.id, result.status_rel.descricao) == (4, "Finalizado")
+        assert result.data_finalizacao == result.data_alteracao is not None
+        # The CAS itself, then the version counter and its stamp right before COMMIT;
+        # no SELECT before or refresh after
+        assert [sql.split()[0] for sql in statements] == ["UPDATE", "UPDATE", "UPDATE"]
+        assert "RETURNING" in statements[0] and "pedido_sequencia" in statements[1]
+        assert sqlite_session.scalar(select(Pedido.versao).where(Pedido.id == pedido_sqlite)) == 1
     
-    def test_atualizar_pedido_not_found(self, dao, mock_db_session):
+    def test_atualizar_pedido_not_found(self, sqlite_session, pedido_sqlite):
         """Test updating non-existent pedido"""
-        mock_query = MagicMock()
-        mock_db_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
-        
-        pedido_request = MagicMock()
-        pedido_request.status = "2"
+        from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
         
-        result = dao.atualizar_pedido(999, pedido_request)
+        result = PedidoDAO(sqlite_session).atualizar_pedido(999, PedidoAtualizaSchema(status=2))
         
         assert result is None
     
+    def test_atualizar_pedido_finalizado_e_conflito(self, sqlite_session, pedido_sqlite):
+        """Test a finalized pedido rejecting any further transition"""
+        from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
+        from app.entities.pedido.exceptions import TransicaoStatusInvalida
+        
+        dao = PedidoDAO(sqlite_session)
+        for novo in (2, 3, 4):
+            dao.atualizar_pedido(pedido_sqlite, PedidoAtualizaSchema(status=novo))
+        
+        with pytest.raises(TransicaoStatusInvalida, match="Pedido já finalizado"):
+            dao.atualizar_pedido(pedido_sqlite, PedidoAtualizaSchema(status=2))
+    
+    def test_atualizar_pedido_so_avanca_um_passo(self, sqlite_session, pedido_sqlite):
+        """Test the CAS refusing repeated, skipped and backward transitions"""
+        from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
+        from app.entities.pedido.exceptions import TransicaoStatusInvalida
+        
+        dao = PedidoDAO(sqlite_session)
+        dao.atualizar_pedido(pedido_sqlite, PedidoAtualizaSchema(status=2))
+        
+        for novo in (2, 4, 1):
+            with pytest.raises(TransicaoStatusInvalida, match=f"Transição de status 2 para {novo} não permitida"):
+                dao.atualizar_pedido(pedido_sqlite, PedidoAtualizaSchema(status=novo))
+        
+        assert sqlite_session.scalar(select(Pedido.status).where(Pedido.id == pedido_sqlite)) == 2
+    
+    def test_atualizar_pedido_concorrente_so_um_vence(self, tmp_path):
+        """Test two terminals sending the same Recebido -> Iniciado at once: exactly one wins"""
+        import datetime
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.adapters.dto.pedido_dto import PedidoAtualizaSchema
+        from app.entities.pedido.exceptions import TransicaoStatusInvalida
+        from app.infrastructure.db.database import Base
+        from app.models.pedido_sequencia import PedidoSequencia
+        from app.models.status_pedido import StatusPedido
+        
+        engine = create_engine(f"sqlite:///{tmp_path / 'pedidos.db'}", connect_args={"timeout": 10})
+        Base.metadata.create_all(engine)
+        Sessao = sessionmaker(bind=engine)
+        
+        with Sessao() as session:
+            pedido = Pedido(cliente_id=1, status=1)
+            pedido.data_criacao = datetime.time(8, 0)
+            session.add_all([StatusPedido(id=1, descricao="Recebido"), StatusPedido(id=2, descricao="Iniciado"),
+                             PedidoSequencia(id=1, valor=0), pedido])
+            session.commit()
+            id = pedido.id
+        
+        largada = threading.Barrier(2)
+        
+        def iniciar(_):
+            with Sessao() as session:
+                largada.wait()
+                try:
+                    PedidoDAO(session).atualizar_pedido(id, PedidoAtualizaSchema(status=2))
+                    return "venceu"
+                except TransicaoStatusInvalida:
+                    return "conflito"
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            resultados = sorted(executor.map(iniciar, range(2)))
+        
+        assert resultados == ["conflito", "venceu"]
+        with Sessao() as session:
+            assert session.get(PedidoSequencia, 1).valor == 1
+        engine.dispose()
+    
+    def test_atualizar_pedido_status_inexistente(self, dao, mock_db_session):
+        """Test an unknown target status failing before any SQL"""
+        with pytest.raises(Exception, match="Status inválido"):
+            dao.atualizar_pedido(1, MagicMock(status=9))
+        
+        mock_db_session.execute.assert_not_called()
+    
+    def test_reivindicar_proximo(self, sqlite_session, pedido_sqlite):
+        """Test claiming the oldest pedido in a status with one locking UPDATE ... RETURNING"""
+        import datetime
+        from sqlalchemy import event
+        
+        mais_novo = Pedido(cliente_id=2, status=1)
+        mais_novo.data_criacao = datetime.time(9, 0)
+        outro_status = Pedido(cliente_id=3, status=3)
+        outro_status.data_criacao = datetime.time(7, 0)
+        sqlite_session.add_all([mais_novo, outro_status])
+        sqlite_session.commit()
+        
+        statements = []
+        event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        
+        dao = PedidoDAO(sqlite_session)
+        primeiro = dao.reivindicar_proximo(status_origem=1, status_destino=2)
+        
+        assert (primeiro.id, primeiro.status) == (pedido_sqlite, 2)
+        assert (primeiro.status_rel.id, primeiro.status_rel.descricao) == (2, "Iniciado")
+        # The claim itself, then the version counter and its stamp
+        assert [sql.split()[0] for sql in statements] == ["UPDATE", "UPDATE", "UPDATE"]
+        assert "RETURNING" in statements[0] and "pedido_sequencia" in statements[1]
+        
+        assert dao.reivindicar_proximo(status_origem=1, status_destino=2).id == mais_novo.id
+        
+        # Nothing to claim: no version is taken, so the counter is never locked
+        statements.clear()
+        assert dao.reivindicar_proximo(status_origem=1, status_destino=2) is None
+        assert [sql.split()[0] for sql in statements] == ["UPDATE"]
+        assert dao.versao_atual() == 2
+    
+    def test_reivindicar_proximo_usa_skip_locked(self, dao, mock_db_session):
+        """Test the candidate subquery skipping rows locked by other transactions"""
+        from sqlalchemy.dialects import postgresql
+        
+        mock_db_session.execute.return_value.first.return_value = None
+        
+        assert dao.reivindicar_proximo(status_origem=1, status_destino=2) is None
+        
+        sql = str(mock_db_session.execute.call_args_list[-1].args[0].compile(dialect=postgresql.dialect()))
+        assert "ORDER BY pedido_1.data_criacao ASC, pedido_1.id ASC" in sql
+        assert "LIMIT" in sql and "FOR UPDATE SKIP LOCKED" in sql
+    
     def test_deletar_pedido_success(self, dao, mock_db_session):
-        """Test successfully deleting a pedido"""
-        mock_entity = MagicMock()
-        mock_query = MagicMock()
-        mock_db_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_entity
+        """Test successfully deleting a pedido with a single DELETE, leaving a tombstone"""
+        from app.models.pedido_removido import PedidoRemovido
+
+        mock_db_session.execute.return_value.rowcount = 1
+        mock_db_session.execute.return_value.scalar.return_value = 7
         
         dao.deletar_pedido(1)
         
-        mock_db_session.delete.assert_called_once()
+        # The order row, then the change counter and the tombstone right before COMMIT
+        delete, contador, tombstone = mock_db_session.execute.call_args_list
+        assert delete.args[0].is_delete and contador.args[0].is_update
+        assert tombstone.args[0].table.name == PedidoRemovido.__tablename__
+        assert tombstone.args[1] == [{"id": 1, "versao": 7}]
+        mock_db_session.query.assert_not_called()
+        mock_db_session.delete.assert_not_called()
         mock_db_session.commit.assert_called_once()
     
     def test_deletar_pedido_not_found(self, dao, mock_db_session):
         """Test deleting non-existent pedido"""
-        mock_query = MagicMock()
-        mock_db_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db_session.execute.return_value.rowcount = 0
         
         with pytest.raises(ValueError) as exc_info:
             dao.deletar_pedido(999)
         
         assert "Pedido não encontrado" in str(exc_info.value)
+        mock_db_session.commit.assert_not_called()
 
 
 class TestPedidoProdutoDAO:
@@ -171,6 +397,49 @@ class TestPedidoProdutoDAO:
         assert "Erro de integridade" in str(exc_info.value)
         mock_db_session.rollback.assert_called_once()
     
+    def test_criar_pedido_produtos_uma_unica_insercao(self, dao, mock_db_session):
+        """Test bulk creating pedido produtos with a single statement and commit"""
+        mock_db_session.get_bind.return_value.dialect.insert_executemany_returning = True
+        mock_db_session.execute.return_value.all.return_value = [MagicMock(produto_id=2), MagicMock(produto_id=3)]
+        
+        result = dao.criar_pedido_produtos(1, [2, 3])
+        
+        assert [item.produto_id for item in result] == [2, 3]
+        mock_db_session.execute.assert_called_once()
+        rows = mock_db_session.execute.call_args.args[1]
+        assert rows == [{"pedido_id": 1, "produto_id": 2}, {"pedido_id": 1, "produto_id": 3}]
+        mock_db_session.commit.assert_called_once()
+        mock_db_session.refresh.assert_not_called()
+        mock_db_session.add.assert_not_called()
+    
+    def test_criar_pedido_produtos_sem_returning(self, dao, mock_db_session):
+        """Test bulk creating pedido produtos on a dialect without RETURNING"""
+        mock_db_session.get_bind.return_value.dialect.insert_executemany_returning = False
+        
+        result = dao.criar_pedido_produtos(1, [2, 3])
+        
+        assert [item.produto_id for item in result] == [2, 3]
+        mock_db_session.execute.return_value.all.assert_not_called()
+        mock_db_session.commit.assert_called_once()
+    
+    def test_criar_pedido_produtos_lista_vazia(self, dao, mock_db_session):
+        """Test bulk creating with no produtos does not touch the database"""
+        result = dao.criar_pedido_produtos(1, [])
+        
+        assert result == []
+        mock_db_session.execute.assert_not_called()
+        mock_db_session.commit.assert_not_called()
+    
+    def test_criar_pedido_produtos_integrity_error(self, dao, mock_db_session):
+        """Test criar_pedido_produtos with IntegrityError"""
+        mock_db_session.execute.side_effect = IntegrityError("Duplicate", "orig", "params")
+        
+        with pytest.raises(Exception) as exc_info:
+            dao.criar_pedido_produtos(1, [2])
+        
+        assert "Erro de integridade" in str(exc_info.value)
+        mock_db_session.rollback.assert_called_once()
+    
     def test_buscar_por_id_pedido(self, dao, mock_db_session):
         """Test searching pedido produtos by pedido_id"""
         mock_query = MagicMock()
@@ -182,6 +451,24 @@ class TestPedidoProdutoDAO:
         
         assert len(result) == 2
     
+    def test_buscar_por_ids_pedido_lista_vazia(self, dao, mock_db_session):
+        """Test searching pedido produtos for no pedidos skips the query"""
+        result = dao.buscarPorIdsPedido([])
+        
+        assert result == []
+        mock_db_session.query.assert_not_called()
+    
+    def test_deletar_por_pedido_um_unico_delete(self, dao, mock_db_session):
+        """Test deleting every pedido produto of a pedido with one statement"""
+        mock_db_session.execute.return_value.rowcount = 3
+        
+        result = dao.deletar_por_pedido(1)
+        
+        assert result == 3
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.query.assert_not_called()
+        mock_db_session.commit.assert_called_once()
+    
     def test_deletar_existe(self, dao, mock_db_session):
         """Test deleting an existing pedido produto"""
         mock_entity = MagicMock()
@@ -0,0 +1,107 @@
+import subprocess
+import sys
+import types
+
+import pytest
+
+from app.infrastructure.db import database
+
+
+@pytest.fixture
+def secrets_manager(monkeypatch):
+    """Fake boto3 module and fresh URL/engine caches for the secret path."""
+    calls = []
+
+    class _Client:
+        def get_secret_value(self, SecretId):
+            calls.append(SecretId)
+            return {"SecretString": '{"host": "db", "dbname": "pedidos", "username": "u", "password": "p"}'}
+
+    monkeypatch.setitem(sys.modules, "boto3", types.SimpleNamespace(client=lambda *a, **kw: _Client()))
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("DB_SECRET_NAME", "pedidos/rds")
+
+    for cached in (database._get_database_url, database.get_engine, database.get_sessionmaker):
+        cached.cache_clear()
+
+    yield calls
+
+    for cached in (database._get_database_url, database.get_engine, database.get_sessionmaker):
+        cached.cache_clear()
+
+
+def test_import_da_app_nao_cria_engine_nem_importa_boto3():
+    code = (
+        "import sys, app.main\n"
+        "from app.infrastructure.db import database\n"
+        "assert 'boto3' not in sys.modules\n"
+        "assert database.get_engine.cache_info().currsize == 0\n"
+    )
+    env = {"DB_SECRET_NAME": "pedidos/rds", "PATH": ""}
+
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_engine_criada_no_primeiro_uso_e_reaproveitada(secrets_manager):
+    assert secrets_manager == []
+
+    engine = database.get_engine()
+
+    assert database.get_engine() is engine
+    assert database.engine is engine
+    assert secrets_manager == ["pedidos/rds"]
+    assert engine.url.drivername == "postgresql+psycopg2"
+    assert engine.url.host == "db"
+
+
+def test_session_local_usa_engine_lazy(secrets_manager):
+    session = database.SessionLocal()
+
+    assert session.get_bind() is database.get_engine()
+    assert secrets_manager == ["pedidos/rds"]
+    session.close()
+
+
+def test_startup_cria_engine_fora_do_event_loop(secrets_manager, monkeypatch):
+    import asyncio
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    no_loop = []
+
+    def criar_engine(url, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            no_loop.append(True)
+        except RuntimeError:
+            no_loop.append(False)
+        return create_engine(url, **kwargs)
+
+    create_engine = database.create_engine
+    monkeypatch.setattr(database, "create_engine", criar_engine)
+
+    with TestClient(app):
+        assert database.get_engine.cache_info().currsize == 1
+        assert secrets_manager == ["pedidos/rds"]
+
+    assert no_loop == [False]
+
+
+def test_startup_sobe_mesmo_sem_banco(secrets_manager, monkeypatch, caplog):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    monkeypatch.delenv("DB_SECRET_NAME")
+
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+
+    assert "Falha ao preparar a conexão" in caplog.text
+    assert database.get_engine.cache_info().currsize == 0
+
+
+def test_atributo_inexistente_no_modulo():
+    with pytest.raises(AttributeError):
+        database.nao_existe
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.infrastructure.db import database, health
+from app.infrastructure.db.health import DatabaseHealth, pool_saturation
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'health.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    monkeypatch.setattr(database, "get_engine", lambda: engine)
+    monkeypatch.delenv("DB_ASYNC", raising=False)
+
+    yield engine
+
+    engine.dispose()
+
+
+def test_select_1_ok_reporta_conectado(engine):
+    result = asyncio.run(DatabaseHealth().check())
+
+    assert result["status"] == "connected"
+    assert result["database"]["ok"] is True
+    assert result["pool"]["saturation"] == 0
+    assert result["cached"] is False
+
+
+def test_resultado_fica_em_cache_pela_janela(engine, monkeypatch):
+    clock = _Clock()
+    checker = DatabaseHealth(ttl=5, clock=clock)
+    probes = []
+    original = DatabaseHealth._probe
+
+    async def counting_probe(target, timeout):
+        probes.append(target)
+        await original(target, timeout)
+
+    monkeypatch.setattr(DatabaseHealth, "_probe", staticmethod(counting_probe))
+
+    asyncio.run(checker.check())
+    clock.now = 4.9
+    cached = asyncio.run(checker.check())
+    clock.now = 5.1
+    fresh = asyncio.run(checker.check())
+
+    assert len(probes) == 2
+    assert cached["cached"] is True
+    assert fresh["cached"] is False
+
+
+def test_banco_inacessivel_reporta_indisponivel(engine, monkeypatch):
+    async def failing_probe(target, timeout):
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(DatabaseHealth, "_probe", staticmethod(failing_probe))
+
+    result = asyncio.run(DatabaseHealth().check())
+
+    assert result["status"] == "unavailable"
+    assert result["database"] == {"ok": False, "error": "ConnectionError", "latency_ms": result["database"]["latency_ms"]}
+
+
+def test_probe_lento_respeita_timeout(engine, monkeypatch):
+    async def hanging_probe(target, timeout):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(DatabaseHealth, "_probe", staticmethod(hanging_probe))
+
+    result = asyncio.run(DatabaseHealth(timeout=0.05).check())
+
+    assert result["status"] == "unavailable"
+    assert result["database"]["error"].startswith("timeout")
+    assert result["database"]["latency_ms"] < 1000
+
+
+def test_probes_concorrentes_compartilham_uma_consulta(engine, monkeypatch):
+    probes = []
+
+    async def slow_probe(target, timeout):
+        probes.append(target)
+        await asyncio.sleep(0.05)
+
+    monkeypatch.setattr(DatabaseHealth, "_probe", staticmethod(slow_probe))
+    checker = DatabaseHealth()
+
+    async def kubelet():
+        return await asyncio.gather(*(checker.check() for _ in range(5)))
+
+    results = asyncio.run(kubelet())
+
+    assert len(probes) == 1
+    assert {result["status"] for result in results} == {"connected"}
+
+
+def test_probe_no_postgres_usa_statement_timeout(monkeypatch):
+    from unittest.mock import MagicMock
+
+    engine = MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    conn.dialect.name = "postgresql"
+    monkeypatch.delenv("DB_ASYNC", raising=False)
+
+    asyncio.run(DatabaseHealth._probe(engine, 2.0))
+
+    (limite, params), (probe,) = [call.args for call in conn.execute.call_args_list]
+    assert "statement_timeout" in str(limite) and params == {"timeout": "2000"}
+    assert str(probe) == "SELECT 1"
+
+
+def test_pool_saturado_falha_sem_consultar(engine, monkeypatch):
+    async def unexpected_probe(target, timeout):
+        raise AssertionError("probe should not run while saturated")
+
+    monkeypatch.setattr(DatabaseHealth, "_probe", staticmethod(unexpected_probe))
+
+    with engine.connect():
+        result = asyncio.run(DatabaseHealth(saturation=0.9).check())
+
+    assert result["status"] == "saturated"
+    assert result["pool"]["saturation"] == 1.0
+    assert result["pool"]["checkedout"] == 1
+
+
+def test_pool_saturation_sem_capacidade_fixa():
+    engine = create_engine("sqlite:///:memory:")
+
+    assert pool_saturation(engine.pool) is None
+    assert health.get_database_health() is health.database_health
@@ -0,0 +1,22 @@
+import datetime
+
+from app.adapters.utils.etag import make_etag, etag_matches
+
+
+def test_make_etag_forte_e_deterministico():
+    etag = make_etag((1, 2, datetime.time(10, 0), None))
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag((1, 2, datetime.time(10, 0), None))
+    assert etag != make_etag((1, 3, datetime.time(10, 0), None))
+
+
+def test_etag_matches():
+    etag = make_etag(1)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"outro", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"outro"', etag)
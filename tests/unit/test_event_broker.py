@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+from app.infrastructure.events.broker import RESET_EVENT, Event, EventBroker
+
+
+async def _collect(stream, count):
+    return [await stream.__anext__() for _ in range(count)]
+
+
+def test_event_encode_formato_sse():
+    event = Event(7, "pedido_removido", {"id": 3})
+
+    assert event.encode() == 'id: 7\nevent: pedido_removido\ndata: {"id":3}\n\n'
+
+
+def test_publish_sem_assinantes_guarda_historico():
+    broker = EventBroker(buffer=2)
+
+    ids = [broker.publish("pedido_atualizado", {"id": i}).id for i in range(3)]
+
+    assert ids == [1, 2, 3]
+    assert broker.last_event_id == 3
+    assert [event.id for event in broker._history] == [2, 3]
+
+
+def test_reconexao_reenvia_eventos_apos_last_event_id():
+    broker = EventBroker()
+    for i in range(3):
+        broker.publish("pedido_atualizado", {"id": i})
+
+    async def scenario():
+        async with broker.subscribe(last_event_id=1) as subscription:
+            return [event.id for event in subscription.backlog]
+
+    assert asyncio.run(scenario()) == [2, 3]
+
+
+def test_last_event_id_fora_do_buffer_recebe_reset():
+    broker = EventBroker(buffer=2)
+    for i in range(5):
+        broker.publish("pedido_atualizado", {"id": i})
+
+    async def scenario(last_event_id):
+        async with broker.subscribe(last_event_id=last_event_id) as subscription:
+            return subscription.backlog
+
+    # Too old for the ring, and from before a restart (ids ahead of this process)
+    for last_event_id in (1, 99):
+        backlog = asyncio.run(scenario(last_event_id))
+        assert [(event.type, event.id) for event in backlog] == [(RESET_EVENT, 5)]
+
+    assert asyncio.run(scenario(3)) == list(broker._history)
+
+
+def test_publish_de_outra_thread_entrega_no_loop_do_cliente():
+    broker = EventBroker()
+
+    async def scenario():
+        async with broker.subscribe() as subscription:
+            stream = subscription.stream(heartbeat=5)
+            await stream.__anext__()  # retry
+
+            thread = threading.Thread(target=broker.publish, args=("pedido_criado", {"id": 1}))
+            thread.start()
+            thread.join()
+
+            chunk = await asyncio.wait_for(stream.__anext__(), timeout=1)
+            await stream.aclose()
+
+        return chunk
+
+    assert asyncio.run(scenario()).startswith("id: 1\nevent: pedido_criado\n")
+    assert broker.subscribers == 0
+
+
+def test_stream_envia_retry_backlog_e_heartbeat():
+    broker = EventBroker()
+    broker.publish("pedido_criado", {"id": 1})
+    broker.publish("pedido_criado", {"id": 2})
+
+    async def scenario():
+        async with broker.subscribe(last_event_id=1) as subscription:
+            stream = subscription.stream(heartbeat=0.01, retry_ms=500)
+            chunks = await _collect(stream, 3)
+            await stream.aclose()
+
+        return chunks
+
+    assert asyncio.run(scenario()) == ["retry: 500\n\n", Event(2, "pedido_criado", {"id": 2}).encode(), ": keep-alive\n\n"]
+
+
+def test_cliente_lento_e_desconectado_quando_a_fila_enche():
+    broker = EventBroker(client_queue=2)
+
+    async def scenario():
+        async with broker.subscribe() as subscription:
+            for i in range(5):
+                broker.publish("pedido_atualizado", {"id": i})
+            await asyncio.sleep(0)
+
+            return [chunk async for chunk in subscription.stream(heartbeat=1)], subscription.subscriber
+
+    chunks, subscriber = asyncio.run(scenario())
+
+    # The stream ends instead of growing; the client reconnects with Last-Event-ID
+    assert subscriber.overflowed is True
+    assert chunks == ["retry: 3000\n\n", Event(2, "pedido_atualizado", {"id": 1}).encode()]
+
+
+def test_wait_acorda_com_evento_e_expira_sem_eventos():
+    broker = EventBroker(client_queue=2)
+
+    async def scenario():
+        async with broker.subscribe() as subscription:
+            vazio = await subscription.wait(0.01)
+
+            for i in range(3):
+                broker.publish("pedido_criado", {"id": i})
+            await asyncio.sleep(0)
+            acordou = await subscription.wait(1)
+
+            # The overflow is cleared, so the next wait is not muted
+            broker.publish("pedido_criado", {"id": 4})
+            await asyncio.sleep(0)
+
+            return vazio, acordou, await subscription.wait(1)
+
+    assert asyncio.run(scenario()) == (False, True, True)
@@ -0,0 +1,151 @@
+import asyncio
+
+from app.infrastructure.metrics.http_metrics import HttpMetrics
+from app.infrastructure.metrics.middleware import MetricsMiddleware
+from app.infrastructure.metrics.exposition import render
+
+
+class _Route:
+    path = "/pedidos/{id}"
+
+
+def _run(middleware, scope):
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    asyncio.run(middleware(scope, receive, send))
+
+
+def test_http_metrics_agrupa_por_metodo_rota_e_status():
+    metrics = HttpMetrics()
+
+    for duration in (0.002, 0.2):
+        metrics.request_started()
+        metrics.request_finished("GET", "/pedidos/{id}", 200, duration)
+    metrics.request_started()
+    metrics.request_finished("BREW", "/pedidos/{id}", 404, 0.001)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["in_flight"] == 0
+    assert snapshot["responses"] == {("GET", "/pedidos/{id}", 200): 2, ("OTHER", "/pedidos/{id}", 404): 1}
+    assert snapshot["durations"][("GET", "/pedidos/{id}")]["count"] == 2
+    assert snapshot["durations"][("GET", "/pedidos/{id}")]["buckets"]["0.005"] == 1
+
+
+def test_middleware_usa_template_da_rota():
+    metrics = HttpMetrics()
+
+    async def app(scope, receive, send):
+        scope["route"] = _Route()
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    _run(MetricsMiddleware(app, metrics), {"type": "http", "method": "POST", "path": "/pedidos/7"})
+
+    assert metrics.snapshot()["responses"] == {("POST", "/pedidos/{id}", 201): 1}
+
+
+def test_middleware_rota_inexistente_e_erro():
+    metrics = HttpMetrics()
+
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    try:
+        _run(MetricsMiddleware(failing_app, metrics), {"type": "http", "method": "GET", "path": "/qualquer/123"})
+    except RuntimeError:
+        pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["responses"] == {("GET", "unmatched", 500): 1}
+    assert snapshot["in_flight"] == 0
+
+
+def test_middleware_stream_sai_do_in_flight_e_da_latencia():
+    from app.infrastructure.metrics.middleware import mark_streaming
+
+    metrics = HttpMetrics()
+    durante = []
+
+    class _Stream:
+        path = "/pedidos/stream"
+
+    async def app(scope, receive, send):
+        scope["route"] = _Stream()
+        mark_streaming(scope)
+        mark_streaming(scope)
+        durante.append((metrics.in_flight, metrics.streams_open))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    _run(MetricsMiddleware(app, metrics), {"type": "http", "method": "GET", "path": "/pedidos/stream"})
+    snapshot = metrics.snapshot()
+
+    assert durante == [(0, 1)]
+    assert (snapshot["in_flight"], snapshot["streams_open"]) == (0, 0)
+    assert snapshot["responses"] == {("GET", "/pedidos/stream", 200): 1}
+    assert snapshot["durations"] == {}
+    assert "http_streams_open 0" in render(metrics)
+
+
+def test_mark_streaming_fora_do_middleware_nao_falha():
+    from app.infrastructure.metrics.middleware import mark_streaming
+
+    mark_streaming({"type": "http"})
+
+
+def test_middleware_ignora_lifespan():
+    metrics = HttpMetrics()
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["type"])
+
+    _run(MetricsMiddleware(app, metrics), {"type": "lifespan"})
+
+    assert calls == ["lifespan"]
+    assert metrics.snapshot()["responses"] == {}
+
+
+def test_render_formato_prometheus():
+    metrics = HttpMetrics()
+    metrics.request_started()
+    metrics.request_finished("GET", '/a"b', 200, 0.01)
+
+    body = render(metrics)
+
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/a\\"b",le="+Inf"} 1' in body
+    assert 'http_responses_total{method="GET",route="/a\\"b",status="200"} 1' in body
+    assert "http_requests_in_flight 0" in body
+    assert "status_cache_hits_total" in body
+    assert body.endswith("\n")
+
+
+def test_query_stats_middleware_headers_e_alerta(caplog):
+    import logging
+    from app.infrastructure.db import query_stats
+    from app.infrastructure.metrics.middleware import QueryStatsMiddleware
+
+    sent = []
+
+    async def app(scope, receive, send):
+        stats = query_stats.current_stats()
+        stats.count, stats.seconds = 3, 0.0125
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    with caplog.at_level(logging.WARNING, logger="app.infrastructure.metrics.middleware"):
+        asyncio.run(QueryStatsMiddleware(app, warn_count=2)({"type": "http", "method": "GET", "path": "/pedidos/"}, receive, send))
+
+    assert (b"x-db-query-count", b"3") in sent[0]["headers"]
+    assert (b"x-db-time-ms", b"12.50") in sent[0]["headers"]
+    assert caplog.records[-1].db_query_count == 3
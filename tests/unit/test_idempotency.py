@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+
+from app.infrastructure.cache.idempotency import REPLAY_HEADER, IdempotencyKeyConflict, IdempotencyStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Handler:
+    def __init__(self, status_code=201, delay=0.0, error=None):
+        self.calls = 0
+        self.status_code = status_code
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+        if self.error is not None:
+            raise self.error
+
+        return Response(content=f'{{"id":{self.calls}}}', status_code=self.status_code, media_type="application/json")
+
+
+def test_repeticao_devolve_a_resposta_armazenada_sem_executar_de_novo():
+    store = IdempotencyStore()
+    handler = _Handler()
+
+    async def scenario():
+        return await store.execute("k", "fp", handler), await store.execute("k", "fp", handler)
+
+    first, replay = asyncio.run(scenario())
+
+    assert handler.calls == 1
+    assert (replay.status_code, replay.body, replay.media_type) == (201, first.body, "application/json")
+    assert replay.headers[REPLAY_HEADER] == "true"
+    assert REPLAY_HEADER not in first.headers
+    assert store.stats()["replays"] == 1
+
+
+def test_mesma_chave_com_outro_corpo_e_conflito():
+    store = IdempotencyStore()
+
+    async def scenario():
+        await store.execute("k", "fp", _Handler())
+        await store.execute("k", "outro", _Handler())
+
+    with pytest.raises(IdempotencyKeyConflict):
+        asyncio.run(scenario())
+
+    assert store.stats()["conflicts"] == 1
+
+
+def test_duplicatas_concorrentes_executam_uma_vez():
+    store = IdempotencyStore()
+    handler = _Handler(delay=0.02)
+
+    async def scenario():
+        return await asyncio.gather(*(store.execute("k", "fp", handler) for _ in range(5)))
+
+    responses = asyncio.run(scenario())
+
+    assert handler.calls == 1
+    assert {response.body for response in responses} == {b'{"id":1}'}
+    assert store.stats()["in_flight"] == 0
+
+
+def test_falha_nao_e_armazenada_e_quem_esperava_executa():
+    store = IdempotencyStore()
+    failing = _Handler(delay=0.02, error=RuntimeError("banco fora"))
+    handler = _Handler()
+
+    async def scenario():
+        return await asyncio.gather(store.execute("k", "fp", failing), store.execute("k", "fp", handler),
+                                    return_exceptions=True)
+
+    erro, response = asyncio.run(scenario())
+
+    assert isinstance(erro, RuntimeError)
+    assert (failing.calls, handler.calls, response.status_code) == (1, 1, 201)
+
+
+def test_respostas_de_erro_nao_sao_armazenadas():
+    store = IdempotencyStore()
+    handler = _Handler(status_code=503)
+
+    async def scenario():
+        await store.execute("k", "fp", handler)
+        await store.execute("k", "fp", handler)
+
+    asyncio.run(scenario())
+
+    assert handler.calls == 2
+
+
+def test_chave_expira_apos_ttl():
+    clock = _Clock()
+    store = IdempotencyStore(ttl=60, clock=clock)
+    handler = _Handler()
+
+    async def scenario():
+        await store.execute("k", "fp", handler)
+        clock.now = 61
+        await store.execute("k", "fp", handler)
+
+    asyncio.run(scenario())
+
+    assert handler.calls == 2
@@ -15,15 +15,18 @@ def test_criar_pedido_delega_para_dao():
     assert result == mock_dao.criar_pedido.return_value
 
 
-def test_listar_todos_combina_tres_statuses():
+def test_listar_todos_usa_uma_unica_consulta_por_prioridade():
     mock_dao = MagicMock()
-    mock_dao.busca_por_status.side_effect = [[1], [2], [3]]
+    mock_dao.listar_por_prioridade.return_value = [1, 2, 3]
 
     with patch("app.gateways.pedido_gateway.PedidoDAO", return_value=mock_dao):
         gw = PedidoGateway(MagicMock())
         result = gw.listar_todos()
 
-    assert result == [1,2,3]
+    assert result == [1, 2, 3]
+    mock_dao.listar_por_prioridade.assert_called_once_with([3, 2, 1], status_filtro=None, cliente_id=None,
+                                                           apos=None, limite=None)
+    mock_dao.busca_por_status.assert_not_called()
 
 
 def test_buscar_por_id_delega():
@@ -35,3 +38,14 @@ def test_buscar_por_id_delega():
         result = gw.buscar_por_id(1)
 
     assert result == mock_dao.buscar_por_id.return_value
+
+
+def test_listar_todos_repassa_filtros_e_cursor():
+    mock_dao = MagicMock()
+
+    with patch("app.gateways.pedido_gateway.PedidoDAO", return_value=mock_dao):
+        gw = PedidoGateway(MagicMock())
+        gw.listar_todos(status=2, cliente_id=7, apos=(1, "10:00:00", 3), limite=11)
+
+    mock_dao.listar_por_prioridade.assert_called_once_with([3, 2, 1], status_filtro=[2], cliente_id=7,
+                                                           apos=(1, "10:00:00", 3), limite=11)
@@ -15,6 +15,18 @@ def test_criarPedidoProduto_delega_para_dao():
     assert result == mock_dao.criar_pedido_produto.return_value
 
 
+def test_criarPedidoProdutos_delega_para_dao():
+    mock_dao = MagicMock()
+    mock_dao.criar_pedido_produtos.return_value = [MagicMock(), MagicMock()]
+
+    with patch("app.gateways.pedido_produto_gateway.PedidoProdutoDAO", return_value=mock_dao):
+        gw = PedidoProdutoGateway(MagicMock())
+        result = gw.criarPedidoProdutos(1, [2, 3])
+
+    mock_dao.criar_pedido_produtos.assert_called_once_with(1, [2, 3])
+    assert result == mock_dao.criar_pedido_produtos.return_value
+
+
 def test_buscarPorIdPedido_delega():
     mock_dao = MagicMock()
     mock_dao.buscarPorIdPedido.return_value = [MagicMock()]
@@ -26,6 +38,18 @@ def test_buscarPorIdPedido_delega():
     assert result == mock_dao.buscarPorIdPedido.return_value
 
 
+def test_buscarPorIdsPedido_delega():
+    mock_dao = MagicMock()
+    mock_dao.buscarPorIdsPedido.return_value = [MagicMock()]
+
+    with patch("app.gateways.pedido_produto_gateway.PedidoProdutoDAO", return_value=mock_dao):
+        gw = PedidoProdutoGateway(MagicMock())
+        result = gw.buscarPorIdsPedido([1, 2])
+
+    mock_dao.buscarPorIdsPedido.assert_called_once_with([1, 2])
+    assert result == mock_dao.buscarPorIdsPedido.return_value
+
+
 def test_deletar_delega():
     mock_dao = MagicMock()
     with patch("app.gateways.pedido_produto_gateway.PedidoProdutoDAO", return_value=mock_dao):
@@ -33,3 +57,12 @@ def test_deletar_delega():
         gw.deletar(1)
 
     mock_dao.deletar.assert_called_with(1)
+
+
+def test_deletarPorPedido_delega():
+    mock_dao = MagicMock()
+    with patch("app.gateways.pedido_produto_gateway.PedidoProdutoDAO", return_value=mock_dao):
+        gw = PedidoProdutoGateway(MagicMock())
+        gw.deletarPorPedido(1)
+
+    mock_dao.deletar_por_pedido.assert_called_with(1)
@@ -12,13 +12,15 @@ def mock_gateway():
 def test_criar_pedido_produtos_delega_e_retornas_lista(mock_gateway):
     item1 = MagicMock(); item1.produto_id = 10
     item2 = MagicMock(); item2.produto_id = 20
-    mock_gateway.buscarPorIdPedido.return_value = [item1, item2]
+    mock_gateway.criarPedidoProdutos.return_value = [item1, item2]
 
     uc = PedidoProdutosUseCase(mock_gateway)
     result = uc.criarPedidoProdutos(1, [10, 20])
 
     assert result == [10, 20]
-    mock_gateway.criarPedidoProduto.assert_called()
+    mock_gateway.criarPedidoProdutos.assert_called_once_with(pedido_id=1, produtos=[10, 20])
+    mock_gateway.criarPedidoProduto.assert_not_called()
+    mock_gateway.buscarPorIdPedido.assert_not_called()
 
 
 def test_buscarPorIdPedido_retorna_lista_de_ids(mock_gateway):
@@ -31,12 +33,25 @@ def test_buscarPorIdPedido_retorna_lista_de_ids(mock_gateway):
     assert result == [7]
 
 
-def test_deletarPorPedido_deleta_cada_item(mock_gateway):
-    p1 = MagicMock(); p1.id = 1
-    p2 = MagicMock(); p2.id = 2
-    mock_gateway.buscarPorIdPedido.return_value = [p1, p2]
+def test_buscarPorIdsPedido_agrupa_por_pedido(mock_gateway):
+    mock_gateway.buscarPorIdsPedido.return_value = [
+        MagicMock(pedido_id=1, produto_id=7),
+        MagicMock(pedido_id=2, produto_id=8),
+        MagicMock(pedido_id=1, produto_id=9),
+    ]
 
+    uc = PedidoProdutosUseCase(mock_gateway)
+    result = uc.buscarPorIdsPedido([1, 2, 3])
+
+    assert result == {1: [7, 9], 2: [8], 3: []}
+    mock_gateway.buscarPorIdsPedido.assert_called_once_with(pedido_ids=[1, 2, 3])
+    mock_gateway.buscarPorIdPedido.assert_not_called()
+
+
+def test_deletarPorPedido_remove_itens_em_lote(mock_gateway):
     uc = PedidoProdutosUseCase(mock_gateway)
     uc.deletarPorPedido(1)
 
-    assert mock_gateway.deletar.call_count == 2
+    mock_gateway.deletarPorPedido.assert_called_once_with(pedido_id=1)
+    mock_gateway.buscarPorIdPedido.assert_not_called()
+    mock_gateway.deletar.assert_not_called()
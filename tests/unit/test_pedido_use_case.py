@@ -43,10 +43,55 @@ def test_listar_todos_mapeia_respostas(mock_entity):
     mock_entity.listar_todos.return_value = [fake_db_obj]
 
     uc = PedidoUseCase(mock_entity)
-    response = uc.listar_todos()
+    response, proximo_cursor = uc.listar_todos()
 
     assert isinstance(response, list)
     assert response[0].id == fake_db_obj.id
+    assert proximo_cursor is None
+
+
+def _fake_pedido(id, status, hora):
+    fake_db_obj = MagicMock()
+    fake_db_obj.id = id
+    fake_db_obj.cliente_id = 5
+    fake_db_obj.status = status
+    fake_db_obj.status_rel.id = status
+    fake_db_obj.status_rel.descricao = "Pronto"
+    fake_db_obj.data_criacao = datetime.time(hora, 0, 0)
+    fake_db_obj.data_alteracao = None
+    fake_db_obj.data_finalizacao = None
+    fake_db_obj.versao = 1
+
+    return fake_db_obj
+
+
+def test_listar_todos_gera_cursor_quando_ha_mais_paginas(mock_entity):
+    mock_entity.listar_todos.return_value = [_fake_pedido(1, 3, 9), _fake_pedido(2, 3, 10), _fake_pedido(3, 2, 8)]
+
+    uc = PedidoUseCase(mock_entity)
+    response, proximo_cursor = uc.listar_todos(limite=2)
+
+    assert [pedido.id for pedido in response] == [1, 2]
+    assert mock_entity.listar_todos.call_args.kwargs["limite"] == 3
+    assert uc._decodificar_cursor(proximo_cursor) == (0, datetime.time(10, 0, 0), 2)
+
+
+def test_listar_todos_repassa_cursor_decodificado(mock_entity):
+    mock_entity.listar_todos.return_value = []
+    uc = PedidoUseCase(mock_entity)
+    cursor = uc._codificar_cursor(_fake_pedido(4, 1, 11))
+
+    uc.listar_todos(limite=10, cursor=cursor, status=1, cliente_id=5)
+
+    mock_entity.listar_todos.assert_called_once_with(status=1, cliente_id=5,
+                                                     apos=(2, datetime.time(11, 0, 0), 4), limite=11)
+
+
+def test_listar_todos_cursor_invalido(mock_entity):
+    uc = PedidoUseCase(mock_entity)
+
+    with pytest.raises(ValueError):
+        uc.listar_todos(limite=10, cursor="bGl4bw")
 
 
 def test_buscar_por_id_levanta_404_quando_nao_encontrado(mock_entity):
@@ -65,3 +110,56 @@ def test_atualizar_pedido_levanta_404_quando_nao_encontrado(mock_entity):
 
     with pytest.raises(ValueError):
         uc.atualizar_pedido(1, PedidoAtualizaSchema())
+
+
+def test_listar_alteracoes_intercala_por_versao_e_corta_no_limite(mock_entity):
+    pedidos = [_fake_pedido(1, 2, 9), _fake_pedido(2, 3, 10)]
+    pedidos[0].versao, pedidos[1].versao = 5, 8
+    removidos = [MagicMock(id=7, versao=6), MagicMock(id=9, versao=9)]
+    mock_entity.listar_alteracoes.return_value = (pedidos, removidos)
+
+    uc = PedidoUseCase(mock_entity)
+    atualizados, ids_removidos, cursor, mais = uc.listar_alteracoes(desde=4, limite=3)
+
+    assert [pedido.id for pedido in atualizados] == [1, 2]
+    assert ids_removidos == [7]
+    assert (cursor, mais) == (8, True)
+
+
+def test_listar_alteracoes_sem_alteracoes_mantem_cursor(mock_entity):
+    mock_entity.listar_alteracoes.return_value = ([], [])
+
+    assert PedidoUseCase(mock_entity).listar_alteracoes(desde=4, limite=10) == ([], [], 4, False)
+
+
+def test_listar_alteracoes_sem_desde_retorna_so_o_cursor_atual(mock_entity):
+    mock_entity.versao_atual.return_value = 42
+
+    assert PedidoUseCase(mock_entity).listar_alteracoes(desde=None, limite=10) == ([], [], 42, False)
+    mock_entity.listar_alteracoes.assert_not_called()
+
+
+def test_atualizar_status_em_lote_resultado_por_item(mock_entity):
+    from app.adapters.dto.pedido_dto import PedidoStatusLoteItemSchema as Item
+
+    atualizado = _fake_pedido(1, 3, 9)
+    mock_entity.atualizar_status_em_lote.return_value = ([atualizado], {2: None, 3: 4, 4: 1})
+
+    uc = PedidoUseCase(mock_entity)
+    resultados = uc.atualizar_status_em_lote([Item(id=1, status=3), Item(id=2, status=3), Item(id=9, status=7),
+                                              Item(id=3, status=2), Item(id=1, status=4), Item(id=4, status=3)])
+
+    assert mock_entity.atualizar_status_em_lote.call_args.args[0] == {1: 3, 2: 3, 3: 2, 4: 3}
+    assert [(r.id, r.resultado) for r in resultados] == [(1, "atualizado"), (2, "nao_encontrado"), (9, "invalido"),
+                                                         (3, "conflito"), (1, "invalido"), (4, "conflito")]
+    assert resultados[0].pedido.id == 1
+    assert resultados[3].mensagem == "Pedido já finalizado"
+
+
+def test_atualizar_status_em_lote_sem_itens_validos_nao_chama_o_banco(mock_entity):
+    from app.adapters.dto.pedido_dto import PedidoStatusLoteItemSchema as Item
+
+    resultados = PedidoUseCase(mock_entity).atualizar_status_em_lote([Item(id=1, status=0)])
+
+    assert resultados[0].resultado == "invalido"
+    mock_entity.atualizar_status_em_lote.assert_not_called()
@@ -0,0 +1,82 @@
+import sqlite3
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.infrastructure.db.pool_metrics import PoolMetrics, instrumented_pool_class
+from app.infrastructure.db import database
+from app.infrastructure.metrics.histogram import Histogram
+
+
+def test_histogram_acumula_por_bucket():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+
+def test_pool_instrumentado_mede_checkout_e_timeouts():
+    metrics = PoolMetrics()
+    pool_class = instrumented_pool_class(QueuePool, metrics)
+    pool = pool_class(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+
+    connection = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+
+    stats = metrics.snapshot(pool)
+
+    assert stats["checkedout"] == 1
+    assert stats["size"] == 1
+    assert stats["max_overflow"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_total"] >= 0.05
+    assert stats["checkout_latency_seconds"]["+Inf"] == 2
+
+    connection.close()
+    assert metrics.snapshot(pool)["checkedout"] == 0
+
+
+def test_pool_recriado_continua_instrumentado():
+    metrics = PoolMetrics()
+    pool = instrumented_pool_class(QueuePool, metrics)(lambda: sqlite3.connect(":memory:"), pool_size=1)
+
+    recreated = pool.recreate()
+    recreated.connect().close()
+
+    assert metrics.snapshot(recreated)["checkouts"] == 1
+
+
+def test_engine_options_lidas_do_ambiente(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "12")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "4")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    options = database._engine_options("postgresql://u:p@db/pedidos", QueuePool, PoolMetrics())
+
+    assert options["pool_size"] == 12
+    assert options["max_overflow"] == 3
+    assert options["pool_timeout"] == 4
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is False
+    assert issubclass(options["poolclass"], QueuePool)
+
+
+def test_engine_options_padrao_e_sqlite(monkeypatch):
+    for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT", "DB_POOL_RECYCLE", "DB_POOL_PRE_PING"):
+        monkeypatch.delenv(name, raising=False)
+
+    options = database._engine_options("postgresql://u:p@db/pedidos", QueuePool, PoolMetrics())
+    sqlite_options = database._engine_options("sqlite+pysqlite:///:memory:", QueuePool, PoolMetrics())
+
+    assert (options["pool_size"], options["max_overflow"], options["pool_recycle"]) == (5, 10, 1800)
+    assert options["pool_pre_ping"] is True
+    assert sqlite_options == {"pool_pre_ping": True}
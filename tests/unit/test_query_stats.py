@@ -0,0 +1,127 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.dao.pedido_dao import PedidoDAO
+from app.infrastructure.db import query_stats
+from app.infrastructure.db.query_stats import normalize_sql
+
+
+@pytest.fixture
+def engine(sqlite_engine, monkeypatch):
+    # Restored after the test, whatever threshold it installs
+    monkeypatch.setattr(query_stats, "_slow_query_seconds", query_stats._slow_query_seconds)
+
+    return query_stats.install(sqlite_engine)
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT pedido.id FROM pedido\n  WHERE pedido.id = ?", "SELECT pedido.id FROM pedido WHERE pedido.id = ?"),
+    ("SELECT * FROM pedido WHERE status IN (%(status_1_1)s, %(status_1_2)s, %(status_1_3)s) LIMIT %(param_1)s",
+     "SELECT * FROM pedido WHERE status IN (?...) LIMIT ?"),
+    ("UPDATE pedido SET status=$1 WHERE id = $2", "UPDATE pedido SET status=? WHERE id = ?"),
+    ("SELECT 'Recebido', 42, 1.5 FROM t1", "SELECT ?... FROM t1"),
+])
+def test_normalize_sql(statement, expected):
+    assert normalize_sql(statement) == expected
+
+
+def test_conta_apenas_dentro_da_requisicao(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+        token = query_stats.start_request()
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+        stats = query_stats.current_stats()
+        query_stats.end_request(token)
+
+    assert stats.count == 2
+    assert stats.seconds > 0
+    assert query_stats.current_stats() is None
+
+
+def test_contagem_propaga_para_threadpool(engine):
+    def query():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    async def request():
+        token = query_stats.start_request()
+        await run_in_threadpool(query)
+        await run_in_threadpool(query)
+        stats = query_stats.current_stats()
+        query_stats.end_request(token)
+        return stats
+
+    assert asyncio.run(request()).count == 2
+
+
+def test_contagem_propaga_para_run_sync(tmp_path):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async def request():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+        query_stats.install(engine.sync_engine)
+        token = query_stats.start_request()
+
+        async with engine.connect() as conn:
+            await conn.run_sync(lambda sync_conn: sync_conn.execute(text("SELECT 1")))
+            await conn.execute(text("SELECT 2"))
+
+        stats = query_stats.current_stats()
+        query_stats.end_request(token)
+        await engine.dispose()
+        return stats
+
+    assert asyncio.run(request()).count == 2
+
+
+def test_query_lenta_loga_sql_normalizado_e_metodo_do_dao(engine, sqlite_session, monkeypatch, caplog):
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "0")
+    query_stats.install(engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.infrastructure.db.query_stats"):
+        PedidoDAO(sqlite_session).busca_por_status(1)
+
+    record = caplog.records[-1]
+    assert record.dao == "PedidoDAO.busca_por_status"
+    assert "WHERE pedido.status = ?" in record.sql
+    assert "PedidoDAO.busca_por_status" in record.getMessage()
+
+
+def test_query_rapida_nao_loga(engine, monkeypatch, caplog):
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "10000")
+    query_stats.install(engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.infrastructure.db.query_stats"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    assert caplog.records == []
+
+
+def test_limite_de_query_lenta_lido_so_no_install(engine, monkeypatch):
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "10000")
+    query_stats.install(engine)
+    monkeypatch.setattr(query_stats.os, "getenv", lambda *args: pytest.fail("env read per statement"))
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert query_stats._slow_query_seconds == 10.0
+
+
+def test_install_idempotente(engine):
+    query_stats.install(engine)
+
+    token = query_stats.start_request()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    stats = query_stats.current_stats()
+    query_stats.end_request(token)
+
+    assert stats.count == 1
@@ -0,0 +1,30 @@
+import datetime
+
+from app.adapters.presenters.pedido_presenter import PedidoResponseList
+from app.adapters.schemas.pedido import PedidoResponseSchema, PedidoProdutosResponseSchema
+from app.adapters.schemas.status_pedido import StatusPedidoResponseSchema
+from app.infrastructure.api.responses import PydanticJSONResponse
+
+
+def test_pydantic_json_response_serializa_modelo_direto():
+    status = StatusPedidoResponseSchema(id=1, descricao="Recebido")
+    pedido = PedidoResponseSchema(id=1, cliente_id=2, status=status, data_criacao=datetime.time(10, 30, 0, 5),
+                                  data_alteracao=None, data_finalizacao=None)
+    com_produtos = PedidoProdutosResponseSchema(**dict(pedido), produtos=[7, 8])
+
+    response = PydanticJSONResponse(PedidoResponseList.model_construct(status="sucess", data=[pedido, com_produtos], next_cursor=None))
+
+    assert response.media_type == "application/json"
+    assert response.body == (
+        b'{"status":"sucess","data":['
+        b'{"id":1,"cliente_id":2,"status":{"id":1,"descricao":"Recebido"},"data_criacao":"10:30:00.000005","data_alteracao":null,"data_finalizacao":null},'
+        b'{"id":1,"cliente_id":2,"status":{"id":1,"descricao":"Recebido"},"data_criacao":"10:30:00.000005","data_alteracao":null,"data_finalizacao":null,"produtos":[7,8]}'
+        b'],"next_cursor":null}'
+    )
+
+
+def test_pydantic_json_response_status_code():
+    response = PydanticJSONResponse(StatusPedidoResponseSchema(id=1, descricao="Recebido"), status_code=201)
+
+    assert response.status_code == 201
+    assert response.body == b'{"id":1,"descricao":"Recebido"}'
@@ -1,7 +1,15 @@
 import pytest
 from unittest.mock import MagicMock, patch
 
-from app.gateways.status_pedido_gateway import StatusPedidoGateway
+from app.gateways.status_pedido_gateway import StatusPedidoGateway, status_cache
+from app.controllers.status_pedido_controller import StatusPedidoController
+
+
+@pytest.fixture(autouse=True)
+def limpa_cache():
+    status_cache.clear()
+    yield
+    status_cache.clear()
 
 
 def test_criar_delega_para_dao():
@@ -35,3 +43,76 @@ def test_listar_todos_delega():
         result = gw.listar_todos()
 
     assert isinstance(result, list)
+
+
+def test_buscar_por_id_usa_cache_entre_requisicoes():
+    mock_dao = MagicMock()
+    mock_dao.buscar_por_id.return_value = MagicMock(id=3, descricao="Pronto")
+
+    with patch("app.gateways.status_pedido_gateway.StatusPedidoDAO", return_value=mock_dao):
+        primeiro = StatusPedidoGateway(MagicMock()).buscar_por_id(3)
+        segundo = StatusPedidoGateway(MagicMock()).buscar_por_id(3)
+
+    mock_dao.buscar_por_id.assert_called_once_with(3)
+    assert (segundo.id, segundo.descricao) == (3, "Pronto")
+    assert primeiro is segundo
+
+
+def test_listar_todos_usa_cache():
+    mock_dao = MagicMock()
+    mock_dao.listar_todos.return_value = [MagicMock(id=1, descricao="Recebido")]
+
+    with patch("app.gateways.status_pedido_gateway.StatusPedidoDAO", return_value=mock_dao):
+        gw = StatusPedidoGateway(MagicMock())
+        gw.listar_todos()
+        result = gw.listar_todos()
+
+    mock_dao.listar_todos.assert_called_once()
+    assert [row.descricao for row in result] == ["Recebido"]
+
+
+def test_controller_invalida_cache_apos_escrita():
+    mock_dao = MagicMock()
+    mock_dao.listar_todos.return_value = [MagicMock(id=1, descricao="Recebido")]
+    mock_dao.criar.return_value = MagicMock(id=5, descricao="Cancelado")
+
+    with patch("app.gateways.status_pedido_gateway.StatusPedidoDAO", return_value=mock_dao):
+        gw = StatusPedidoGateway(MagicMock())
+        gw.listar_todos()
+
+        StatusPedidoController(db_session=gw).criar(dataRequest=MagicMock(descricao="Cancelado"))
+        gw.listar_todos()
+
+    assert mock_dao.listar_todos.call_count == 2
+
+
+def test_leitura_anterior_a_invalidacao_nao_volta_ao_cache():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    lido, invalidado = threading.Event(), threading.Event()
+    mock_dao = MagicMock()
+
+    def buscar_lento(id):
+        linha = MagicMock(id=id, descricao="Pronto")
+        lido.set()
+        invalidado.wait(5)
+        return linha
+
+    mock_dao.buscar_por_id.side_effect = buscar_lento
+
+    with patch("app.gateways.status_pedido_gateway.StatusPedidoDAO", return_value=mock_dao):
+        gw = StatusPedidoGateway(MagicMock())
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leitura = executor.submit(gw.buscar_por_id, 3)
+            lido.wait(5)
+            gw.invalidar_cache()
+            invalidado.set()
+
+            assert leitura.result().descricao == "Pronto"
+
+        mock_dao.buscar_por_id.side_effect = None
+        mock_dao.buscar_por_id.return_value = MagicMock(id=3, descricao="Pronto para retirada")
+
+        assert gw.buscar_por_id(3).descricao == "Pronto para retirada"
@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.infrastructure.cache.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_or_load_carrega_uma_vez_e_conta_hits():
+    cache = TTLCache(maxsize=4, ttl=10)
+    loader = MagicMock(return_value="Pronto")
+
+    assert cache.get_or_load(3, loader) == "Pronto"
+    assert cache.get_or_load(3, loader) == "Pronto"
+
+    loader.assert_called_once()
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_carga_concorrente_com_invalidacao_nao_e_armazenada():
+    cache = TTLCache(maxsize=4, ttl=10)
+
+    def loader_lento():
+        # Another request writes and invalidates while this read is in flight
+        cache.clear()
+        return "antigo"
+
+    assert cache.get_or_load(3, loader_lento) == "antigo"
+    assert cache.get_or_load(3, lambda: "novo") == "novo"
+    assert cache.get(3) == "novo"
+
+
+def test_entrada_expira_apos_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10.1
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_remove_o_menos_usado_quando_cheio():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_none_nao_e_armazenado():
+    cache = TTLCache(maxsize=2, ttl=10)
+    loader = MagicMock(return_value=None)
+
+    cache.get_or_load("x", loader)
+    cache.get_or_load("x", loader)
+
+    assert loader.call_count == 2
+
+
+def test_invalidate_e_clear():
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+
+def test_maxsize_invalido():
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
@@ -0,0 +1,174 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import event
+
+from app.infrastructure.db.unit_of_work import UnitOfWork, commit_or_flush
+from app.dao.pedido_dao import PedidoDAO
+from app.dao.pedido_produto_dao import PedidoProdutoDAO
+from app.models.pedido import Pedido
+from app.models.pedido_produto import PedidoProdutoModel
+
+
+def test_commit_or_flush_sem_unit_of_work_faz_commit():
+    session = MagicMock()
+    session.info = {}
+
+    assert commit_or_flush(session) is True
+    session.commit.assert_called_once()
+    session.flush.assert_not_called()
+
+
+def test_commit_or_flush_dentro_do_unit_of_work_apenas_flush():
+    session = MagicMock()
+    session.info = {}
+
+    with UnitOfWork(session):
+        assert commit_or_flush(session) is False
+        assert commit_or_flush(session) is False
+        session.commit.assert_not_called()
+
+    session.commit.assert_called_once()
+    assert session.flush.call_count == 2
+
+
+def test_unit_of_work_aninhado_commita_uma_vez():
+    session = MagicMock()
+    session.info = {}
+    uow = UnitOfWork(session)
+
+    with uow:
+        with uow:
+            pass
+        session.commit.assert_not_called()
+
+    session.commit.assert_called_once()
+    assert not uow.active
+
+
+def test_unit_of_work_faz_rollback_em_erro():
+    session = MagicMock()
+    session.info = {}
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(session):
+            raise RuntimeError("falha")
+
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+    assert session.info == {}
+
+
+def test_criacao_de_pedido_com_um_unico_commit(sqlite_session):
+    commits = []
+    event.listen(sqlite_session, "after_commit", lambda s: commits.append(s))
+
+    with UnitOfWork(sqlite_session):
+        pedido = PedidoDAO(sqlite_session).criar_pedido(MagicMock(cliente_id=1))
+        PedidoProdutoDAO(sqlite_session).criar_pedido_produtos(pedido.id, [10, 20, 30])
+
+    assert len(commits) == 1
+    assert sqlite_session.query(PedidoProdutoModel).filter_by(pedido_id=pedido.id).count() == 3
+
+
+def test_falha_nos_itens_nao_deixa_pedido_orfao(sqlite_session):
+    with pytest.raises(Exception):
+        with UnitOfWork(sqlite_session):
+            pedido = PedidoDAO(sqlite_session).criar_pedido(MagicMock(cliente_id=1))
+            PedidoProdutoDAO(sqlite_session).criar_pedido_produtos(pedido.id, [10, None])
+
+    assert sqlite_session.query(Pedido).count() == 0
+    assert sqlite_session.query(PedidoProdutoModel).count() == 0
+
+
+def test_falha_nos_itens_em_savepoint_preserva_o_pedido(sqlite_session):
+    with UnitOfWork(sqlite_session) as uow:
+        pedido = PedidoDAO(sqlite_session).criar_pedido(MagicMock(cliente_id=1))
+
+        with pytest.raises(Exception, match="Erro de integridade"):
+            with uow.savepoint():
+                PedidoProdutoDAO(sqlite_session).criar_pedido_produtos(pedido.id, [10, None])
+
+        PedidoProdutoDAO(sqlite_session).criar_pedido_produtos(pedido.id, [20])
+
+    # The DAO left the rollback to the savepoint, so the order written before it survives
+    assert sqlite_session.query(Pedido).count() == 1
+    assert [item.produto_id for item in sqlite_session.query(PedidoProdutoModel)] == [20]
+
+
+def test_before_commit_roda_antes_do_commit_e_e_descartado_no_rollback():
+    session = MagicMock()
+    session.info = {}
+    chamadas = []
+    session.commit.side_effect = lambda: chamadas.append("commit")
+
+    with UnitOfWork(session):
+        commit_or_flush(session, before_commit=lambda: chamadas.append("carimbo"))
+        assert chamadas == []
+
+    assert chamadas == ["carimbo", "commit"]
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(session):
+            commit_or_flush(session, before_commit=lambda: chamadas.append("descartado"))
+            raise RuntimeError("falha")
+
+    assert chamadas == ["carimbo", "commit"]
+
+
+def test_savepoint_desfeito_descarta_seus_before_commit(sqlite_session):
+    chamadas = []
+
+    with UnitOfWork(sqlite_session) as uow:
+        commit_or_flush(sqlite_session, before_commit=lambda: chamadas.append("fora"))
+
+        with pytest.raises(RuntimeError):
+            with uow.savepoint():
+                commit_or_flush(sqlite_session, before_commit=lambda: chamadas.append("desfeito"))
+                raise RuntimeError("falha")
+
+        with uow.savepoint():
+            commit_or_flush(sqlite_session, before_commit=lambda: chamadas.append("mantido"))
+
+    assert chamadas == ["fora", "mantido"]
+
+
+def test_versao_do_pedido_e_a_ultima_escrita_antes_do_commit(sqlite_session):
+    from app.models.pedido_sequencia import PedidoSequencia
+
+    statements = []
+    event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                 lambda *args: statements.append(args[2].split(" SET")[0]))
+
+    with UnitOfWork(sqlite_session):
+        pedido = PedidoDAO(sqlite_session).criar_pedido(MagicMock(cliente_id=1))
+        PedidoProdutoDAO(sqlite_session).criar_pedido_produtos(pedido.id, [10, 20])
+
+    # The counter row is locked only from its bump to the COMMIT
+    assert statements[-2:] == ["UPDATE pedido_sequencia", "UPDATE pedido"]
+    assert sqlite_session.get(Pedido, pedido.id).versao == sqlite_session.get(PedidoSequencia, 1).valor == 1
+
+
+def test_run_em_threadpool_registra_tempo_de_fila():
+    import asyncio
+    from app.infrastructure.metrics.http_metrics import http_metrics
+
+    before = http_metrics.threadpool_queue.snapshot()["count"]
+    session = MagicMock()
+    session.info = {}
+
+    result = asyncio.run(UnitOfWork(session).run(lambda a, b=0: a + b, 2, b=3))
+
+    assert result == 5
+    assert http_metrics.threadpool_queue.snapshot()["count"] == before + 1
+
+
+def test_release_devolve_a_conexao_ao_pool(sqlite_session):
+    import asyncio
+    from sqlalchemy import text
+
+    sqlite_session.execute(text("SELECT 1"))
+    assert sqlite_session.in_transaction()
+
+    asyncio.run(UnitOfWork(sqlite_session).release())
+
+    assert not sqlite_session.in_transaction()